@@ -0,0 +1,31 @@
+"""Create the MongoDB indexes and apply pending schema migrations. Run on deploy."""
+
+import argparse
+import json
+
+from src.repositories import migration_runner
+
+
+def migrate():
+    index_names = migration_runner.ensure_indexes()
+    print(f"Ensured indexes: {', '.join(index_names)}")
+    version = migration_runner.migrate()
+    print(f"Schema is at version {version}.")
+
+
+def report_indexes():
+    print(json.dumps(migration_runner.report(), indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "--report",
+        action="store_true",
+        help="only report missing, undeclared and unused indexes",
+    )
+    args = parser.parse_args()
+    if args.report:
+        report_indexes()
+    else:
+        migrate()
@@ -0,0 +1,41 @@
+"""Regenerate or check the results snapshots stored on poll groups."""
+
+import argparse
+import sys
+
+from src.repositories import poll_group_repo
+
+
+def rebuild_poll_results(group_ids):
+    if not group_ids:
+        poll_group_repo.rebuild_results()
+        print("Rebuilt results for all poll groups.")
+        return
+    for group_id in group_ids:
+        poll_group_repo.rebuild_results(group_id)
+        print(f"Rebuilt results for poll group {group_id}.")
+
+
+def check_poll_results() -> bool:
+    inconsistent_ids = poll_group_repo.find_inconsistent_results()
+    for group_id in inconsistent_ids:
+        print(f"Poll group {group_id} has stale or missing results.")
+    if not inconsistent_ids:
+        print("All poll group results are consistent.")
+    return not inconsistent_ids
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "group_ids", nargs="*", help="poll groups to rebuild, defaults to all"
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="only report poll groups whose results do not match their polls",
+    )
+    args = parser.parse_args()
+    if args.check:
+        sys.exit(0 if check_poll_results() else 1)
+    rebuild_poll_results(args.group_ids)
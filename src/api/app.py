@@ -2,13 +2,11 @@
 
 import logging
 
-import redis
 from flask import Flask, request
-from qstash import QStash
-from telegram import Update
 from telegram.ext import (
     ApplicationBuilder,
     CallbackQueryHandler,
+    ChosenInlineResultHandler,
     CommandHandler,
     ContextTypes,
     ConversationHandler,
@@ -18,34 +16,65 @@ from telegram.ext import (
     filters,
 )
 
-from src.api.debounce_worker import bp as debounce_worker_bp
-from src.handlers import AttendanceHandler, BanHandler, GeneralHandler, PollHandler
-from src.repositories import attendance_repo, ban_repo, poll_group_repo, poll_repo
+from src.api.bot_request import ConnectionStats, create_bot_request
+from src.api.debounce_worker import (
+    DEBOUNCE_SCHEDULER,
+    debounce_worker_bp,
+    poll_render_cache,
+    qstash_scheduler,
+    update_message_with_poll_group_details,
+)
+from src.api.lifecycle import ApplicationLifecycle
+from src.api.rate_limiter import PriorityRateLimiter
+from src.api.update_processor import (
+    DEFAULT_MAX_CONCURRENT_UPDATES,
+    KeyedUpdateProcessor,
+)
+from src.handlers import (
+    AttendanceHandler,
+    BanHandler,
+    CallbackQueryRouter,
+    GeneralHandler,
+    PollHandler,
+)
+from src.repositories import (
+    async_attendance_repo,
+    async_ban_repo,
+    async_poll_group_repo,
+    async_poll_repo,
+    async_redis_client,
+    redis_pool,
+)
 from src.service import (
+    LOCAL_DEBOUNCE_SCHEDULER,
     AttendanceService,
     BanService,
+    LocalDebounceScheduler,
     PollGroupService,
     PollService,
     TelegramMessageUpdater,
 )
 from src.util import (
-    DELETE_POLL_REGEX_STRING,
-    DO_NOTHING_REGEX_STRING,
+    ATTENDANCE_LISTS_PAGE_PREFIX,
+    DELETE_POLL_PREFIX,
+    DO_NOTHING,
     GENERATE_NEXT_POLL_REGEX_STRING,
-    MANAGE_ACTIVE_POLLS_REGEX_STRING,
+    MANAGE_ACTIVE_POLLS_PREFIX,
     MANAGE_ATTENDANCE_LIST_REGEX_STRING,
-    MANAGE_POLL_GROUPS_REGEX_STRING,
-    MARK_ATTENDANCE_REGEX_STRING,
-    POLL_VOTING_REGEX_STRING,
-    SET_POLL_ACTIVE_STATUS_REGEX_STRING,
-    UNBAN_USER_REGEX_STRING,
-    UPDATE_POLL_RESULTS_REGEX_STRING,
+    MANAGE_POLL_GROUPS_PREFIX,
+    MARK_ATTENDANCE_PREFIX,
+    POLL_GROUPS_PAGE_PREFIX,
+    POLL_VOTING_PREFIX,
+    SET_POLL_ACTIVE_STATUS_PREFIX,
+    UNBAN_USER_PREFIX,
+    UPDATE_POLL_RESULTS_PREFIX,
     VIEW_ATTENDANCE_LISTS_REGEX_STRING,
-    VIEW_ATTENDANCE_TRACKING_FORMAT_REGEX_STRING,
-    VIEW_SUMMARY_REGEX_STRING,
+    VIEW_ATTENDANCE_TRACKING_FORMAT_PREFIX,
+    VIEW_SUMMARY_PREFIX,
     CustomContext,
     WebhookUpdate,
     import_env,
+    import_optional_env,
     routes,
 )
 
@@ -72,33 +101,62 @@ env_variables = [
     "MONGO_ATTENANCES_COLLECTION_NAME",
     "MONGO_BANS_COLLECTION_NAME",
     "REDIS_URL",
-    "QSTASH_TOKEN",
 ]
 env_config = import_env(env_variables)
 
 # Define configuration constants
 admin_chat_id = int(env_config["DEVELOPER_CHAT_ID"])
+max_concurrent_updates = int(
+    import_optional_env("MAX_CONCURRENT_UPDATES", DEFAULT_MAX_CONCURRENT_UPDATES)
+)
 context_types = ContextTypes(context=CustomContext)
+connection_stats = ConnectionStats()
+rate_limiter = PriorityRateLimiter()
+update_processor = KeyedUpdateProcessor(max_concurrent_updates)
 application = (
     ApplicationBuilder()
     .token(env_config["BOT_TOKEN"])
     .context_types(context_types)
+    .concurrent_updates(update_processor)
+    .request(create_bot_request(connection_stats))
+    .rate_limiter(rate_limiter)
     .build()
 )
 bot = application.bot
+lifecycle = ApplicationLifecycle(application)
+app.extensions["lifecycle"] = lifecycle
 
 # Instantiate services
-redis_client = redis.from_url(env_config["REDIS_URL"], decode_responses=True)
-qstash_client = QStash(env_config["QSTASH_TOKEN"])
+ban_service = BanService(async_ban_repo)
+lifecycle.add_background_task(async_ban_repo.listen_for_invalidations)
+poll_service = PollService(async_poll_repo, ban_service)
+poll_group_service = PollGroupService(async_poll_group_repo, poll_service)
+attendance_service = AttendanceService(async_attendance_repo, poll_service, ban_service)
 
-ban_service = BanService(ban_repo)
-poll_service = PollService(poll_repo, ban_service)
-poll_group_service = PollGroupService(poll_group_repo, poll_service)
-attendance_service = AttendanceService(attendance_repo, poll_service, ban_service)
-telegram_message_updater = TelegramMessageUpdater(redis_client, bot, qstash_client)
+
+async def run_local_debounced_update(debounce_key: str) -> None:
+    """Runs the trailing render of a debounce key in process."""
+    await telegram_message_updater.run_trailing_update(
+        debounce_key,
+        lambda state: update_message_with_poll_group_details(
+            state, telegram_message_updater
+        ),
+    )
+
+
+if DEBOUNCE_SCHEDULER == LOCAL_DEBOUNCE_SCHEDULER:
+    debounce_scheduler = LocalDebounceScheduler(run_local_debounced_update)
+    lifecycle.add_background_task(debounce_scheduler.run)
+else:
+    debounce_scheduler = qstash_scheduler
+telegram_message_updater = TelegramMessageUpdater(
+    async_redis_client, bot, debounce_scheduler
+)
 
 # Instantiate internal handlers
-poll_handler = PollHandler(poll_service, poll_group_service, telegram_message_updater)
+poll_handler = PollHandler(
+    poll_service, poll_group_service, telegram_message_updater, poll_render_cache
+)
 attendance_handler = AttendanceHandler(
     attendance_service, poll_group_service, poll_service, ban_service
 )
@@ -222,71 +280,34 @@ ban_conv_handler = ConversationHandler(
 )
 
 # Always-active request handlers
-application.add_handler(InlineQueryHandler(poll_handler.forward_poll))
-application.add_handler(
-    CallbackQueryHandler(
-        poll_handler.handle_poll_voting_callback, pattern=POLL_VOTING_REGEX_STRING
-    )
-)
-application.add_handler(
-    CallbackQueryHandler(
-        poll_handler.handle_update_results_callback,
-        pattern=UPDATE_POLL_RESULTS_REGEX_STRING,
-    )
-)
-application.add_handler(
-    CallbackQueryHandler(
-        poll_handler.handle_manage_active_polls_callback,
-        pattern=MANAGE_ACTIVE_POLLS_REGEX_STRING,
-    )
-)
-application.add_handler(
-    CallbackQueryHandler(
-        poll_handler.handle_change_poll_active_status_callback,
-        pattern=SET_POLL_ACTIVE_STATUS_REGEX_STRING,
-    )
-)
-application.add_handler(
-    CallbackQueryHandler(
-        poll_handler.handle_delete_poll_callback, pattern=DELETE_POLL_REGEX_STRING
-    )
-)
-application.add_handler(
-    CallbackQueryHandler(
-        poll_handler.poll_title_clicked_callback,
-        pattern=MANAGE_POLL_GROUPS_REGEX_STRING,
-    )
-)
-application.add_handler(
-    CallbackQueryHandler(
-        attendance_handler.handle_view_attendance_summary,
-        pattern=VIEW_SUMMARY_REGEX_STRING,
-    )
-)
-application.add_handler(
-    ConversationHandler(  # Wrap in ConversationHandler to use per_message handling
-        entry_points=[
-            CallbackQueryHandler(
-                attendance_handler.change_attendance,
-                pattern=MARK_ATTENDANCE_REGEX_STRING,
-            )
-        ],
-        states={},
-        fallbacks=[],
-        per_message=True,
-    )
-)
-application.add_handler(
-    CallbackQueryHandler(general_handler.do_nothing, pattern=DO_NOTHING_REGEX_STRING)
-)
-application.add_handler(
-    CallbackQueryHandler(
-        attendance_handler.handle_view_attendance_excel_summary,
-        pattern=VIEW_ATTENDANCE_TRACKING_FORMAT_REGEX_STRING,
-    )
+# Callback queries are dispatched by prefix before reaching the conversation handlers.
+callback_router = CallbackQueryRouter(
+    {
+        POLL_VOTING_PREFIX: poll_handler.handle_poll_voting_callback,
+        UPDATE_POLL_RESULTS_PREFIX: poll_handler.handle_update_results_callback,
+        MANAGE_ACTIVE_POLLS_PREFIX: poll_handler.handle_manage_active_polls_callback,
+        SET_POLL_ACTIVE_STATUS_PREFIX: (
+            poll_handler.handle_change_poll_active_status_callback
+        ),
+        DELETE_POLL_PREFIX: poll_handler.handle_delete_poll_callback,
+        MANAGE_POLL_GROUPS_PREFIX: poll_handler.poll_title_clicked_callback,
+        VIEW_SUMMARY_PREFIX: attendance_handler.handle_view_attendance_summary,
+        MARK_ATTENDANCE_PREFIX: attendance_handler.change_attendance,
+        DO_NOTHING: general_handler.do_nothing,
+        VIEW_ATTENDANCE_TRACKING_FORMAT_PREFIX: (
+            attendance_handler.handle_view_attendance_excel_summary
+        ),
+        UNBAN_USER_PREFIX: ban_handler.unban_user,
+        POLL_GROUPS_PAGE_PREFIX: poll_handler.handle_poll_groups_page_callback,
+        ATTENDANCE_LISTS_PAGE_PREFIX: (
+            attendance_handler.handle_attendance_lists_page_callback
+        ),
+    }
 )
+application.add_handler(callback_router)
+application.add_handler(InlineQueryHandler(poll_handler.forward_poll))
 application.add_handler(
-    CallbackQueryHandler(ban_handler.unban_user, pattern=UNBAN_USER_REGEX_STRING)
+    ChosenInlineResultHandler(poll_handler.handle_chosen_publish_option)
 )
 
 # Transient conversation handler
@@ -307,9 +328,34 @@ application.add_error_handler(general_handler.error_handler)
 async def webhook():
     """Webhook endpoint to receive updates from Telegram."""
     if request.headers.get("content-type") == "application/json":
-        async with application:
-            update = Update.de_json(request.get_json(force=True), application.bot)
-            await application.process_update(update)
-            return ("", 204)
+        # Serverless functions may be frozen once the response is sent, so the update
+        # is processed fully before its first Bot API call is returned to Telegram.
+        # Only the ASGI app, whose process stays alive, returns the reply early.
+        reply = await lifecycle.process_update_with_reply(
+            request.get_json(force=True), wait_for_completion=True
+        )
+        if reply is not None:
+            return reply
+        return ("", 204)
     else:
         return ("Bad request", 400)
+
+
+@app.route("/stats", methods=["GET"])
+async def stats():
+    """Exposes internal counters for monitoring."""
+    return {
+        "lifecycle": lifecycle.stats(),
+        "update_processor": update_processor.stats(),
+        "callback_routes": callback_router.stats(),
+        "bot_connections": connection_stats.stats(),
+        "rate_limiter": rate_limiter.stats(),
+        "redis_pool": redis_pool.stats(),
+        # Redis clients are bound to the application's event loop
+        "debouncer": await lifecycle.run(telegram_message_updater.stats()),
+        "debounce_scheduler": debounce_scheduler.stats(),
+        "poll_render_cache": poll_render_cache.stats(),
+        "ban_cache": (
+            async_ban_repo.cache.stats() if async_ban_repo.cache is not None else None
+        ),
+    }
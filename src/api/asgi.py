@@ -0,0 +1,101 @@
+"""
+ASGI entry point for the Telegram bot.
+
+Run with `uvicorn src.api.asgi:app`. Telegram updates posted to the webhook are put on
+the application's update queue and processed concurrently on the server's event loop.
+Callback and inline queries are processed directly so that their answer can be sent as
+the webhook response. All other routes are served by the Flask app.
+"""
+
+import json
+import logging
+
+from asgiref.wsgi import WsgiToAsgi
+
+from src.api.app import app as flask_app
+from src.api.app import lifecycle
+
+logger = logging.getLogger(__name__)
+
+wsgi_app = WsgiToAsgi(flask_app)
+
+
+async def _read_body(receive) -> bytes:
+    """Reads the full request body of an ASGI HTTP request."""
+    body = b""
+    more_body = True
+    while more_body:
+        message = await receive()
+        body += message.get("body", b"")
+        more_body = message.get("more_body", False)
+    return body
+
+
+# Updates whose handlers usually start by answering the query, so their first Bot API
+# call can be sent back as the webhook response.
+WEBHOOK_REPLY_UPDATE_TYPES = ("callback_query", "inline_query")
+
+
+async def _respond(
+    send, status: int, body: bytes = b"", content_type: bytes = b"text/plain"
+) -> None:
+    """Sends a response."""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": status,
+            "headers": [(b"content-type", content_type)],
+        }
+    )
+    await send({"type": "http.response.body", "body": body})
+
+
+async def _lifespan(receive, send) -> None:
+    """Starts the application with the server and stops it on shutdown."""
+    while True:
+        message = await receive()
+        if message["type"] == "lifespan.startup":
+            try:
+                await lifecycle.start()
+            except Exception as e:  # pylint: disable=broad-exception-caught
+                logger.error("Failed to start the application.", exc_info=e)
+                await send({"type": "lifespan.startup.failed", "message": str(e)})
+                return
+            await send({"type": "lifespan.startup.complete"})
+        elif message["type"] == "lifespan.shutdown":
+            await lifecycle.stop()
+            await send({"type": "lifespan.shutdown.complete"})
+            return
+
+
+async def _webhook(receive, send, headers: dict) -> None:
+    """Webhook endpoint to receive updates from Telegram."""
+    if headers.get(b"content-type") != b"application/json":
+        await _respond(send, 400, b"Bad request")
+        return
+    try:
+        data = json.loads(await _read_body(receive))
+    except ValueError:
+        await _respond(send, 400, b"Bad request")
+        return
+    if not any(key in data for key in WEBHOOK_REPLY_UPDATE_TYPES):
+        await lifecycle.enqueue_update(data)
+        await _respond(send, 204)
+        return
+    # Processing carries on in the background after the response is sent.
+    reply = await lifecycle.process_update_with_reply(data, wait_for_completion=False)
+    if reply is None:
+        await _respond(send, 204)
+        return
+    await _respond(send, 200, json.dumps(reply).encode(), b"application/json")
+
+
+async def app(scope, receive, send):
+    """ASGI application."""
+    if scope["type"] == "lifespan":
+        await _lifespan(receive, send)
+        return
+    if scope["type"] == "http" and scope["path"] == "/" and scope["method"] == "POST":
+        await _webhook(receive, send, dict(scope["headers"]))
+        return
+    await wsgi_app(scope, receive, send)
@@ -0,0 +1,74 @@
+"""
+Builds the HTTP client the bot calls the Bot API with.
+
+The bot is initialized once per process (see `ApplicationLifecycle`), so its client and
+the keep-alive connections in its pool are reused by every handler and debounced update.
+HTTP/2 is used when its optional dependency is installed, which lets concurrent calls
+share a single connection.
+"""
+
+import os
+from collections import Counter
+from importlib.util import find_spec
+
+import httpx
+
+from src.api.webhook_reply import WebhookReplyRequest
+
+DEFAULT_CONNECTION_POOL_SIZE = 256  # same as the ApplicationBuilder default
+DEFAULT_CONNECT_TIMEOUT_SECONDS = 5.0
+DEFAULT_READ_TIMEOUT_SECONDS = 5.0
+DEFAULT_POOL_TIMEOUT_SECONDS = 1.0
+CONNECTION_OPENED_EVENT = "connection.connect_tcp.complete"
+
+
+class ConnectionStats:
+    """Counts the Bot API requests and the connections opened to send them. Requests
+    that did not open a connection reused a kept-alive one."""
+
+    def __init__(self):
+        self._counters = Counter()
+
+    async def on_request(self, request: httpx.Request) -> None:
+        """Event hook that counts the request and traces its connection."""
+        self._counters["requests"] += 1
+        request.extensions["trace"] = self._trace
+
+    async def _trace(self, event_name: str, _: dict) -> None:
+        if event_name == CONNECTION_OPENED_EVENT:
+            self._counters["connections_opened"] += 1
+
+    def stats(self) -> dict:
+        """Returns the request and connection counters."""
+        return {
+            "requests": self._counters["requests"],
+            "connections_opened": self._counters["connections_opened"],
+            "connections_reused": max(
+                0, self._counters["requests"] - self._counters["connections_opened"]
+            ),
+        }
+
+
+def get_http_version() -> str:
+    """Gets the HTTP version to use, HTTP/2 if its dependency is installed."""
+    return "2" if find_spec("h2") is not None else "1.1"
+
+
+def create_bot_request(connection_stats: ConnectionStats) -> WebhookReplyRequest:
+    """Creates the bot's request, with its pool size and timeouts from the environment."""
+    return WebhookReplyRequest(
+        connection_pool_size=int(
+            os.getenv("TELEGRAM_CONNECTION_POOL_SIZE", DEFAULT_CONNECTION_POOL_SIZE)
+        ),
+        connect_timeout=float(
+            os.getenv("TELEGRAM_CONNECT_TIMEOUT", DEFAULT_CONNECT_TIMEOUT_SECONDS)
+        ),
+        read_timeout=float(
+            os.getenv("TELEGRAM_READ_TIMEOUT", DEFAULT_READ_TIMEOUT_SECONDS)
+        ),
+        pool_timeout=float(
+            os.getenv("TELEGRAM_POOL_TIMEOUT", DEFAULT_POOL_TIMEOUT_SECONDS)
+        ),
+        http_version=get_http_version(),
+        httpx_kwargs={"event_hooks": {"request": [connection_stats.on_request]}},
+    )
@@ -1,35 +1,56 @@
-"""Main application file for the Telegram bot."""
+"""
+Worker that runs the trailing renders of debounced poll group message updates.
+
+With the QStash scheduler, trailing renders arrive as signed QStash messages on the
+blueprint's endpoint. With the local scheduler, the app runs them in process with
+`update_message_with_poll_group_details`.
+"""
 
 import json
 import logging
 import os
 
-import redis
 from bson import ObjectId
-from flask import Blueprint, request
+from flask import Blueprint, current_app, request
 from qstash import QStash
 from qstash.receiver import Receiver
-from telegram import Bot, InlineKeyboardMarkup
 from telegram.constants import ParseMode
-from telegram.error import BadRequest
-from telegram.request import HTTPXRequest
 
-from src.repositories import ban_repo, poll_group_repo, poll_repo
-from src.service import BanService, PollGroupService, PollService
+from src.api.lifecycle import ApplicationLifecycle
+from src.repositories import (
+    async_ban_repo,
+    async_poll_group_repo,
+    async_poll_repo,
+    async_redis_client,
+)
+from src.service import (
+    DEFAULT_RENDER_CACHE_SIZE,
+    QSTASH_DEBOUNCE_SCHEDULER,
+    BanService,
+    PollGroupService,
+    PollRenderCache,
+    PollService,
+    QStashDebounceScheduler,
+    TelegramMessageUpdater,
+)
 from src.util import Membership, import_env
-from src.view import build_voting_buttons, generate_poll_group_text
+from src.view import build_poll_group_message
 
-QSTASH_CURRENT_SIGNING_KEY = os.environ["QSTASH_CURRENT_SIGNING_KEY"]
+DEBOUNCE_SCHEDULER = os.getenv("DEBOUNCE_SCHEDULER", QSTASH_DEBOUNCE_SCHEDULER)
+QSTASH_DEBOUNCE_PATH = "/qstash_debounced"
+QSTASH_CURRENT_SIGNING_KEY = os.environ.get("QSTASH_CURRENT_SIGNING_KEY")
 QSTASH_NEXT_SIGNING_KEY = os.environ.get("QSTASH_NEXT_SIGNING_KEY")
-REDIS_URL = os.environ.get("REDIS_URL", "redis://localhost:6379")
-BOT_TOKEN = os.environ["BOT_TOKEN"]
 
-receiver = Receiver(
-    current_signing_key=QSTASH_CURRENT_SIGNING_KEY,
-    next_signing_key=QSTASH_NEXT_SIGNING_KEY,
+# Only needed with the QStash scheduler
+receiver = (
+    Receiver(
+        current_signing_key=QSTASH_CURRENT_SIGNING_KEY,
+        next_signing_key=QSTASH_NEXT_SIGNING_KEY,
+    )
+    if DEBOUNCE_SCHEDULER == QSTASH_DEBOUNCE_SCHEDULER
+    else None
 )
-redis_client = redis.from_url(REDIS_URL)
-bp = Blueprint("debounce_worker", __name__)
+debounce_worker_bp = Blueprint("debounce_worker", __name__)
 
 # import env variables
 env_variables = [
@@ -41,24 +62,43 @@ env_variables = [
     "MONGO_GROUPS_COLLECTION_NAME",
     "MONGO_BANS_COLLECTION_NAME",
     "REDIS_URL",
-    "QSTASH_TOKEN",
 ]
+if DEBOUNCE_SCHEDULER == QSTASH_DEBOUNCE_SCHEDULER:
+    env_variables.append("QSTASH_TOKEN")
 env_config = import_env(env_variables)
 
 # Instantiate services
-redis_client = redis.from_url(env_config["REDIS_URL"], decode_responses=True)
-qstash_client = QStash(env_config["QSTASH_TOKEN"])
+qstash_scheduler = (
+    QStashDebounceScheduler(
+        QStash(env_config["QSTASH_TOKEN"]),
+        env_config["DEPLOYMENT_URL"] + QSTASH_DEBOUNCE_PATH,
+    )
+    if DEBOUNCE_SCHEDULER == QSTASH_DEBOUNCE_SCHEDULER
+    else None
+)
 
-ban_service = BanService(ban_repo)
-poll_service = PollService(poll_repo, ban_service)
-poll_group_service = PollGroupService(poll_group_repo, poll_service)
+ban_service = BanService(async_ban_repo)
+poll_service = PollService(async_poll_repo, ban_service)
+poll_group_service = PollGroupService(async_poll_group_repo, poll_service)
+# Renders are shared with the other workers through Redis when a TTL is configured
+poll_render_cache_redis_ttl_seconds = int(
+    os.getenv("POLL_RENDER_CACHE_REDIS_TTL_SECONDS", "0")
+)
+poll_render_cache = PollRenderCache(
+    build_poll_group_message,
+    int(os.getenv("POLL_RENDER_CACHE_SIZE", DEFAULT_RENDER_CACHE_SIZE)),
+    async_redis_client if poll_render_cache_redis_ttl_seconds > 0 else None,
+    poll_render_cache_redis_ttl_seconds,
+)
 
 logger = logging.getLogger(__name__)
 
 
-@bp.route("/qstash_debounced", methods=["POST"])
+@debounce_worker_bp.route(QSTASH_DEBOUNCE_PATH, methods=["POST"])
 async def handler():
     """Specialised QStash handler for debounced tasks. Dumbly executes any tasks given."""
+    if receiver is None:
+        return ("Debounced updates are run in process", 404)
 
     # 1. Read body + signature
     body_bytes = request.get_data()
@@ -72,7 +112,7 @@ async def handler():
     try:
         receiver.verify(signature=signature, body=body)
     except Exception as e:
-        print("Signature verification failed:", e)
+        logger.warning("Signature verification failed: %s", e)
         return ("Invalid signature", 401)
 
     # 3. Parse payload
@@ -80,43 +120,58 @@ async def handler():
         data = json.loads(body)
         debounce_key = data["debounce_key"]
     except Exception as e:
-        print("Payload parsing failed:", e)
+        logger.warning("Payload parsing failed: %s", e)
         return ("Bad payload", 400)
 
-    # 5. Load aggregated state
-    state = redis_client.get(debounce_key)
-    if not state:
+    # Database and Redis clients are bound to the application's event loop
+    lifecycle = current_app.extensions["lifecycle"]
+    if not await lifecycle.run(run_debounced_update(debounce_key, lifecycle)):
         return ("No state, nothing to do", 200)
 
-    # 6. Do the actual work (call your bot logic, API, etc.)
-    request_object = HTTPXRequest()
-    receiver_bot = Bot(token=BOT_TOKEN, request=request_object)
-    await update_message_with_poll_group_details(state, receiver_bot)
-
-    # 7. Cleanup
-    redis_client.delete(debounce_key)
-
     return ("OK", 200)
 
 
-async def update_message_with_poll_group_details(json_body, receiver_bot: Bot):
-    """Given the serialized state, update the inline message."""
-    logger.info("Updating inline message with state: %s", json_body)
+async def run_debounced_update(
+    debounce_key: str, lifecycle: ApplicationLifecycle
+) -> bool:
+    """Runs the trailing render of the debounce key with the application's bot, which
+    is initialized once and keeps its connections alive. Returns False if there was no
+    state."""
+    await lifecycle.ensure_initialized()
+    updater = TelegramMessageUpdater(
+        async_redis_client, lifecycle.application.bot, qstash_scheduler
+    )
+    return await updater.run_trailing_update(
+        debounce_key,
+        lambda state: update_message_with_poll_group_details(state, updater),
+    )
+
+
+async def update_message_with_poll_group_details(
+    json_body, updater: TelegramMessageUpdater
+):
+    """Given the serialized state, update every published copy of the poll group."""
+    logger.info("Updating inline messages with state: %s", json_body)
     dct = json.loads(json_body)
     poll_group_id = ObjectId(dct["poll_group_id"])
-    message_id = dct["inline_message_id"]
-    poll_group, polls = poll_group_service.get_full_poll_group_details(poll_group_id)
+    poll_group, polls = await poll_group_service.get_full_poll_group_details(
+        poll_group_id
+    )
     membership = Membership.from_data_string(dct["membership"])
-    pollmaker_id = poll_group.owner_id
-
-    try:
-        await receiver_bot.edit_message_text(
-            inline_message_id=message_id,
-            text=generate_poll_group_text(poll_group, polls, membership),
-            reply_markup=InlineKeyboardMarkup(
-                build_voting_buttons(polls, membership, pollmaker_id)
-            ),
-            parse_mode=ParseMode.MARKDOWN_V2,
-        )
-    except BadRequest as e:
-        logger.error("Failed to edit message:", exc_info=e)
+    text, reply_markup = await poll_render_cache.get_message(
+        poll_group, polls, membership
+    )
+    inline_message_ids = await updater.get_published_messages(
+        dct["poll_group_id"], membership
+    )
+    # The message the change came from, in case it is not registered
+    inline_message_ids.add(dct["inline_message_id"])
+
+    await updater.edit_published_messages(
+        dct["poll_group_id"],
+        membership,
+        inline_message_ids,
+        text,
+        reply_markup,
+        ParseMode.MARKDOWN_V2,
+    )
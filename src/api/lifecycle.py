@@ -0,0 +1,209 @@
+"""Process-wide lifecycle management for the Telegram application."""
+
+import asyncio
+import atexit
+import logging
+import threading
+from collections import Counter
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from telegram import Update
+from telegram.ext import Application
+
+from src.api.webhook_reply import WebhookReply
+
+SHUTDOWN_TIMEOUT_SECONDS = 10
+
+
+class ApplicationLifecycle:
+    """
+    Keeps a single initialized Application per process.
+
+    The application, the bot's HTTP connection pool and the bot identity (getMe) are
+    initialized lazily on the first update and reused for every later update. Flask runs
+    each async view in a fresh event loop, so all bot work is funnelled onto one long-lived
+    loop owned by this class. The application is shut down when the process exits.
+
+    When served over ASGI, the lifecycle attaches to the server's event loop instead
+    (see `start` and `stop`) and updates are processed in the background as they arrive.
+    """
+
+    def __init__(self, application: Application):
+        self.application = application
+        self.logger = logging.getLogger(__name__)
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._loop_lock = threading.Lock()
+        self._init_lock: asyncio.Lock | None = None
+        self._initialized = False
+        self._background_task_factories = []
+        self._background_tasks: list[asyncio.Task] = []
+        self._queued_updates: set[asyncio.Task] = set()
+        self._counters = Counter()
+
+    def stats(self) -> dict:
+        """Returns the lifecycle counters, to confirm that the application is reused."""
+        return {
+            "initialized": self._initialized,
+            "initializations": self._counters["initializations"],
+            "shutdowns": self._counters["shutdowns"],
+            "updates_queued": self._counters["updates_queued"],
+            "updates_processed": self._counters["updates_processed"],
+            "webhook_replies": self._counters["webhook_replies"],
+            "background_tasks": len(self._background_tasks),
+        }
+
+    def add_background_task(self, factory) -> None:
+        """Registers a coroutine function to run on the lifecycle loop while the
+        application is initialized. It is started after initialization and cancelled on
+        shutdown."""
+        self._background_task_factories.append(factory)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        """Starts the background event loop thread if it is not running yet."""
+        with self._loop_lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="application-lifecycle",
+                    daemon=True,
+                )
+                self._thread.start()
+                atexit.register(self.shutdown)
+            return self._loop
+
+    async def run(self, coro):
+        """Runs the coroutine on the lifecycle event loop and returns its result."""
+        loop = self._ensure_loop()
+        if asyncio.get_running_loop() is loop:
+            return await coro
+        return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, loop))
+
+    async def ensure_initialized(self) -> None:
+        """Initializes the application once. Must be awaited on the lifecycle loop."""
+        if self._initialized:
+            return
+        if self._init_lock is None:
+            self._init_lock = asyncio.Lock()
+        async with self._init_lock:
+            if self._initialized:
+                return
+            await self.application.initialize()
+            self._start_background_tasks()
+            self._initialized = True
+            self._counters["initializations"] += 1
+            self.logger.info(
+                "Application initialized as bot %s.", self.application.bot.username
+            )
+
+    async def _process_update(
+        self, data: dict, reply: WebhookReply | None = None
+    ) -> None:
+        await self.ensure_initialized()
+        if reply is not None:
+            reply.activate()
+        update = Update.de_json(data, self.application.bot)
+        await self.application.update_processor.process_update(
+            update, self.application.process_update(update)
+        )
+        self._counters["updates_processed"] += 1
+
+    async def process_update(self, data: dict) -> None:
+        """Deserializes and processes an update with the shared application."""
+        await self.run(self._process_update(data))
+
+    def _start_background_tasks(self) -> None:
+        for factory in self._background_task_factories:
+            task = asyncio.create_task(factory())
+            task.add_done_callback(self._log_background_task_exception)
+            self._background_tasks.append(task)
+
+    async def _stop_background_tasks(self) -> None:
+        tasks, self._background_tasks = self._background_tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def _log_background_task_exception(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error("Background task failed.", exc_info=task.exception())
+
+    def _log_task_exception(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            self.logger.error("Error processing update.", exc_info=task.exception())
+
+    async def _process_update_with_reply(
+        self, data: dict, wait_for_completion: bool
+    ) -> dict | None:
+        reply = WebhookReply()
+        task = asyncio.create_task(self._process_update(data, reply))
+        task.add_done_callback(self._log_task_exception)
+        body = await reply.wait(task, wait_for_completion)
+        if body is not None:
+            self._counters["webhook_replies"] += 1
+        return body
+
+    async def process_update_with_reply(
+        self, data: dict, wait_for_completion: bool = True
+    ) -> dict | None:
+        """Processes an update and returns the Bot API call to send back as the webhook
+        response, if the handler's first call was eligible. Unless `wait_for_completion`
+        is set, returns as soon as that call is made and lets processing continue."""
+        return await self.run(
+            self._process_update_with_reply(data, wait_for_completion)
+        )
+
+    async def enqueue_update(self, data: dict) -> None:
+        """Processes an update concurrently in the background, through the same path as
+        `process_update` so that it is counted once processed. Requires the lifecycle to
+        be started."""
+        task = asyncio.create_task(self._process_update(data))
+        task.add_done_callback(self._log_task_exception)
+        task.add_done_callback(self._queued_updates.discard)
+        self._queued_updates.add(task)
+        self._counters["updates_queued"] += 1
+
+    async def start(self) -> None:
+        """Attaches to the running event loop, then initializes and starts the
+        application."""
+        with self._loop_lock:
+            if self._loop is not None and self._loop is not asyncio.get_running_loop():
+                raise RuntimeError("Lifecycle is already bound to another event loop.")
+            self._loop = asyncio.get_running_loop()
+        await self.ensure_initialized()
+        await self.application.start()
+
+    async def stop(self) -> None:
+        """Waits for the queued updates, then stops the application started by `start`
+        and shuts it down."""
+        await asyncio.gather(*self._queued_updates, return_exceptions=True)
+        if self.application.running:
+            await self.application.stop()
+        await self._shutdown()
+
+    async def _shutdown(self) -> None:
+        if not self._initialized:
+            return
+        await self._stop_background_tasks()
+        await self.application.shutdown()
+        self._initialized = False
+        self._counters["shutdowns"] += 1
+        self.logger.info("Application shut down.")
+
+    def shutdown(self) -> None:
+        """Shuts down the application and stops the lifecycle event loop thread."""
+        with self._loop_lock:
+            loop, thread = self._loop, self._thread
+            if thread is None:
+                return
+            self._loop, self._thread = None, None
+        try:
+            asyncio.run_coroutine_threadsafe(self._shutdown(), loop).result(
+                SHUTDOWN_TIMEOUT_SECONDS
+            )
+        except FutureTimeoutError:
+            self.logger.error("Timed out while shutting down the application.")
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(SHUTDOWN_TIMEOUT_SECONDS)
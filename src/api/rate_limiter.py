@@ -0,0 +1,232 @@
+"""
+Rate limiting of the bot's outbound Bot API calls.
+
+Every call waits for a token from the global bucket and, where it applies, from the
+bucket of its chat or inline message, sized after Telegram's flood limits. Calls are
+granted tokens in priority order, so that interactive replies go ahead of background
+refreshes. A call rejected with `RetryAfter` pauses the bucket it was limited by and is
+queued again instead of failing.
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from collections import Counter
+from datetime import timedelta
+
+from telegram.error import RetryAfter
+from telegram.ext import BaseRateLimiter
+
+from src.util import RequestPriority
+
+GLOBAL_RATE_PER_SECOND = 30
+PRIVATE_CHAT_RATE_PER_SECOND = 1
+GROUP_CHAT_RATE_PER_SECOND = 20 / 60
+INLINE_MESSAGE_RATE_PER_SECOND = 1
+MAX_RETRIES = 5
+MAX_IDLE_BUCKETS = 10_000
+
+logger = logging.getLogger(__name__)
+
+
+class TokenBucket:
+    """Allows `rate` calls per second on average, in bursts of up to `capacity`."""
+
+    def __init__(self, rate: float, capacity: float):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.paused_until = 0.0
+
+    def _refill(self, now: float) -> None:
+        self.tokens = min(
+            self.capacity, self.tokens + (now - self.updated_at) * self.rate
+        )
+        self.updated_at = now
+
+    def get_delay(self, now: float) -> float:
+        """Gets the seconds until a token is available."""
+        if now < self.paused_until:
+            return self.paused_until - now
+        self._refill(now)
+        return max(0.0, (1 - self.tokens) / self.rate)
+
+    def consume(self, now: float) -> None:
+        """Takes a token. Must only be called when one is available."""
+        self._refill(now)
+        self.tokens -= 1
+
+    def pause(self, now: float, seconds: float) -> None:
+        """Stops handing out tokens for the given number of seconds."""
+        self.paused_until = max(self.paused_until, now + seconds)
+        self.tokens = 0
+
+    def is_idle(self, now: float) -> bool:
+        """Checks whether the bucket is full, so that it can be dropped and recreated."""
+        if now < self.paused_until:
+            return False
+        self._refill(now)
+        return self.tokens >= self.capacity
+
+
+class PriorityRateLimiter(BaseRateLimiter[dict]):
+    """
+    Rate limiter of the bot, with a global bucket and one bucket per chat and per
+    inline message.
+
+    Waiting calls are kept in a heap ordered by priority, then arrival. Whenever tokens
+    may have become available, the heap is scanned in order and every call whose buckets
+    all have a token is granted, so a call held up by a busy chat does not hold up calls
+    to other chats. If calls are left waiting, a timer is set for the earliest time one
+    of them can be granted.
+    """
+
+    def __init__(self):
+        self._global_bucket = TokenBucket(
+            GLOBAL_RATE_PER_SECOND, GLOBAL_RATE_PER_SECOND
+        )
+        self._buckets: dict[tuple, TokenBucket] = {}
+        self._waiting: list[tuple] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._counters = Counter()
+        self._total_wait_seconds = 0.0
+        self._max_wait_seconds = 0.0
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+    def _get_bucket(self, key: tuple, rate: float) -> TokenBucket:
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            if len(self._buckets) >= MAX_IDLE_BUCKETS:
+                now = time.monotonic()
+                self._buckets = {
+                    bucket_key: bucket
+                    for bucket_key, bucket in self._buckets.items()
+                    if not bucket.is_idle(now)
+                }
+            bucket = self._buckets[key] = TokenBucket(rate, 1)
+        return bucket
+
+    def _get_buckets(self, data: dict | None) -> list[TokenBucket]:
+        """Gets the buckets a call takes tokens from, most specific first."""
+        buckets = []
+        data = data or {}
+        if data.get("inline_message_id") is not None:
+            buckets.append(
+                self._get_bucket(
+                    ("inline", data["inline_message_id"]),
+                    INLINE_MESSAGE_RATE_PER_SECOND,
+                )
+            )
+        chat_id = data.get("chat_id")
+        if chat_id is not None:
+            # Group and channel chat IDs are negative, or usernames for channels
+            is_private = isinstance(chat_id, int) and chat_id > 0
+            buckets.append(
+                self._get_bucket(
+                    ("chat", chat_id),
+                    (
+                        PRIVATE_CHAT_RATE_PER_SECOND
+                        if is_private
+                        else GROUP_CHAT_RATE_PER_SECOND
+                    ),
+                )
+            )
+        buckets.append(self._global_bucket)
+        return buckets
+
+    def _dispatch(self) -> None:
+        """Grants tokens to the waiting calls that can proceed, in priority order."""
+        self._timer = None
+        now = time.monotonic()
+        still_waiting = []
+        next_delay = None
+        while self._waiting:
+            entry = heapq.heappop(self._waiting)
+            _, _, buckets, future = entry
+            if future.done():
+                continue
+            delay = max(bucket.get_delay(now) for bucket in buckets)
+            if delay == 0:
+                for bucket in buckets:
+                    bucket.consume(now)
+                future.set_result(None)
+                continue
+            still_waiting.append(entry)
+            next_delay = delay if next_delay is None else min(next_delay, delay)
+        for entry in still_waiting:
+            heapq.heappush(self._waiting, entry)
+        if next_delay is not None:
+            self._timer = asyncio.get_running_loop().call_later(
+                next_delay, self._dispatch
+            )
+
+    async def _acquire(self, priority: int, buckets: list[TokenBucket]) -> None:
+        """Waits until the call is granted a token from each of its buckets."""
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiting, (priority, next(self._sequence), buckets, future))
+        if self._timer is not None:
+            self._timer.cancel()
+        started_at = time.monotonic()
+        self._dispatch()
+        await future
+        wait_seconds = time.monotonic() - started_at
+        self._counters["granted"] += 1
+        self._total_wait_seconds += wait_seconds
+        self._max_wait_seconds = max(self._max_wait_seconds, wait_seconds)
+
+    async def process_request(
+        self,
+        callback,
+        args,
+        kwargs,
+        endpoint,
+        data,
+        rate_limit_args,
+    ):
+        # Calls are interactive unless they pass a priority in their `rate_limit_args`
+        priority = (rate_limit_args or {}).get("priority", RequestPriority.INTERACTIVE)
+        buckets = self._get_buckets(data)
+        for attempt in itertools.count(1):
+            await self._acquire(priority, buckets)
+            try:
+                return await callback(*args, **kwargs)
+            except RetryAfter as e:
+                if attempt > MAX_RETRIES:
+                    raise
+                retry_after = e.retry_after
+                if isinstance(retry_after, timedelta):
+                    retry_after = retry_after.total_seconds()
+                logger.warning(
+                    "%s was rate limited by Telegram, retrying in %s seconds.",
+                    endpoint,
+                    retry_after,
+                )
+                self._counters["rescheduled"] += 1
+                # The limit applies to the chat or message if the call had one
+                buckets[0].pause(time.monotonic(), retry_after)
+
+    def stats(self) -> dict:
+        """Returns the queue depth by priority and the wait times of granted calls."""
+        depth = Counter(
+            priority for priority, _, _, future in self._waiting if not future.done()
+        )
+        granted = self._counters["granted"]
+        return {
+            "waiting_interactive": depth[RequestPriority.INTERACTIVE],
+            "waiting_background": depth[RequestPriority.BACKGROUND],
+            "granted": granted,
+            "rescheduled": self._counters["rescheduled"],
+            "mean_wait_seconds": self._total_wait_seconds / granted if granted else 0.0,
+            "max_wait_seconds": self._max_wait_seconds,
+        }
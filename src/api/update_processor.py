@@ -0,0 +1,83 @@
+"""Update processor that runs updates concurrently while keeping per-chat ordering."""
+
+import asyncio
+from collections import Counter
+from typing import Awaitable
+
+from telegram import Update
+from telegram.ext import BaseUpdateProcessor
+
+DEFAULT_MAX_CONCURRENT_UPDATES = 64
+
+
+class KeyedUpdateProcessor(BaseUpdateProcessor):
+    """
+    Processes up to `max_concurrent_updates` updates at once. Updates from the same
+    (chat, user) pair are processed one at a time in arrival order, which is the key the
+    ConversationHandlers track their state by, so conversation flows stay sequential.
+    Updates only take one of the concurrency slots once it is their key's turn.
+    """
+
+    def __init__(self, max_concurrent_updates: int = DEFAULT_MAX_CONCURRENT_UPDATES):
+        super().__init__(max_concurrent_updates)
+        self._locks: dict[tuple, asyncio.Lock] = {}
+        self._lock_users = Counter()
+        self._in_flight = 0
+        self._processed = 0
+
+    @staticmethod
+    def _ordering_key(update: object) -> tuple | None:
+        """Gets the key that updates must be serialized by, or None if unordered."""
+        if not isinstance(update, Update):
+            return None
+        chat = update.effective_chat
+        user = update.effective_user
+        if chat is None and user is None:
+            return None
+        return (
+            chat.id if chat is not None else None,
+            user.id if user is not None else None,
+        )
+
+    def stats(self) -> dict:
+        """Returns the concurrency counters of the processor."""
+        return {
+            "max_concurrent_updates": self.max_concurrent_updates,
+            "in_flight": self._in_flight,
+            "ordering_keys": len(self._locks),
+            "processed": self._processed,
+        }
+
+    async def process_update(self, update: object, coroutine: Awaitable) -> None:
+        # Overridden so that an update waits for its key before taking a concurrency
+        # slot, so that a backlog of updates on one key does not fill up the slots
+        key = self._ordering_key(update)
+        if key is None:
+            async with self._semaphore:
+                await self.do_process_update(update, coroutine)
+            return
+        lock = self._locks.setdefault(key, asyncio.Lock())
+        self._lock_users[key] += 1
+        try:
+            async with lock:
+                async with self._semaphore:
+                    await self.do_process_update(update, coroutine)
+        finally:
+            self._lock_users[key] -= 1
+            if not self._lock_users[key]:
+                del self._lock_users[key]
+                del self._locks[key]
+
+    async def do_process_update(self, update: object, coroutine: Awaitable) -> None:
+        self._in_flight += 1
+        try:
+            await coroutine
+        finally:
+            self._in_flight -= 1
+            self._processed += 1
+
+    async def initialize(self) -> None:
+        pass
+
+    async def shutdown(self) -> None:
+        pass
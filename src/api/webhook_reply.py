@@ -0,0 +1,90 @@
+"""
+Lets a handler's first Bot API call be sent as the webhook HTTP response.
+
+Telegram accepts one Bot API method call in the body of the webhook response, which saves
+an outbound round trip. While an update is processed under a WebhookReply, the first call
+the bot makes is captured instead of sent if it is eligible. Any later call, or any call
+made after the webhook response has been sent, goes out as a normal request.
+"""
+
+import asyncio
+import json
+from contextvars import ContextVar
+
+from telegram.request import HTTPXRequest, RequestData
+
+# Only methods whose result is `True` can be answered locally, since the handler never
+# sees the real response from Telegram.
+INLINE_REPLY_METHODS = frozenset({"answerCallbackQuery", "answerInlineQuery"})
+
+_CAPTURED_RESPONSE = json.dumps({"ok": True, "result": True}).encode()
+
+_current_reply: ContextVar["WebhookReply | None"] = ContextVar(
+    "webhook_reply", default=None
+)
+
+
+class WebhookReply:
+    """Collects the first Bot API call made while processing a single update."""
+
+    def __init__(self):
+        self.method: str | None = None
+        self.parameters: dict | None = None
+        self.closed = False
+        self.ready = asyncio.Event()
+
+    def activate(self) -> None:
+        """Makes this reply collect calls made in the current context."""
+        _current_reply.set(self)
+
+    def close(self) -> None:
+        """Stops collecting calls. Later calls are sent normally."""
+        self.closed = True
+        self.ready.set()
+
+    def capture(self, endpoint: str, request_data: RequestData | None) -> bool:
+        """Captures the call if it is the first one and is eligible.
+        Returns whether the call was captured."""
+        if self.closed:
+            return False
+        if (
+            endpoint not in INLINE_REPLY_METHODS
+            or request_data is None
+            or request_data.contains_files
+        ):
+            self.close()
+            return False
+        self.method = endpoint
+        self.parameters = request_data.parameters
+        self.close()
+        return True
+
+    def to_dict(self) -> dict | None:
+        """Gets the webhook response body, or None if no call was captured."""
+        if self.method is None:
+            return None
+        return {"method": self.method, **self.parameters}
+
+    async def wait(self, task: asyncio.Task, wait_for_completion: bool) -> dict | None:
+        """Waits until a call is captured or the task finishes, then closes the reply.
+        If `wait_for_completion` is set, waits for the task regardless."""
+        if wait_for_completion:
+            await asyncio.shield(task)
+        else:
+            waiter = asyncio.ensure_future(self.ready.wait())
+            await asyncio.wait({task, waiter}, return_when=asyncio.FIRST_COMPLETED)
+            waiter.cancel()
+        self.close()
+        return self.to_dict()
+
+
+class WebhookReplyRequest(HTTPXRequest):
+    """HTTPXRequest that hands eligible calls to the active WebhookReply."""
+
+    async def do_request(
+        self, url: str, method: str, request_data: RequestData | None = None, **kwargs
+    ) -> tuple[int, bytes]:
+        reply = _current_reply.get()
+        if reply is not None and reply.capture(url.rsplit("/", 1)[-1], request_data):
+            return 200, _CAPTURED_RESPONSE
+        return await super().do_request(url, method, request_data, **kwargs)
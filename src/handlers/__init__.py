@@ -2,5 +2,6 @@
 
 from .attendance_handler import AttendanceHandler
 from .ban_handler import BanHandler
+from .callback_router import CallbackQueryRouter
 from .general_handler import GeneralHandler
 from .poll_handler import PollHandler
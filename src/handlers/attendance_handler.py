@@ -11,6 +11,7 @@ from src.service import AttendanceService, BanService, PollGroupService, PollSer
 from src.util import (
     CustomContext,
     PollNotFoundError,
+    decode_attendance_lists_page,
     decode_manage_attendance_list,
     decode_mark_attendance,
     decode_view_attendance_list,
@@ -19,6 +20,7 @@ from src.util import (
     routes,
 )
 from src.view import (
+    ATTENDANCE_LIST_MENU_KEYBOARDS,
     REQUEST_FOR_ATTENDANCE_LIST_INPUT_TEXT,
     build_attendance_list_deleted_message,
     build_attendance_list_logged_and_deleted_message,
@@ -74,16 +76,14 @@ class AttendanceHandler:
     async def get_attendance_lists(self, update: Update, _: CustomContext) -> int:
         """Displays the list of attendance lists."""
         user = update.message.from_user
-        attendance_lists = self.attendance_service.get_attendance_lists_by_owner_id(
-            user.id
-        )
-        if not attendance_lists:
+        page = await self.attendance_service.get_attendance_list_summaries(user.id)
+        if page.is_empty():
             await update.message.reply_text(build_no_attendance_lists_text())
             return ConversationHandler.END
         await update.message.reply_text(
             build_view_attendance_list_text(),
             reply_markup=InlineKeyboardMarkup(
-                build_inline_keyboard_for_attendance_lists(attendance_lists)
+                build_inline_keyboard_for_attendance_lists(page)
             ),
         )
         return routes["VIEW_LIST"]
@@ -91,15 +91,15 @@ class AttendanceHandler:
     async def handle_import_from_poll(self, update: Update, _: CustomContext) -> int:
         """Imports the attendance list from a poll."""
         user = update.message.from_user
-        poll_groups = self.poll_group_service.get_poll_groups(user)
+        page = await self.poll_group_service.get_poll_groups(user)
 
-        if not poll_groups:
+        if page.is_empty():
             await update.message.reply_text(build_no_attendance_lists_for_import_text())
             return ConversationHandler.END
         await update.message.reply_text(
             build_select_poll_group_to_import_text(),
             reply_markup=InlineKeyboardMarkup(
-                build_select_poll_group_to_import_options(poll_groups)
+                build_select_poll_group_to_import_options(page)
             ),
         )
         return routes["SELECT_POLL_GROUP"]
@@ -107,7 +107,7 @@ class AttendanceHandler:
     async def handle_select_poll_group(self, update: Update, _: CustomContext) -> int:
         """Handles the selection of a poll group for importing attendance lists."""
         poll_group_id = update.callback_query.data
-        poll_group, polls = self.poll_group_service.get_full_poll_group_details(
+        poll_group, polls = await self.poll_group_service.get_full_poll_group_details(
             poll_group_id
         )
         await update.callback_query.answer()
@@ -130,8 +130,10 @@ class AttendanceHandler:
         poll_id = update.callback_query.data
 
         try:
-            attendance_list = self.attendance_service.create_attendance_list_from_poll(
-                poll_id, update.callback_query.from_user
+            attendance_list = (
+                await self.attendance_service.create_attendance_list_from_poll(
+                    poll_id, update.callback_query.from_user
+                )
             )
         except PollNotFoundError:
             await update.callback_query.edit_message_text(
@@ -147,7 +149,7 @@ class AttendanceHandler:
         """Handles viewing an attendance list."""
         attendance_list_id = decode_view_attendance_list(update.callback_query.data)
 
-        attendance_list = self.attendance_service.get_attendance_list(
+        attendance_list = await self.attendance_service.get_attendance_list(
             attendance_list_id
         )
         if not attendance_list:
@@ -220,16 +222,16 @@ class AttendanceHandler:
             )
             return routes["RECEIVE_EDITED_LIST"]
         if command == "delete":
-            self.attendance_service.delete_attendance_list(attendance_list.id)
+            await self.attendance_service.delete_attendance_list(attendance_list.id)
             await update.callback_query.edit_message_text(
                 build_attendance_list_deleted_message()
             )
             return ConversationHandler.END
         if command == "log_and_delete":
-            self.ban_service.log_bans(
+            await self.ban_service.log_bans(
                 attendance_list, update.callback_query.from_user.id
             )
-            self.attendance_service.delete_attendance_list(attendance_list.id)
+            await self.attendance_service.delete_attendance_list(attendance_list.id)
             await update.callback_query.edit_message_text(
                 build_attendance_list_logged_and_deleted_message()
             )
@@ -249,7 +251,7 @@ class AttendanceHandler:
                 build_invalid_attendance_list_format_message()
             )
             return routes["RECEIVE_EDITED_LIST"]
-        attendance_list = self.attendance_service.process_edited_list(
+        attendance_list = await self.attendance_service.process_edited_list(
             old_list, attendance_list
         )
         await self._reply_take_attendance_buttons(attendance_list, update)
@@ -274,7 +276,7 @@ class AttendanceHandler:
                 build_invalid_attendance_list_format_message()
             )
             return routes["RECEIVE_INPUT_LIST"]
-        attendance_list = self.attendance_service.create_attendance_list(
+        attendance_list = await self.attendance_service.create_attendance_list(
             attendance_list, update.message.from_user.id
         )
         await self._reply_take_attendance_buttons(attendance_list, update)
@@ -283,17 +285,17 @@ class AttendanceHandler:
     async def handle_summary_request(self, update: Update, _: CustomContext) -> int:
         """Handle request for attendance summary via /summary."""
 
-        attendance_lists = self.attendance_service.get_attendance_lists_by_owner_id(
+        page = await self.attendance_service.get_attendance_list_summaries(
             update.message.from_user.id
         )
-        if not attendance_lists:
+        if page.is_empty():
             await update.message.reply_text(build_no_attendance_lists_text())
             return ConversationHandler.END
 
         await update.message.reply_text(
             build_view_attendance_summaries_text(),
             reply_markup=InlineKeyboardMarkup(
-                build_inline_keyboard_for_attendance_summaries(attendance_lists)
+                build_inline_keyboard_for_attendance_summaries(page)
             ),
         )
         return ConversationHandler.END
@@ -305,7 +307,7 @@ class AttendanceHandler:
         attendance_list_id, with_refresh = decode_view_attendance_summary(
             update.callback_query.data
         )
-        attendance_list = self.attendance_service.get_attendance_list(
+        attendance_list = await self.attendance_service.get_attendance_list(
             attendance_list_id
         )
         await update.callback_query.answer()
@@ -324,20 +326,38 @@ class AttendanceHandler:
         self, update: Update, _: CustomContext
     ) -> int:
         """Handles request for the summary for attendance tracking excel sheet"""
-        attendance_lists = self.attendance_service.get_attendance_lists_by_owner_id(
+        page = await self.attendance_service.get_attendance_list_summaries(
             update.message.from_user.id
         )
-        if not attendance_lists:
+        if page.is_empty():
             await update.message.reply_text(build_no_attendance_lists_text())
             return ConversationHandler.END
         await update.message.reply_text(
             build_view_attendance_summary_excel_format_text(),
             reply_markup=InlineKeyboardMarkup(
-                build_inline_keyboard_for_attendance_tracking_format(attendance_lists)
+                build_inline_keyboard_for_attendance_tracking_format(page)
             ),
         )
         return ConversationHandler.END
 
+    async def handle_attendance_lists_page_callback(
+        self, update: Update, _: CustomContext
+    ) -> None:
+        """Handles the callback to show the newer or older page of an attendance list
+        menu."""
+        menu, cursor, is_next = decode_attendance_lists_page(update.callback_query.data)
+        owner_id = update.callback_query.from_user.id
+        await update.callback_query.answer()
+        page = await self.attendance_service.get_attendance_list_summaries(
+            owner_id, cursor, is_next
+        )
+        if page.is_empty():
+            # The attendance lists around the cursor were deleted, so start over
+            page = await self.attendance_service.get_attendance_list_summaries(owner_id)
+        await update.callback_query.edit_message_reply_markup(
+            InlineKeyboardMarkup(ATTENDANCE_LIST_MENU_KEYBOARDS[menu](page))
+        )
+
     async def handle_view_attendance_excel_summary(
         self, update: Update, _: CustomContext
     ) -> int:
@@ -345,7 +365,7 @@ class AttendanceHandler:
         attendance_list_id = decode_view_attendance_tracking_format(
             update.callback_query.data
         )
-        attendance_list = self.attendance_service.get_attendance_list(
+        attendance_list = await self.attendance_service.get_attendance_list(
             attendance_list_id
         )
         await update.callback_query.answer()
@@ -359,7 +379,7 @@ class AttendanceHandler:
         user_id, attendance_list_id, new_status = decode_mark_attendance(
             update.callback_query.data
         )
-        attendance_list = self.attendance_service.update_user_status(
+        attendance_list = await self.attendance_service.update_user_status(
             attendance_list_id, user_id, new_status
         )
 
@@ -368,6 +388,7 @@ class AttendanceHandler:
                 build_attendance_list_not_found_message()
             )
             return ConversationHandler.END
+        await update.callback_query.answer()
         attendance_list_buttons = build_take_attendance_buttons(attendance_list)
         message_text = update.callback_query.message.text
         index = self._parse_index_from_message_text(message_text)
@@ -18,7 +18,7 @@ class BanHandler:
     async def get_bans(self, update: Update, _: CustomContext) -> int:
         """Gets all banned users for the command issuer."""
         user_id = update.message.from_user.id
-        banned = self.ban_service.get_banned_users(str(user_id))
+        banned = await self.ban_service.get_banned_users(str(user_id))
         if not banned:
             await update.message.reply_text("You have not banned any users.")
             return
@@ -35,9 +35,9 @@ class BanHandler:
         user_to_unban = decode_unban_user(query.data)
         issuer_user_id = str(query.from_user.id)
 
-        self.ban_service.unban_user(user_to_unban, issuer_user_id)
+        await self.ban_service.unban_user(user_to_unban, issuer_user_id)
         self.logger.info("User %s unbanned user %s.", issuer_user_id, user_to_unban)
-        banned = self.ban_service.get_banned_users(issuer_user_id)
+        banned = await self.ban_service.get_banned_users(issuer_user_id)
         if banned:
             keyboard = build_banned_users_keyboard(banned)
             await query.edit_message_text(
@@ -0,0 +1,66 @@
+"""Handler that dispatches callback queries by the prefix of their data."""
+
+from collections import Counter
+from typing import Any, Callable, Coroutine
+
+from telegram import Update
+from telegram.ext import Application, BaseHandler
+
+from src.util import CustomContext, get_callback_prefix
+
+RouteCallback = Callable[[Update, CustomContext], Coroutine[Any, Any, Any]]
+
+
+class CallbackQueryRouter(BaseHandler[Update, CustomContext, Any]):
+    """
+    Dispatches callback queries to the callback registered for the prefix of their data
+    with a single dictionary lookup, instead of testing a regex per handler.
+    Callback queries without a registered prefix are left to the other handlers.
+    """
+
+    def __init__(self, routes: dict[str, RouteCallback]):
+        super().__init__(self._dispatch)
+        self.routes = routes
+        self.hits = Counter()
+        self.misses = 0
+
+    def check_update(self, update: object) -> tuple[str, RouteCallback] | None:
+        if not isinstance(update, Update) or update.callback_query is None:
+            return None
+        data = update.callback_query.data
+        if data is None:
+            return None
+        prefix = get_callback_prefix(data)
+        callback = self.routes.get(prefix)
+        if callback is None:
+            self.misses += 1
+            return None
+        return prefix, callback
+
+    async def handle_update(
+        self,
+        update: Update,
+        application: Application,
+        check_result: tuple[str, RouteCallback],
+        context: CustomContext,
+    ) -> Any:
+        prefix, callback = check_result
+        self.hits[prefix] += 1
+        return await callback(update, context)
+
+    async def _dispatch(self, update: Update, context: CustomContext) -> Any:
+        """Dispatches an update without a precomputed check result."""
+        check_result = self.check_update(update)
+        if check_result is None:
+            return None
+        _, callback = check_result
+        return await callback(update, context)
+
+    def stats(self) -> dict:
+        """Returns the number of callback queries dispatched per route."""
+        return {
+            "hits": {
+                prefix: self.hits[prefix] for prefix in self.routes if self.hits[prefix]
+            },
+            "unrouted": self.misses,
+        }
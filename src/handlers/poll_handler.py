@@ -6,13 +6,18 @@ import logging
 
 from telegram import InlineKeyboardMarkup, Update
 from telegram.constants import ParseMode
-from telegram.error import BadRequest
 from telegram.ext import ConversationHandler
 
-from src.service import PollGroupService, PollService, TelegramMessageUpdater
+from src.service import (
+    PollGroupService,
+    PollRenderCache,
+    PollService,
+    TelegramMessageUpdater,
+)
 from src.util import (
     POLL_GROUP_MANAGEMENT_TEXT,
     CustomContext,
+    Membership,
     PollGroupNotFoundError,
     PollNotFoundError,
     Status,
@@ -22,7 +27,9 @@ from src.util import (
     decode_generate_next_poll_callback,
     decode_manage_active_polls_callback,
     decode_manage_poll_groups_callback,
+    decode_poll_groups_page,
     decode_poll_voting_callback,
+    decode_publish_option_result_id,
     decode_publish_poll_query,
     decode_set_poll_active_status_callback,
     decode_update_poll_results_callback,
@@ -30,6 +37,7 @@ from src.util import (
     routes,
 )
 from src.view import (
+    POLL_GROUP_MENU_KEYBOARDS,
     build_ask_user_to_register_username_message,
     build_cannot_generate_next_poll_message,
     build_cannot_manage_active_polls_message,
@@ -56,9 +64,7 @@ from src.view import (
     build_select_poll_group_message,
     build_select_poll_group_options,
     build_user_banned_message,
-    build_voting_buttons,
     generate_manage_active_polls_buttons,
-    generate_poll_group_text,
 )
 
 
@@ -70,27 +76,42 @@ class PollHandler:
         poll_service: PollService,
         poll_group_service: PollGroupService,
         telegram_message_updater: TelegramMessageUpdater,
+        poll_render_cache: PollRenderCache,
     ):
         self.poll_service = poll_service
         self.poll_group_service = poll_group_service
         self.telegram_message_updater = telegram_message_updater
+        self.poll_render_cache = poll_render_cache
         self.logger = logging.getLogger(__name__)
 
     async def get_polls(self, update: Update, _: CustomContext) -> int:
         """Handles the /polls command to list the user's poll groups."""
         user = update.message.from_user
-        poll_groups = self.poll_group_service.get_poll_groups(user)
-        if not poll_groups:
+        page = await self.poll_group_service.get_poll_groups(user)
+        if page.is_empty():
             await update.message.reply_text(build_no_polls_message())
             return ConversationHandler.END
         await update.message.reply_text(
             build_select_poll_group_message(),
-            reply_markup=InlineKeyboardMarkup(
-                build_select_poll_group_options(poll_groups)
-            ),
+            reply_markup=InlineKeyboardMarkup(build_select_poll_group_options(page)),
         )
         return ConversationHandler.END
 
+    async def handle_poll_groups_page_callback(
+        self, update: Update, _: CustomContext
+    ) -> None:
+        """Handles the callback to show the newer or older page of a poll group menu."""
+        cursor, is_next, menu = decode_poll_groups_page(update.callback_query.data)
+        user = update.callback_query.from_user
+        await update.callback_query.answer()
+        page = await self.poll_group_service.get_poll_groups(user, cursor, is_next)
+        if page.is_empty():
+            # The poll groups around the cursor were deleted, so start over
+            page = await self.poll_group_service.get_poll_groups(user)
+        await update.callback_query.edit_message_reply_markup(
+            InlineKeyboardMarkup(POLL_GROUP_MENU_KEYBOARDS[menu](page))
+        )
+
     async def poll_title_clicked_callback(
         self, update: Update, _: CustomContext
     ) -> int:
@@ -99,7 +120,7 @@ class PollHandler:
         await update.callback_query.answer()
         poll_group_id = decode_manage_poll_groups_callback(update.callback_query.data)
 
-        poll_group = self.poll_group_service.get_poll_group(poll_group_id, user)
+        poll_group = await self.poll_group_service.get_poll_group(poll_group_id, user)
 
         if poll_group is None:
             await update.callback_query.edit_message_text(
@@ -209,11 +230,10 @@ class PollHandler:
             return routes["GET_DETAILS"]
 
         polls_details = context.user_data["polls"]
-        polls_ids = self.poll_service.save_event_polls(polls_details)
-        poll_group = self.poll_group_service.create_poll_group(
+        polls_ids = await self.poll_service.save_event_polls(polls_details)
+        poll_group = await self.poll_group_service.create_poll_group(
             user_id, context.user_data["poll_name"], polls_ids
         )
-        self.poll_service.update_poll_group_id(polls_ids, poll_group.id)
 
         inline_keyboard = build_poll_group_management_options(poll_group)
         await update.message.reply_text(
@@ -236,14 +256,33 @@ class PollHandler:
             await update.inline_query.answer([])
             return
         try:
-            poll_group, polls = self.poll_group_service.get_full_poll_group_details(
-                poll_group_id
+            poll_group, polls = (
+                await self.poll_group_service.get_full_poll_group_details(poll_group_id)
             )
         except (PollGroupNotFoundError, PollNotFoundError) as e:
             self.logger.warning("Error fetching poll/poll group details: %s", e)
             await update.inline_query.answer([])
             return
-        await update.inline_query.answer(build_publish_options(poll_group, polls))
+        messages = {
+            membership: await self.poll_render_cache.get_message(
+                poll_group, polls, membership
+            )
+            for membership in Membership
+        }
+        await update.inline_query.answer(build_publish_options(poll_group, messages))
+
+    async def handle_chosen_publish_option(
+        self, update: Update, _: CustomContext
+    ) -> None:
+        """Registers the inline message a poll group was published as, so that it is
+        refreshed along with the other copies."""
+        result = update.chosen_inline_result
+        if result.inline_message_id is None:
+            return
+        poll_group_id, membership = decode_publish_option_result_id(result.result_id)
+        await self.telegram_message_updater.register_published_message(
+            poll_group_id, membership, result.inline_message_id
+        )
 
     async def handle_poll_voting_callback(
         self, update: Update, _: CustomContext
@@ -263,7 +302,7 @@ class PollHandler:
         username = f"@{user.username}"
 
         try:
-            poll = self.poll_service.set_person_in_poll(
+            poll = await self.poll_service.set_person_in_poll(
                 poll_id, username, membership, is_sign_up, pollmaker_id
             )
         except PollNotFoundError:
@@ -285,14 +324,17 @@ class PollHandler:
         )
 
         # Update the poll message
-        poll_group, polls = self.poll_group_service.get_full_poll_group_details(
+        poll_group, polls = await self.poll_group_service.get_full_poll_group_details(
             poll.poll_group_id
         )
 
+        text, reply_markup = await self.poll_render_cache.get_message(
+            poll_group, polls, membership
+        )
         await self.telegram_message_updater.update_polls_message(
-            update.callback_query.inline_message_id,
-            generate_poll_group_text(poll_group, polls, membership),
-            InlineKeyboardMarkup(build_voting_buttons(polls, membership, pollmaker_id)),
+            update.callback_query,
+            text,
+            reply_markup,
             ParseMode.MARKDOWN_V2,
             poll.poll_group_id,
             membership,
@@ -316,7 +358,7 @@ class PollHandler:
         new_poll_name = update.message.text
         poll_group_id = context.user_data["poll_group_id"]
 
-        new_group, next_polls = self.poll_group_service.generate_next_poll_group(
+        new_group, next_polls = await self.poll_group_service.generate_next_poll_group(
             poll_group_id, new_poll_name
         )
         if new_group is None:
@@ -338,7 +380,7 @@ class PollHandler:
         """Handles the callback when a user requests to update poll results."""
         data = update.callback_query.data
         poll_group_id = decode_update_poll_results_callback(data)
-        poll_group, polls = self.poll_group_service.get_full_poll_group_details(
+        poll_group, polls = await self.poll_group_service.get_full_poll_group_details(
             poll_group_id
         )
         await update.callback_query.answer()
@@ -347,14 +389,12 @@ class PollHandler:
                 build_cannot_update_poll_results_message()
             )
             return
-        try:
-            await update.callback_query.edit_message_text(
-                build_poll_maker_overview_text(poll_group, polls),
-                reply_markup=update.callback_query.message.reply_markup,
-                parse_mode=ParseMode.MARKDOWN_V2,
-            )
-        except BadRequest:
-            pass  # nothing changes
+        await self.telegram_message_updater.edit_callback_message(
+            update.callback_query,
+            build_poll_maker_overview_text(poll_group, polls),
+            reply_markup=update.callback_query.message.reply_markup,
+            parse_mode=ParseMode.MARKDOWN_V2,
+        )
 
     async def handle_delete_poll_callback(
         self, update: Update, _: CustomContext
@@ -364,7 +404,9 @@ class PollHandler:
         # TODO: add confirmation step
         data = update.callback_query.data
         poll_group_id = decode_delete_poll_callback(data)
-        new_delete = self.poll_group_service.delete_poll_group(poll_group_id, user)
+        new_delete = await self.poll_group_service.delete_poll_group(
+            poll_group_id, user
+        )
         await update.callback_query.answer()
         await update.callback_query.edit_message_text(
             build_poll_deleted_message(new_delete)
@@ -377,7 +419,7 @@ class PollHandler:
         data = update.callback_query.data
         poll_group_id = decode_manage_active_polls_callback(data)
         await update.callback_query.answer()
-        poll_group, polls = self.poll_group_service.get_full_poll_group_details(
+        poll_group, polls = await self.poll_group_service.get_full_poll_group_details(
             poll_group_id
         )
         if poll_group is None:
@@ -400,8 +442,8 @@ class PollHandler:
         poll_id, membership, is_active = decode_set_poll_active_status_callback(data)
         await update.callback_query.answer()
 
-        poll = self.poll_service.set_active_status(poll_id, membership, is_active)
-        poll_group, polls = self.poll_group_service.get_full_poll_group_details(
+        poll = await self.poll_service.set_active_status(poll_id, membership, is_active)
+        poll_group, polls = await self.poll_group_service.get_full_poll_group_details(
             poll.poll_group_id
         )
         if poll_group is None:
@@ -409,12 +451,10 @@ class PollHandler:
                 build_cannot_manage_active_polls_message()
             )
             return
-        try:
-            await update.callback_query.edit_message_text(
-                build_manage_active_polls_message(),
-                reply_markup=InlineKeyboardMarkup(
-                    generate_manage_active_polls_buttons(polls, poll_group.id)
-                ),
-            )
-        except BadRequest:
-            pass  # nothing changes
+        await self.telegram_message_updater.edit_callback_message(
+            update.callback_query,
+            build_manage_active_polls_message(),
+            reply_markup=InlineKeyboardMarkup(
+                generate_manage_active_polls_buttons(polls, poll_group.id)
+            ),
+        )
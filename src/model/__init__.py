@@ -1,6 +1,7 @@
 """Data models for the application."""
 
-from .attendance_list import AttendanceList
+from .attendance_list import AttendanceList, AttendanceListSummary
 from .event_poll import EventPoll
+from .page import Page
 from .person import Person
 from .poll_group import PollGroup
@@ -220,3 +220,22 @@ class AttendanceList:
             removed_non_regulars_count,
             removed_regulars_count,
         )
+
+
+class AttendanceListSummary:
+    """Class representing the title of an attendance list, for listing it in menus
+    without loading its people."""
+
+    def __init__(self, attendance_id: str, title: str):
+        self.id = attendance_id
+        self.title = title
+
+    def get_title(self):
+        """Gets the title of the attendance list."""
+        return self.title
+
+    @staticmethod
+    def from_dict(dct):
+        """Creates an AttendanceListSummary from a dictionary holding the ID and at
+        least the first line of the details."""
+        return AttendanceListSummary(str(dct["_id"]), dct["details"][0])
@@ -2,7 +2,7 @@
 
 from datetime import datetime, timedelta
 from enum import Enum
-from typing import List
+from typing import List, Tuple
 
 from src.util import Membership, format_dt_string
 
@@ -19,7 +19,15 @@ class PollType(Enum):
 class EventPoll:
     """Class representing an event poll."""
 
-    def __init__(self, start_time, end_time, details, allocations, is_active=None):
+    def __init__(
+        self,
+        start_time,
+        end_time,
+        details,
+        allocations,
+        is_active=None,
+        formatted_times=None,
+    ):
         self.id = None
         self.start_time = start_time
         self.end_time = end_time
@@ -33,12 +41,27 @@ class EventPoll:
             self.is_active = is_active
         self.allocations = allocations
         self.poll_group_id = None
+        # Date, start time and end time as displayed, formatted at most once
+        self._formatted_times = (
+            tuple(formatted_times) if formatted_times is not None else None
+        )
+        self._title = None
+
+    def get_formatted_times(self) -> Tuple[str, str, str]:
+        """Gets the date, start time and end time of the poll as displayed. They are
+        formatted on first use, unless they were stored with the poll."""
+        if self._formatted_times is None:
+            start_date, start_time = format_dt_string(self.start_time)
+            _, end_time = format_dt_string(self.end_time)
+            self._formatted_times = (start_date, start_time, end_time)
+        return self._formatted_times
 
     def get_title(self):
         """Builds the title string for the poll."""
-        [start_date, start_time] = format_dt_string(self.start_time)
-        [_, end_time] = format_dt_string(self.end_time)
-        return f"{start_date} {start_time} - {end_time}"
+        if self._title is None:
+            start_date, start_time, end_time = self.get_formatted_times()
+            self._title = f"{start_date} {start_time} - {end_time}"
+        return self._title
 
     def to_dict(self):
         """Converts the EventPoll object to a dictionary."""
@@ -53,13 +76,18 @@ class EventPoll:
             "type": self.type.value,
             "allocations": self.allocations,
             "poll_group_id": self.poll_group_id,
+            "formatted_times": list(self.get_formatted_times()),
         }
 
     @staticmethod
     def from_dict(dct):
         """Creates an EventPoll object from a dictionary."""
         poll = EventPoll(
-            dct["start_time"], dct["end_time"], dct["details"], dct["allocations"]
+            dct["start_time"],
+            dct["end_time"],
+            dct["details"],
+            dct["allocations"],
+            formatted_times=dct.get("formatted_times"),
         )
         poll.id = dct["id"]
         poll.regulars = dct["regulars"]
@@ -0,0 +1,22 @@
+"""Model for a page of items listed newest first."""
+
+from typing import List
+
+
+class Page:
+    """Class representing a page of items and the cursors to its neighbouring pages.
+    A cursor is None if there is no page in that direction."""
+
+    def __init__(
+        self,
+        items: List,
+        previous_cursor: str | None = None,
+        next_cursor: str | None = None,
+    ):
+        self.items = items
+        self.previous_cursor = previous_cursor
+        self.next_cursor = next_cursor
+
+    def is_empty(self) -> bool:
+        """Returns whether the page has no items."""
+        return not self.items
@@ -1,8 +1,6 @@
 """Model for a group of polls."""
 
 
-# TODO: create the aggregated poll results in the db as well for efficient access.
-# remember to use transactions to ensure that the poll results are consistent
 class PollGroup:
     """Class representing a group of polls."""
 
@@ -14,6 +12,8 @@ class PollGroup:
         self.owner_id = owner_id
         self.id = None
         self.name = name
+        # Version of the group's results snapshot when it was read, if read from one
+        self.results_version = None
 
     def to_dict(self):
         """Converts the PollGroup to a dictionary."""
@@ -1,13 +1,26 @@
 """Collections package initialization."""
 
+import os
+
+import redis
+import redis.asyncio
+from motor.motor_asyncio import AsyncIOMotorClient
 from pymongo import MongoClient
 
 from src.util import import_env
 
-from .attendance_repository import AttendanceRepository
-from .ban_repository import BanRepository
-from .poll_group_repository import PollGroupRepository
-from .poll_repository import PollRepository
+from .attendance_repository import AsyncAttendanceRepository, AttendanceRepository
+from .ban_cache import BanCache
+from .ban_repository import AsyncBanRepository, BanRepository
+from .migrations import Migration, MigrationRunner
+from .owner_ids import normalize_owner_ids
+from .poll_group_repository import AsyncPollGroupRepository, PollGroupRepository
+from .poll_repository import AsyncPollRepository, PollRepository
+from .redis_pool import (
+    DEFAULT_REDIS_MAX_CONNECTIONS,
+    RedisConnectionPool,
+    create_redis_pool,
+)
 
 env_variables = [
     "MONGO_URL",
@@ -19,14 +32,76 @@ env_variables = [
 ]
 env_config = import_env(env_variables)
 
+# Synchronous clients, for scripts
 client = MongoClient(env_config["MONGO_URL"])
 db = client[env_config["MONGO_DB_NAME"]]
 polls_collection = db[env_config["MONGO_POLLS_COLLECTION_NAME"]]
 groups_collection = db[env_config["MONGO_GROUPS_COLLECTION_NAME"]]
 attendance_collection = db[env_config["MONGO_ATTENANCES_COLLECTION_NAME"]]
 
-
-poll_repo = PollRepository(polls_collection)
-poll_group_repo = PollGroupRepository(groups_collection)
+poll_repo = PollRepository(polls_collection, groups_collection)
+poll_group_repo = PollGroupRepository(
+    groups_collection, env_config["MONGO_POLLS_COLLECTION_NAME"]
+)
 attendance_repo = AttendanceRepository(attendance_collection)
-ban_repo = BanRepository(env_config["REDIS_URL"])
+
+redis_client = redis.Redis.from_url(env_config["REDIS_URL"], decode_responses=True)
+ban_repo = BanRepository(redis_client)
+
+
+def _store_formatted_times():
+    poll_repo.backfill_formatted_times()
+    # The results snapshots hold copies of the polls
+    poll_group_repo.rebuild_results()
+
+
+schema_collection = db["schema_migrations"]
+migration_runner = MigrationRunner(
+    schema_collection,
+    [poll_repo, poll_group_repo, attendance_repo],
+    [
+        Migration(
+            1,
+            "Build the results snapshots of poll groups",
+            poll_group_repo.rebuild_results,
+        ),
+        Migration(
+            2,
+            "Store the owner IDs of attendance lists and poll groups as ints",
+            lambda: normalize_owner_ids(attendance_collection)
+            + normalize_owner_ids(groups_collection),
+        ),
+        Migration(3, "Index the bans in Redis by issuer", ban_repo.backfill_ban_index),
+        Migration(
+            4,
+            "Store the displayed times of polls",
+            _store_formatted_times,
+        ),
+    ],
+)
+
+# Asyncio clients, for the bot. Motor binds to the event loop it is first used on.
+async_client = AsyncIOMotorClient(env_config["MONGO_URL"])
+async_db = async_client[env_config["MONGO_DB_NAME"]]
+async_polls_collection = async_db[env_config["MONGO_POLLS_COLLECTION_NAME"]]
+async_groups_collection = async_db[env_config["MONGO_GROUPS_COLLECTION_NAME"]]
+async_attendance_collection = async_db[env_config["MONGO_ATTENANCES_COLLECTION_NAME"]]
+
+async_poll_repo = AsyncPollRepository(async_polls_collection, async_groups_collection)
+async_poll_group_repo = AsyncPollGroupRepository(
+    async_groups_collection, env_config["MONGO_POLLS_COLLECTION_NAME"]
+)
+async_attendance_repo = AsyncAttendanceRepository(async_attendance_collection)
+
+# One pool of asyncio Redis connections, shared by the bot and the debounce worker.
+# Like Motor, it binds to the event loop it is first used on.
+redis_pool = create_redis_pool(
+    env_config["REDIS_URL"],
+    int(os.getenv("REDIS_MAX_CONNECTIONS", DEFAULT_REDIS_MAX_CONNECTIONS)),
+)
+async_redis_client = redis.asyncio.Redis(connection_pool=redis_pool)
+
+# Ban lookups are cached in process when a TTL is configured
+ban_cache_ttl_seconds = float(os.getenv("BAN_CACHE_TTL_SECONDS", "0"))
+ban_cache = BanCache(ban_cache_ttl_seconds) if ban_cache_ttl_seconds > 0 else None
+async_ban_repo = AsyncBanRepository(async_redis_client, ban_cache)
@@ -2,22 +2,41 @@
 Abstraction to store attendances in the database.
 """
 
+from typing import List
+
 from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pymongo.collection import Collection
 
-from src.model import AttendanceList
+from src.model import AttendanceList, AttendanceListSummary, Page
 from src.util import AttendanceListNotFoundError
 
+from .owner_ids import to_stored_document, to_stored_owner_id
+from .pagination import PAGE_SIZE, build_page, build_page_query
+
+# Attendance lists are listed by their owner, newest first
+ATTENDANCE_INDEXES = [IndexModel([("owner_id", ASCENDING), ("_id", DESCENDING)])]
+
+# Fetches only the ID and title of an attendance list, for AttendanceListSummary
+SUMMARY_PROJECTION = {"_id": 1, "details": {"$slice": 1}}
+
 
 class AttendanceRepository:
     """Repository for managing attendance list storage."""
 
+    INDEXES = ATTENDANCE_INDEXES
+
     def __init__(self, collection: Collection):
         self.collection = collection
 
     def insert_attendance_list(self, attendance: AttendanceList) -> AttendanceList:
         """Insert a new attendance list into the database."""
-        new_id = str(self.collection.insert_one(attendance.to_dict()).inserted_id)
+        new_id = str(
+            self.collection.insert_one(
+                to_stored_document(attendance.to_dict())
+            ).inserted_id
+        )
         attendance.insert_id(new_id)
         return attendance
 
@@ -32,15 +51,37 @@ class AttendanceRepository:
 
     def get_attendance_lists_by_owner_id(self, owner_id):
         """Retrieve all attendance lists owned by a specific user."""
-        attendance_jsons = list(self.collection.find({"owner_id": owner_id}))
-        attendance_jsons.extend(
-            self.collection.find({"owner_id": str(owner_id)})
-        )  # in case owner_id is stored as str
+        attendance_jsons = list(
+            self.collection.find({"owner_id": to_stored_owner_id(owner_id)})
+        )
         attendance_lists = list(map(AttendanceList.from_dict, attendance_jsons))
         for i, attendance in enumerate(attendance_lists):
             attendance.insert_id(str(attendance_jsons[i]["_id"]))
         return attendance_lists
 
+    def get_attendance_list_summaries_by_owner_id(
+        self,
+        owner_id,
+        cursor: str | None = None,
+        is_next: bool = True,
+        page_size: int = PAGE_SIZE,
+    ) -> Page:
+        """Retrieve a page of the IDs and titles of the attendance lists owned by a
+        user, newest first. See `build_page_query` for the cursor."""
+        query, sort = build_page_query(to_stored_owner_id(owner_id), cursor, is_next)
+        attendance_jsons = list(
+            self.collection.find(query, SUMMARY_PROJECTION)
+            .sort(sort)
+            .limit(page_size + 1)
+        )
+        return build_page(
+            attendance_jsons,
+            cursor,
+            is_next,
+            page_size,
+            AttendanceListSummary.from_dict,
+        )
+
     def patch_user_status_in_attendance_list(
         self, attendance_list: AttendanceList, user_id, new_status
     ):
@@ -54,9 +95,95 @@ class AttendanceRepository:
     def put_attendance_list(self, attendance_id, attendance_list: AttendanceList):
         """Update an entire attendance list in the database."""
         return self.collection.update_one(
-            {"_id": ObjectId(attendance_id)}, {"$set": attendance_list.to_dict()}
+            {"_id": ObjectId(attendance_id)},
+            {"$set": to_stored_document(attendance_list.to_dict())},
         )
 
     def delete_attendance_list(self, attendance_id):
         """Delete an attendance list from the database."""
         return self.collection.delete_one({"_id": ObjectId(attendance_id)})
+
+
+class AsyncAttendanceRepository:
+    """Asyncio repository for managing attendance list storage, backed by Motor."""
+
+    INDEXES = ATTENDANCE_INDEXES
+
+    def __init__(self, collection: AsyncIOMotorCollection):
+        self.collection = collection
+
+    async def insert_attendance_list(
+        self, attendance: AttendanceList
+    ) -> AttendanceList:
+        """Insert a new attendance list into the database."""
+        result = await self.collection.insert_one(
+            to_stored_document(attendance.to_dict())
+        )
+        attendance.insert_id(str(result.inserted_id))
+        return attendance
+
+    async def get_attendance_list(self, attendance_id):
+        """Retrieve an attendance list by its ID."""
+        attendance_json = await self.collection.find_one(
+            {"_id": ObjectId(attendance_id)}
+        )
+        if attendance_json is None:
+            raise AttendanceListNotFoundError(attendance_id)
+        attendance = AttendanceList.from_dict(attendance_json)
+        attendance.insert_id(attendance_id)
+        return attendance
+
+    async def get_attendance_lists_by_owner_id(self, owner_id):
+        """Retrieve all attendance lists owned by a specific user."""
+        attendance_jsons = await self.collection.find(
+            {"owner_id": to_stored_owner_id(owner_id)}
+        ).to_list(None)
+        attendance_lists = list(map(AttendanceList.from_dict, attendance_jsons))
+        for i, attendance in enumerate(attendance_lists):
+            attendance.insert_id(str(attendance_jsons[i]["_id"]))
+        return attendance_lists
+
+    async def get_attendance_list_summaries_by_owner_id(
+        self,
+        owner_id,
+        cursor: str | None = None,
+        is_next: bool = True,
+        page_size: int = PAGE_SIZE,
+    ) -> Page:
+        """Retrieve a page of the IDs and titles of the attendance lists owned by a
+        user, newest first. See `build_page_query` for the cursor."""
+        query, sort = build_page_query(to_stored_owner_id(owner_id), cursor, is_next)
+        attendance_jsons = (
+            await self.collection.find(query, SUMMARY_PROJECTION)
+            .sort(sort)
+            .limit(page_size + 1)
+            .to_list(None)
+        )
+        return build_page(
+            attendance_jsons,
+            cursor,
+            is_next,
+            page_size,
+            AttendanceListSummary.from_dict,
+        )
+
+    async def patch_user_status_in_attendance_list(
+        self, attendance_list: AttendanceList, user_id, new_status
+    ):
+        """Update the status of a user in an attendance list."""
+        category, index = attendance_list.get_category_and_index(user_id)
+        return await self.collection.update_one(
+            {"_id": ObjectId(attendance_list.id)},
+            {"$set": {f"{category}.{index}.status": new_status}},
+        )
+
+    async def put_attendance_list(self, attendance_id, attendance_list: AttendanceList):
+        """Update an entire attendance list in the database."""
+        return await self.collection.update_one(
+            {"_id": ObjectId(attendance_id)},
+            {"$set": to_stored_document(attendance_list.to_dict())},
+        )
+
+    async def delete_attendance_list(self, attendance_id):
+        """Delete an attendance list from the database."""
+        return await self.collection.delete_one({"_id": ObjectId(attendance_id)})
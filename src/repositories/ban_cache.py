@@ -0,0 +1,81 @@
+"""In-process cache of ban lookups."""
+
+import threading
+import time
+from collections import Counter, OrderedDict
+
+DEFAULT_BAN_CACHE_SIZE = 10_000
+
+
+def _get_key(user_id, issuer_user_id) -> tuple:
+    # Issuers are passed as ints by handlers and as strs decoded from callback data
+    return str(issuer_user_id), str(user_id)
+
+
+class BanCache:
+    """
+    LRU cache of ban lookups keyed by (issuer, user), holding at most `max_size` entries.
+
+    A user who is not banned is cached for `ttl_seconds`, so a ban made by another worker
+    is missed for at most that long if its invalidation is lost. A ban is cached until it
+    expires, since it can only end early through an unban, which invalidates it.
+    """
+
+    def __init__(self, ttl_seconds: float, max_size: int = DEFAULT_BAN_CACHE_SIZE):
+        self.ttl_seconds = ttl_seconds
+        self.max_size = max_size
+        self._entries: OrderedDict[tuple, tuple[float, str | None]] = OrderedDict()
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+    def get(self, user_id: str, issuer_user_id: str) -> tuple[bool, tuple | None]:
+        """Looks up a ban. Returns whether the lookup was a hit and, if so, the remaining
+        ban time in seconds and the ban message, or None if the user is not banned."""
+        key = _get_key(user_id, issuer_user_id)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] <= now:
+                self._entries.pop(key, None)
+                self._counters["misses"] += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self._counters["hits"] += 1
+        expires_at, message = entry
+        if message is None:
+            return True, None
+        return True, (int(expires_at - now), message)
+
+    def put(self, user_id: str, issuer_user_id: str, ban: tuple | None) -> None:
+        """Caches the result of a ban lookup, as returned by `BanRepository.get_ban`."""
+        now = time.time()
+        if ban is None:
+            entry = (now + self.ttl_seconds, None)
+        else:
+            remaining_seconds, message = ban
+            entry = (now + remaining_seconds, message)
+        key = _get_key(user_id, issuer_user_id)
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def invalidate(self, user_ids: list, issuer_user_id: str) -> None:
+        """Drops the cached lookups of the users banned or unbanned by the issuer."""
+        with self._lock:
+            for user_id in user_ids:
+                self._entries.pop(_get_key(user_id, issuer_user_id), None)
+            self._counters["invalidations"] += len(user_ids)
+
+    def stats(self) -> dict:
+        """Returns the cache counters, for tuning its size and TTL."""
+        with self._lock:
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self._counters["hits"],
+                "misses": self._counters["misses"],
+                "invalidations": self._counters["invalidations"],
+            }
@@ -1,22 +1,86 @@
 """Repository for managing ban records."""
 
+import json
+import logging
+import time
+
 import redis
+import redis.asyncio
 
 from src.util import ServiceUnavailableError
 
+from .ban_cache import BanCache
+
 OLD_BANNED_MESSAGE = "banned"  # This is the old value stored in Redis for banned users.
 # We keep it for backward compatibility, but we can remove it
 # in the future when we are sure all old bans have expired.
 
 
-class BanRepository:
+BAN_KEY_PATTERN = "ban:*:by:*"
+BACKFILL_SCAN_COUNT = 500
+BAN_INVALIDATION_CHANNEL = "bans:invalidate"
+
+logger = logging.getLogger(__name__)
+
+
+def _get_key(user_id: str, banner_id: str) -> str:
+    """Generates a Redis key for the given user ID."""
+    return f"ban:{user_id}:by:{banner_id}"
+
+
+def _get_index_key(banner_id: str) -> str:
+    """Generates the Redis key of the ban index of the given issuer."""
+    return f"bans:by:{banner_id}"
+
+
+def _queue_ban_users(
+    pipeline, user_ids: list, issuer_user_id: str, duration_seconds: int, message: str
+) -> None:
+    """Queues the commands that ban and index the users on the pipeline."""
+    expiry = time.time() + duration_seconds
+    for user_id in user_ids:
+        pipeline.setex(_get_key(user_id, issuer_user_id), duration_seconds, message)
+    pipeline.zadd(
+        _get_index_key(issuer_user_id), {user_id: expiry for user_id in user_ids}
+    )
 
-    def __init__(self, redis_url: str):
-        self.redis_client = redis.Redis.from_url(redis_url)
 
-    def _get_key(self, user_id: str, banner_id: str) -> str:
-        """Generates a Redis key for the given user ID."""
-        return f"ban:{user_id}:by:{banner_id}"
+def _queue_unban_user(pipeline, user_id: str, issuer_user_id: str) -> None:
+    """Queues the commands that unban the user and drop them from the index."""
+    pipeline.delete(_get_key(user_id, issuer_user_id))
+    pipeline.zrem(_get_index_key(issuer_user_id), user_id)
+
+
+def _queue_get_banned_users(pipeline, issuer_user_id: str) -> None:
+    """Queues the commands that prune the expired bans from the index of the issuer
+    and list the others, soonest to be unbanned first."""
+    index_key = _get_index_key(issuer_user_id)
+    now = time.time()
+    pipeline.zremrangebyscore(index_key, "-inf", now)
+    pipeline.zrangebyscore(index_key, f"({now}", "+inf")
+
+
+def _to_ban_message(value: str | None) -> str:
+    if value == OLD_BANNED_MESSAGE or value is None:
+        return "For being absent for a previous session."
+    return value
+
+
+def _to_ban(ttl: int, value: str | None) -> tuple[int, str] | None:
+    # TTL is negative if the key does not exist
+    return (ttl, _to_ban_message(value)) if ttl > 0 else None
+
+
+class BanRepository:
+    """
+    Stores each ban as a key that expires with the ban. The bans of each issuer are also
+    indexed in a sorted set of user IDs scored by expiry time, so that listing them does
+    not scan the keyspace. Expired entries are pruned from the index when it is listed.
+    The Redis client must decode responses.
+    """
+
+    def __init__(self, redis_client: redis.Redis):
+        self.redis_client = redis_client
 
     def ban_users(
         self,
@@ -25,46 +89,231 @@ class BanRepository:
         duration_seconds: int,
         ban_message: str,
     ) -> None:
-        """Bans multiple users for a specified duration."""
-        for user_id in user_ids:
-            self.redis_client.setex(
-                self._get_key(user_id, issuer_user_id),
-                duration_seconds,
-                ban_message,
-            )
+        """Bans multiple users for a specified duration, in one round trip."""
+        if not user_ids:
+            return
+        pipeline = self.redis_client.pipeline()
+        _queue_ban_users(
+            pipeline, user_ids, issuer_user_id, duration_seconds, ban_message
+        )
+        pipeline.execute()
 
     def get_banned_users(self, issuer_user_id: str) -> list:
-        """Gets a list of all currently banned users by the issuer."""
-        pattern = self._get_key("*", issuer_user_id)
-        keys = self.redis_client.keys(pattern)
-        banned_users = [key.decode().split(":")[1] for key in keys]
-        return banned_users
+        """Gets a list of all currently banned users by the issuer, soonest to be
+        unbanned first."""
+        pipeline = self.redis_client.pipeline()
+        _queue_get_banned_users(pipeline, issuer_user_id)
+        _, members = pipeline.execute()
+        return members
 
     def unban_user(self, user_id: str, issuer_user_id: str) -> None:
         """Unbans a user."""
-        self.redis_client.delete(self._get_key(user_id, issuer_user_id))
+        pipeline = self.redis_client.pipeline()
+        _queue_unban_user(pipeline, user_id, issuer_user_id)
+        pipeline.execute()
 
-    def get_ban_duration(self, user_id: str, issuer_user_id: str) -> bool:
+    def backfill_ban_index(self) -> int:
+        """Adds the bans stored before the ban index existed to it. Iterates the ban
+        keys with SCAN, so Redis is not blocked. Returns the number of bans indexed."""
+        indexed = 0
+        for key in self.redis_client.scan_iter(
+            match=BAN_KEY_PATTERN, count=BACKFILL_SCAN_COUNT
+        ):
+            _, user_id, _, issuer_user_id = key.split(":", 3)
+            ttl = self.redis_client.ttl(key)
+            if ttl <= 0:
+                continue
+            self.redis_client.zadd(
+                _get_index_key(issuer_user_id), {user_id: time.time() + ttl}
+            )
+            indexed += 1
+        return indexed
+
+    def get_ban_duration(self, user_id: str, issuer_user_id: str) -> int:
         """Gets the ban duration for a user. Returns the remaining ban time in seconds
         or 0 if not banned."""
-        value = self.redis_client.ttl(self._get_key(user_id, issuer_user_id))
+        value = self.redis_client.ttl(_get_key(user_id, issuer_user_id))
         return max(0, value)
 
     def is_user_banned(self, username: str, issuer_user_id: str) -> bool:
         """Checks if a user is currently banned by the issuer."""
         try:
-            return (
-                self.redis_client.exists(self._get_key(username, issuer_user_id))
-                and self.get_ban_duration(username, issuer_user_id) > 0
-            )
+            # TTL is negative if the key does not exist
+            return self.get_ban_duration(username, issuer_user_id) > 0
         except redis.exceptions.ResponseError as e:
             raise ServiceUnavailableError(
                 issuer_user_id, self.__class__.__name__
             ) from e
 
+    def get_ban(self, user_id: str, issuer_user_id: str) -> tuple[int, str] | None:
+        """Gets the remaining ban time in seconds and the ban message of a user in one
+        round trip, or None if the user is not banned by the issuer."""
+        key = _get_key(user_id, issuer_user_id)
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.ttl(key)
+        pipeline.get(key)
+        try:
+            ttl, value = pipeline.execute()
+        except redis.exceptions.ResponseError as e:
+            raise ServiceUnavailableError(
+                issuer_user_id, self.__class__.__name__
+            ) from e
+        return _to_ban(ttl, value)
+
+    def are_users_banned(self, user_ids: list, issuer_user_id: str) -> list:
+        """Checks whether each of the users is currently banned by the issuer, in one
+        round trip. Returns a list of booleans in the order of `user_ids`."""
+        if not user_ids:
+            return []
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipeline.ttl(_get_key(user_id, issuer_user_id))
+        try:
+            ttls = pipeline.execute()
+        except redis.exceptions.ResponseError as e:
+            raise ServiceUnavailableError(
+                issuer_user_id, self.__class__.__name__
+            ) from e
+        # TTL is negative if the key does not exist
+        return [ttl > 0 for ttl in ttls]
+
     def get_ban_message(self, user_id: str, issuer_user_id: str) -> str:
         """Gets the ban message for a user."""
-        value = self.redis_client.get(self._get_key(user_id, issuer_user_id))
-        if value == OLD_BANNED_MESSAGE.encode() or value is None:
-            return "For being absent for a previous session."
-        return value.decode()
+        return _to_ban_message(self.redis_client.get(_get_key(user_id, issuer_user_id)))
+
+
+class AsyncBanRepository:
+    """
+    Asyncio twin of `BanRepository`, for the bot.
+
+    Ban lookups can be served from an in-process `BanCache`. Bans and unbans invalidate
+    it, and are published on a channel so that other workers invalidate theirs too.
+    """
+
+    def __init__(
+        self, redis_client: redis.asyncio.Redis, cache: BanCache | None = None
+    ):
+        self.redis_client = redis_client
+        self.cache = cache
+
+    async def _invalidate(self, user_ids: list, issuer_user_id: str) -> None:
+        """Invalidates the cached lookups of the users, and publishes their invalidation
+        to the other workers. Must be called once the bans are written, or a concurrent
+        lookup could cache the old result again."""
+        if self.cache is None:
+            return
+        self.cache.invalidate(user_ids, issuer_user_id)
+        await self.redis_client.publish(
+            BAN_INVALIDATION_CHANNEL,
+            json.dumps({"issuer": str(issuer_user_id), "users": user_ids}),
+        )
+
+    async def ban_users(
+        self,
+        user_ids: list,
+        issuer_user_id: str,
+        duration_seconds: int,
+        ban_message: str,
+    ) -> None:
+        """Bans multiple users for a specified duration, in one round trip."""
+        if not user_ids:
+            return
+        pipeline = self.redis_client.pipeline()
+        _queue_ban_users(
+            pipeline, user_ids, issuer_user_id, duration_seconds, ban_message
+        )
+        await pipeline.execute()
+        await self._invalidate(user_ids, issuer_user_id)
+
+    async def get_banned_users(self, issuer_user_id: str) -> list:
+        """Gets a list of all currently banned users by the issuer, soonest to be
+        unbanned first."""
+        pipeline = self.redis_client.pipeline()
+        _queue_get_banned_users(pipeline, issuer_user_id)
+        _, members = await pipeline.execute()
+        return members
+
+    async def unban_user(self, user_id: str, issuer_user_id: str) -> None:
+        """Unbans a user."""
+        pipeline = self.redis_client.pipeline()
+        _queue_unban_user(pipeline, user_id, issuer_user_id)
+        await pipeline.execute()
+        await self._invalidate([user_id], issuer_user_id)
+
+    async def get_ban_duration(self, user_id: str, issuer_user_id: str) -> int:
+        """Gets the ban duration for a user. Returns the remaining ban time in seconds
+        or 0 if not banned."""
+        value = await self.redis_client.ttl(_get_key(user_id, issuer_user_id))
+        return max(0, value)
+
+    async def is_user_banned(self, username: str, issuer_user_id: str) -> bool:
+        """Checks if a user is currently banned by the issuer."""
+        return await self.get_ban(username, issuer_user_id) is not None
+
+    async def get_ban(
+        self, user_id: str, issuer_user_id: str
+    ) -> tuple[int, str] | None:
+        """Gets the remaining ban time in seconds and the ban message of a user in one
+        round trip, or None if the user is not banned by the issuer."""
+        if self.cache is not None:
+            is_hit, ban = self.cache.get(user_id, issuer_user_id)
+            if is_hit:
+                return ban
+        key = _get_key(user_id, issuer_user_id)
+        pipeline = self.redis_client.pipeline(transaction=False)
+        pipeline.ttl(key)
+        pipeline.get(key)
+        try:
+            ttl, value = await pipeline.execute()
+        except redis.exceptions.ResponseError as e:
+            raise ServiceUnavailableError(
+                issuer_user_id, self.__class__.__name__
+            ) from e
+        ban = _to_ban(ttl, value)
+        if self.cache is not None:
+            self.cache.put(user_id, issuer_user_id, ban)
+        return ban
+
+    async def are_users_banned(self, user_ids: list, issuer_user_id: str) -> list:
+        """Checks whether each of the users is currently banned by the issuer, in one
+        round trip. Returns a list of booleans in the order of `user_ids`."""
+        if not user_ids:
+            return []
+        pipeline = self.redis_client.pipeline(transaction=False)
+        for user_id in user_ids:
+            pipeline.ttl(_get_key(user_id, issuer_user_id))
+        try:
+            ttls = await pipeline.execute()
+        except redis.exceptions.ResponseError as e:
+            raise ServiceUnavailableError(
+                issuer_user_id, self.__class__.__name__
+            ) from e
+        # TTL is negative if the key does not exist
+        return [ttl > 0 for ttl in ttls]
+
+    async def get_ban_message(self, user_id: str, issuer_user_id: str) -> str:
+        """Gets the ban message for a user."""
+        return _to_ban_message(
+            await self.redis_client.get(_get_key(user_id, issuer_user_id))
+        )
+
+    def _handle_invalidation(self, message: dict) -> None:
+        """Invalidates the cached lookups named in an invalidation published by a
+        worker."""
+        try:
+            invalidation = json.loads(message["data"])
+            self.cache.invalidate(invalidation["users"], invalidation["issuer"])
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed ban invalidation: %r", message["data"])
+
+    async def listen_for_invalidations(self) -> None:
+        """Applies the invalidations published by the other workers until cancelled.
+        Returns at once if there is no cache."""
+        if self.cache is None:
+            return
+        pubsub = self.redis_client.pubsub(ignore_subscribe_messages=True)
+        await pubsub.subscribe(**{BAN_INVALIDATION_CHANNEL: self._handle_invalidation})
+        try:
+            await pubsub.run()
+        finally:
+            await pubsub.aclose()
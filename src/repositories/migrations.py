@@ -0,0 +1,105 @@
+"""
+Creates the indexes declared by the repositories and applies schema migrations.
+"""
+
+import datetime
+import logging
+from typing import Callable, List, NamedTuple
+
+from pymongo.collection import Collection
+
+SCHEMA_VERSION_ID = "schema_version"
+
+
+class Migration(NamedTuple):
+    """A one-off change to the stored data, applied once in version order."""
+
+    version: int
+    description: str
+    apply: Callable[[], None]
+
+
+class MigrationRunner:
+    """
+    Brings the database up to date. Every run creates the indexes declared in the
+    `INDEXES` of each repository, which is a no-op for existing indexes, then applies
+    the migrations newer than the schema version recorded in `schema_collection`.
+    """
+
+    def __init__(
+        self,
+        schema_collection: Collection,
+        repositories: list,
+        migrations: List[Migration],
+    ):
+        self.logger = logging.getLogger(__name__)
+        self.schema_collection = schema_collection
+        self.repositories = repositories
+        self.migrations = sorted(migrations, key=lambda migration: migration.version)
+
+    def get_schema_version(self) -> int:
+        """Gets the version of the last applied migration, or 0 if there is none."""
+        schema_json = self.schema_collection.find_one({"_id": SCHEMA_VERSION_ID})
+        return 0 if schema_json is None else schema_json["version"]
+
+    def _set_schema_version(self, version: int):
+        self.schema_collection.update_one(
+            {"_id": SCHEMA_VERSION_ID},
+            {
+                "$set": {
+                    "version": version,
+                    "applied_at": datetime.datetime.now(datetime.timezone.utc),
+                }
+            },
+            upsert=True,
+        )
+
+    def ensure_indexes(self) -> List[str]:
+        """Creates the declared indexes. Returns the names of the indexes."""
+        index_names = []
+        for repository in self.repositories:
+            index_names += repository.collection.create_indexes(repository.INDEXES)
+        return index_names
+
+    def migrate(self) -> int:
+        """Applies the pending migrations. Returns the resulting schema version."""
+        version = self.get_schema_version()
+        for migration in self.migrations:
+            if migration.version <= version:
+                continue
+            self.logger.info(
+                "Applying migration %d: %s", migration.version, migration.description
+            )
+            migration.apply()
+            version = migration.version
+            self._set_schema_version(version)
+        return version
+
+    def run(self) -> int:
+        """Creates the indexes and applies the pending migrations."""
+        self.ensure_indexes()
+        return self.migrate()
+
+    def report(self) -> dict:
+        """
+        Reports, per collection, the declared indexes that are missing, the indexes that
+        are not declared by any repository, and the indexes with no recorded use since
+        the server started.
+        """
+        report = {}
+        for repository in self.repositories:
+            collection = repository.collection
+            declared = {index.document["name"] for index in repository.INDEXES}
+            existing = set(collection.index_information())
+            accesses = {
+                stats["name"]: stats["accesses"]["ops"]
+                for stats in collection.aggregate([{"$indexStats": {}}])
+            }
+            report[collection.name] = {
+                "missing": sorted(declared - existing),
+                "undeclared": sorted(existing - declared - {"_id_"}),
+                "unused": sorted(
+                    name for name in existing & declared if not accesses.get(name)
+                ),
+            }
+        return report
@@ -0,0 +1,46 @@
+"""
+Owner IDs are Telegram user IDs and are stored as ints, so that listing a user's poll
+groups and attendance lists is a single query on the `owner_id` index.
+"""
+
+from pymongo import UpdateOne
+from pymongo.collection import Collection
+
+OWNER_ID_BATCH_SIZE = 500
+
+
+def to_stored_owner_id(owner_id) -> int:
+    """Converts an owner ID to the type it is stored and queried as."""
+    return int(owner_id)
+
+
+def to_stored_document(document: dict) -> dict:
+    """Returns the document with its owner ID converted to the stored type."""
+    if document.get("owner_id") is None:
+        return document
+    return {**document, "owner_id": to_stored_owner_id(document["owner_id"])}
+
+
+def normalize_owner_ids(
+    collection: Collection, batch_size: int = OWNER_ID_BATCH_SIZE
+) -> int:
+    """Rewrites the owner IDs stored as strings in the collection as ints. Streams the
+    documents and writes in batches. Returns the number of documents rewritten."""
+    requests = []
+    modified = 0
+    cursor = collection.find(
+        {"owner_id": {"$type": "string"}}, {"owner_id": 1}, batch_size=batch_size
+    )
+    for document in cursor:
+        requests.append(
+            UpdateOne(
+                {"_id": document["_id"]},
+                {"$set": {"owner_id": to_stored_owner_id(document["owner_id"])}},
+            )
+        )
+        if len(requests) == batch_size:
+            modified += collection.bulk_write(requests, ordered=False).modified_count
+            requests = []
+    if requests:
+        modified += collection.bulk_write(requests, ordered=False).modified_count
+    return modified
@@ -0,0 +1,55 @@
+"""
+Keyset pagination over a user's documents, newest first.
+
+Pages are bounded by the `_id` of the first or last document on the current page
+rather than skipped over, so each page is one bounded query on the
+(`owner_id`, `_id`) index however far the user pages.
+"""
+
+from typing import Callable, List, Tuple
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from src.model import Page
+
+PAGE_SIZE = 8
+
+
+def build_page_query(
+    owner_id: int, cursor: str | None, is_next: bool
+) -> Tuple[dict, list]:
+    """Builds the filter and sort for the page after (older than) the cursor, or before
+    (newer than) it if `is_next` is False. Fetch one more than the page size."""
+    query = {"owner_id": owner_id}
+    if cursor is None:
+        return query, [("_id", DESCENDING)]
+    if is_next:
+        query["_id"] = {"$lt": ObjectId(cursor)}
+        return query, [("_id", DESCENDING)]
+    query["_id"] = {"$gt": ObjectId(cursor)}
+    return query, [("_id", ASCENDING)]
+
+
+def build_page(
+    documents: List[dict],
+    cursor: str | None,
+    is_next: bool,
+    page_size: int,
+    from_dict: Callable[[dict], object],
+) -> Page:
+    """Builds a page from the documents fetched with `build_page_query`."""
+    has_more = len(documents) > page_size
+    documents = documents[:page_size]
+    if not is_next:
+        documents.reverse()
+    if not documents:
+        return Page([])
+    first_id, last_id = str(documents[0]["_id"]), str(documents[-1]["_id"])
+    if is_next:
+        previous_cursor = first_id if cursor is not None else None
+        next_cursor = last_id if has_more else None
+    else:
+        previous_cursor = first_id if has_more else None
+        next_cursor = last_id
+    return Page(list(map(from_dict, documents)), previous_cursor, next_cursor)
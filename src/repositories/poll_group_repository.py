@@ -2,24 +2,146 @@
 Abstraction to store poll groups in the database.
 """
 
-from typing import List
+from typing import List, Tuple
 
 from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, DESCENDING, IndexModel
 from pymongo.collection import Collection
 
-from src.model import PollGroup
+from src.model import EventPoll, Page, PollGroup
 from src.util import PollGroupNotFoundError
 
+from .owner_ids import to_stored_document, to_stored_owner_id
+from .pagination import PAGE_SIZE, build_page, build_page_query
+from .poll_repository import order_event_polls
+
+# Field of the poll group document that holds a snapshot of the group's polls, so the
+# group and its results can be read as one document. Poll writes keep it up to date.
+RESULTS_FIELD = "results"
+# Counter bumped whenever the results snapshot changes, so renders of the group can be
+# cached by version
+RESULTS_VERSION_FIELD = "results_version"
+# Temporary field holding the poll IDs as ObjectIds while joining the polls
+POLL_OBJECT_IDS_FIELD = "poll_object_ids"
+
+# Poll groups are listed by their owner, newest first
+POLL_GROUP_INDEXES = [IndexModel([("owner_id", ASCENDING), ("_id", DESCENDING)])]
+
+
+def _build_poll_group_with_polls_pipeline(
+    group_id: str | None, polls_collection_name: str
+) -> List[dict]:
+    """Builds the aggregation that fetches a poll group, or all poll groups if
+    `group_id` is None, and joins their polls."""
+    pipeline = [] if group_id is None else [{"$match": {"_id": ObjectId(group_id)}}]
+    # Poll IDs are stored as strings, so they are converted for the lookup to match
+    # on the polls' `_id` index
+    pipeline += [
+        {
+            "$addFields": {
+                POLL_OBJECT_IDS_FIELD: {
+                    "$map": {"input": "$polls_ids", "in": {"$toObjectId": "$$this"}}
+                }
+            }
+        },
+        {
+            "$lookup": {
+                "from": polls_collection_name,
+                "localField": POLL_OBJECT_IDS_FIELD,
+                "foreignField": "_id",
+                "as": "polls",
+            }
+        },
+        {"$unset": POLL_OBJECT_IDS_FIELD},
+    ]
+    return pipeline
+
+
+def _build_rebuild_results_pipeline(
+    group_id: str | None, polls_collection_name: str, groups_collection_name: str
+) -> List[dict]:
+    """Builds the aggregation that regenerates the results snapshots from the polls."""
+    return _build_poll_group_with_polls_pipeline(group_id, polls_collection_name) + [
+        {"$project": {RESULTS_FIELD: "$polls"}},
+        {
+            "$merge": {
+                "into": groups_collection_name,
+                "on": "_id",
+                "whenMatched": [
+                    {
+                        "$set": {
+                            RESULTS_FIELD: f"$$new.{RESULTS_FIELD}",
+                            RESULTS_VERSION_FIELD: {
+                                "$add": [
+                                    {"$ifNull": [f"${RESULTS_VERSION_FIELD}", 0]},
+                                    1,
+                                ]
+                            },
+                        }
+                    }
+                ],
+                "whenNotMatched": "discard",
+            }
+        },
+    ]
+
+
+def _has_results_snapshot(poll_group_json: dict) -> bool:
+    """Checks whether the group document holds a snapshot of all of its polls."""
+    if RESULTS_FIELD not in poll_group_json:
+        return False
+    snapshot_ids = {str(json["_id"]) for json in poll_group_json[RESULTS_FIELD]}
+    return snapshot_ids.issuperset(poll_group_json["polls_ids"])
+
+
+def _is_results_snapshot_consistent(poll_group_json: dict) -> bool:
+    """Checks whether the group's results snapshot matches its joined polls."""
+    snapshot = poll_group_json.get(RESULTS_FIELD)
+    if snapshot is None:
+        return False
+    return {str(json["_id"]): json for json in snapshot} == {
+        str(json["_id"]): json for json in poll_group_json["polls"]
+    }
+
+
+def _poll_group_from_json(poll_group_json: dict) -> PollGroup:
+    poll_group = PollGroup.from_dict(poll_group_json)
+    poll_group.insert_id(str(poll_group_json["_id"]))
+    return poll_group
+
+
+def _parse_poll_group_with_polls(
+    group_id: str,
+    poll_group_json: dict,
+    event_polls_jsons: List[dict],
+    results_version: int | None = None,
+) -> Tuple[PollGroup, List[EventPoll]]:
+    """Builds the poll group and its polls, in group order. The results version is
+    only known when the polls were read from the results snapshot."""
+    poll_group = PollGroup.from_dict(poll_group_json)
+    poll_group.insert_id(group_id)
+    poll_group.results_version = results_version
+    polls = order_event_polls(poll_group.get_poll_ids(), event_polls_jsons)
+    return poll_group, polls
+
 
 class PollGroupRepository:
     """Repository for managing poll group storage."""
 
-    def __init__(self, collection: Collection):
+    INDEXES = POLL_GROUP_INDEXES
+
+    def __init__(self, collection: Collection, polls_collection_name: str = "polls"):
         self.collection = collection
+        self.polls_collection_name = polls_collection_name
 
     def insert_poll_group(self, poll_group: PollGroup) -> str:
         """Inserts a new poll group into the collection."""
-        return str(self.collection.insert_one(poll_group.to_dict()).inserted_id)
+        return str(
+            self.collection.insert_one(
+                to_stored_document(poll_group.to_dict())
+            ).inserted_id
+        )
 
     def get_poll_group(self, group_id):
         """Retrieves a poll group by its ID."""
@@ -30,16 +152,198 @@ class PollGroupRepository:
         poll_group.insert_id(group_id)
         return poll_group
 
+    def get_poll_group_with_polls(
+        self, group_id: str
+    ) -> Tuple[PollGroup, List[EventPoll]]:
+        """Retrieves a poll group and its polls, in group order. Reads the group's
+        results snapshot if it has one, else joins the polls in one aggregation."""
+        poll_group_json = self.collection.find_one({"_id": ObjectId(group_id)})
+        if poll_group_json is None:
+            raise PollGroupNotFoundError(group_id)
+        if not _has_results_snapshot(poll_group_json):
+            results = list(
+                self.collection.aggregate(
+                    _build_poll_group_with_polls_pipeline(
+                        group_id, self.polls_collection_name
+                    )
+                )
+            )
+            if not results:
+                raise PollGroupNotFoundError(group_id)
+            return _parse_poll_group_with_polls(
+                group_id, results[0], results[0]["polls"]
+            )
+        return _parse_poll_group_with_polls(
+            group_id,
+            poll_group_json,
+            poll_group_json[RESULTS_FIELD],
+            poll_group_json.get(RESULTS_VERSION_FIELD, 0),
+        )
+
+    def rebuild_results(self, group_id: str | None = None):
+        """Regenerates the results snapshot of a poll group, or of all poll groups if
+        `group_id` is None, from the polls collection."""
+        list(
+            self.collection.aggregate(
+                _build_rebuild_results_pipeline(
+                    group_id, self.polls_collection_name, self.collection.name
+                )
+            )
+        )
+
+    def find_inconsistent_results(self) -> List[str]:
+        """Gets the IDs of the poll groups whose results snapshot is missing or does
+        not match their polls."""
+        return [
+            str(poll_group_json["_id"])
+            for poll_group_json in self.collection.aggregate(
+                _build_poll_group_with_polls_pipeline(None, self.polls_collection_name)
+            )
+            if not _is_results_snapshot_consistent(poll_group_json)
+        ]
+
     def get_poll_groups_by_owner_id(self, owner_id) -> List[PollGroup]:
         """Retrieves all poll groups owned by a specific user."""
-        poll_group_jsons = list(self.collection.find({"owner_id": owner_id}))
+        poll_group_jsons = list(
+            self.collection.find({"owner_id": to_stored_owner_id(owner_id)})
+        )
         poll_groups = list(map(PollGroup.from_dict, poll_group_jsons))
         for i, group in enumerate(poll_groups):
             group.insert_id(str(poll_group_jsons[i]["_id"]))
         return poll_groups
 
+    def get_poll_groups_page_by_owner_id(
+        self,
+        owner_id,
+        cursor: str | None = None,
+        is_next: bool = True,
+        page_size: int = PAGE_SIZE,
+    ) -> Page:
+        """Retrieves a page of the poll groups owned by a specific user, newest first.
+        See `build_page_query` for the cursor."""
+        query, sort = build_page_query(to_stored_owner_id(owner_id), cursor, is_next)
+        poll_group_jsons = list(
+            self.collection.find(query, {RESULTS_FIELD: 0})
+            .sort(sort)
+            .limit(page_size + 1)
+        )
+        return build_page(
+            poll_group_jsons, cursor, is_next, page_size, _poll_group_from_json
+        )
+
     def delete_poll_group(self, group_id):
         """Deletes a poll group by its ID."""
         result = self.collection.delete_one({"_id": ObjectId(group_id)})
         if result.deleted_count == 0:
             raise PollGroupNotFoundError(group_id)
+
+
+class AsyncPollGroupRepository:
+    """Asyncio repository for managing poll group storage, backed by Motor."""
+
+    INDEXES = POLL_GROUP_INDEXES
+
+    def __init__(
+        self, collection: AsyncIOMotorCollection, polls_collection_name: str = "polls"
+    ):
+        self.collection = collection
+        self.polls_collection_name = polls_collection_name
+
+    async def insert_poll_group(self, poll_group: PollGroup) -> str:
+        """Inserts a new poll group into the collection."""
+        result = await self.collection.insert_one(
+            to_stored_document(poll_group.to_dict())
+        )
+        return str(result.inserted_id)
+
+    async def get_poll_group(self, group_id):
+        """Retrieves a poll group by its ID."""
+        poll_group_json = await self.collection.find_one({"_id": ObjectId(group_id)})
+        if poll_group_json is None:
+            raise PollGroupNotFoundError(group_id)
+        poll_group = PollGroup.from_dict(poll_group_json)
+        poll_group.insert_id(group_id)
+        return poll_group
+
+    async def get_poll_group_with_polls(
+        self, group_id: str
+    ) -> Tuple[PollGroup, List[EventPoll]]:
+        """Retrieves a poll group and its polls, in group order. Reads the group's
+        results snapshot if it has one, else joins the polls in one aggregation."""
+        poll_group_json = await self.collection.find_one({"_id": ObjectId(group_id)})
+        if poll_group_json is None:
+            raise PollGroupNotFoundError(group_id)
+        if not _has_results_snapshot(poll_group_json):
+            results = await self.collection.aggregate(
+                _build_poll_group_with_polls_pipeline(
+                    group_id, self.polls_collection_name
+                )
+            ).to_list(None)
+            if not results:
+                raise PollGroupNotFoundError(group_id)
+            return _parse_poll_group_with_polls(
+                group_id, results[0], results[0]["polls"]
+            )
+        return _parse_poll_group_with_polls(
+            group_id,
+            poll_group_json,
+            poll_group_json[RESULTS_FIELD],
+            poll_group_json.get(RESULTS_VERSION_FIELD, 0),
+        )
+
+    async def rebuild_results(self, group_id: str | None = None):
+        """Regenerates the results snapshot of a poll group, or of all poll groups if
+        `group_id` is None, from the polls collection."""
+        await self.collection.aggregate(
+            _build_rebuild_results_pipeline(
+                group_id, self.polls_collection_name, self.collection.name
+            )
+        ).to_list(None)
+
+    async def find_inconsistent_results(self) -> List[str]:
+        """Gets the IDs of the poll groups whose results snapshot is missing or does
+        not match their polls."""
+        poll_group_jsons = await self.collection.aggregate(
+            _build_poll_group_with_polls_pipeline(None, self.polls_collection_name)
+        ).to_list(None)
+        return [
+            str(poll_group_json["_id"])
+            for poll_group_json in poll_group_jsons
+            if not _is_results_snapshot_consistent(poll_group_json)
+        ]
+
+    async def get_poll_groups_by_owner_id(self, owner_id) -> List[PollGroup]:
+        """Retrieves all poll groups owned by a specific user."""
+        poll_group_jsons = await self.collection.find(
+            {"owner_id": to_stored_owner_id(owner_id)}
+        ).to_list(None)
+        poll_groups = list(map(PollGroup.from_dict, poll_group_jsons))
+        for i, group in enumerate(poll_groups):
+            group.insert_id(str(poll_group_jsons[i]["_id"]))
+        return poll_groups
+
+    async def get_poll_groups_page_by_owner_id(
+        self,
+        owner_id,
+        cursor: str | None = None,
+        is_next: bool = True,
+        page_size: int = PAGE_SIZE,
+    ) -> Page:
+        """Retrieves a page of the poll groups owned by a specific user, newest first.
+        See `build_page_query` for the cursor."""
+        query, sort = build_page_query(to_stored_owner_id(owner_id), cursor, is_next)
+        poll_group_jsons = (
+            await self.collection.find(query, {RESULTS_FIELD: 0})
+            .sort(sort)
+            .limit(page_size + 1)
+            .to_list(None)
+        )
+        return build_page(
+            poll_group_jsons, cursor, is_next, page_size, _poll_group_from_json
+        )
+
+    async def delete_poll_group(self, group_id):
+        """Deletes a poll group by its ID."""
+        result = await self.collection.delete_one({"_id": ObjectId(group_id)})
+        if result.deleted_count == 0:
+            raise PollGroupNotFoundError(group_id)
@@ -5,22 +5,134 @@ Abstraction to store polls in the database.
 from typing import List
 
 from bson import ObjectId
+from motor.motor_asyncio import AsyncIOMotorCollection
+from pymongo import ASCENDING, IndexModel, ReturnDocument, UpdateOne
 from pymongo.collection import Collection
 
 from src.model import EventPoll
 from src.util import Membership, PollNotFoundError
 
+# Polls are looked up by the poll group they belong to
+POLL_INDEXES = [IndexModel([("poll_group_id", ASCENDING)])]
+BACKFILL_BATCH_SIZE = 500
+
+
+def _build_set_person_update(
+    poll_id: str, username: str, field: str, is_sign_up: bool
+) -> tuple[dict, dict]:
+    """Builds the filter and update to sign a person up or drop them out of a poll.
+    The filter only matches if the update changes the poll."""
+    if is_sign_up:
+        return (
+            {"_id": ObjectId(poll_id), field: {"$ne": username}},
+            {"$addToSet": {field: username}},
+        )
+    return (
+        {"_id": ObjectId(poll_id), field: username},
+        {"$pull": {field: username}},
+    )
+
+
+def _build_set_result_update(event_poll_json: dict) -> tuple[dict, dict]:
+    """Builds the filter and update that copy a poll into its group's results snapshot
+    and bump its version."""
+    return (
+        {
+            "_id": event_poll_json["poll_group_id"],
+            "results._id": event_poll_json["_id"],
+        },
+        {"$set": {"results.$": event_poll_json}, "$inc": {"results_version": 1}},
+    )
+
+
+def order_event_polls(
+    poll_ids: List[str], event_polls_jsons: List[dict]
+) -> List[EventPoll]:
+    """Builds event polls from their documents in the order of `poll_ids`, since
+    MongoDB does not return `$in` and `$lookup` matches in any particular order."""
+    jsons_by_id = {str(json["_id"]): json for json in event_polls_jsons}
+    if any(poll_id not in jsons_by_id for poll_id in poll_ids):
+        raise PollNotFoundError(poll_ids)
+    event_polls = []
+    for poll_id in poll_ids:
+        event_poll = EventPoll.from_dict(jsons_by_id[poll_id])
+        event_poll.insert_id(poll_id)
+        event_polls.append(event_poll)
+    return event_polls
+
 
 class PollRepository:
-    """Repository for managing poll storage."""
+    """
+    Repository for managing poll storage.
+
+    If `groups_collection` is given, votes and active status changes also update the
+    results snapshot on the poll's group in the same transaction.
+    """
+
+    INDEXES = POLL_INDEXES
 
-    def __init__(self, collection: Collection):
+    def __init__(self, collection: Collection, groups_collection: Collection = None):
         self.collection = collection
+        self.groups_collection = groups_collection
+
+    def _update_poll_and_results(self, query: dict, update: dict, session=None):
+        event_poll_json = self.collection.find_one_and_update(
+            query, update, return_document=ReturnDocument.AFTER, session=session
+        )
+        if event_poll_json is not None and event_poll_json.get("poll_group_id"):
+            self.groups_collection.update_one(
+                *_build_set_result_update(event_poll_json), session=session
+            )
+        return event_poll_json
+
+    def _update_poll(self, query: dict, update: dict) -> dict | None:
+        """Updates a poll and returns the updated document, or None if nothing matched."""
+        if self.groups_collection is None:
+            return self.collection.find_one_and_update(
+                query, update, return_document=ReturnDocument.AFTER
+            )
+        with self.collection.database.client.start_session() as session:
+            return session.with_transaction(
+                lambda s: self._update_poll_and_results(query, update, s)
+            )
 
     def insert_event_poll(self, poll: EventPoll) -> str:
         """Inserts a new event poll into the collection."""
         return str(self.collection.insert_one(poll.to_dict()).inserted_id)
 
+    def backfill_formatted_times(self, batch_size: int = BACKFILL_BATCH_SIZE) -> int:
+        """Stores the displayed times of the polls created before they were stored.
+        Streams the polls and writes in batches. Polls whose times cannot be parsed are
+        skipped. Returns the number of polls updated."""
+        requests = []
+        modified = 0
+        cursor = self.collection.find(
+            {"formatted_times": {"$exists": False}},
+            {"start_time": 1, "end_time": 1},
+            batch_size=batch_size,
+        )
+        for document in cursor:
+            poll = EventPoll(document["start_time"], document["end_time"], None, None)
+            try:
+                formatted_times = list(poll.get_formatted_times())
+            except ValueError:
+                continue
+            requests.append(
+                UpdateOne(
+                    {"_id": document["_id"]},
+                    {"$set": {"formatted_times": formatted_times}},
+                )
+            )
+            if len(requests) == batch_size:
+                result = self.collection.bulk_write(requests, ordered=False)
+                modified += result.modified_count
+                requests = []
+        if requests:
+            modified += self.collection.bulk_write(
+                requests, ordered=False
+            ).modified_count
+        return modified
+
     def insert_event_polls_dicts(self, polls: List[dict]) -> List[str]:
         """Inserts multiple event polls into the collection."""
         return list(map(str, self.collection.insert_many(polls).inserted_ids))
@@ -43,12 +155,7 @@ class PollRepository:
         event_polls_jsons = list(
             self.collection.find({"_id": {"$in": list(map(ObjectId, poll_ids))}})
         )
-        if len(event_polls_jsons) != len(poll_ids):
-            raise PollNotFoundError(poll_ids)
-        event_polls = list(map(EventPoll.from_dict, event_polls_jsons))
-        for i, poll in enumerate(event_polls):
-            poll.insert_id(poll_ids[i])
-        return event_polls
+        return order_event_polls(poll_ids, event_polls_jsons)
 
     def add_person_to_poll(self, poll_id: str, username: str, field: str):
         """Adds a person to a specific field in an event poll."""
@@ -62,6 +169,20 @@ class PollRepository:
             {"_id": ObjectId(poll_id)}, {"$pull": {field: username}}
         )
 
+    def set_person_in_poll(
+        self, poll_id: str, username: str, field: str, is_sign_up: bool
+    ) -> tuple[EventPoll, bool]:
+        """Signs a person up for or drops them out of an event poll in one round trip.
+        Returns the updated poll and whether the person's status changed."""
+        query, update = _build_set_person_update(poll_id, username, field, is_sign_up)
+        event_poll_json = self._update_poll(query, update)
+        if event_poll_json is None:
+            # Either the status is unchanged or the poll does not exist
+            return self.get_event_poll(poll_id), False
+        event_poll = EventPoll.from_dict(event_poll_json)
+        event_poll.insert_id(poll_id)
+        return event_poll, True
+
     def update_poll_group_id(self, poll_ids: List[str], group_id: str):
         """Updates the poll group ID for multiple event polls."""
         return self.collection.update_many(
@@ -69,12 +190,20 @@ class PollRepository:
             {"$set": {"poll_group_id": ObjectId(group_id)}},
         )
 
-    def set_active_status(self, poll_id: str, membership: Membership, is_active: bool):
-        """Sets the active status for a specific membership in an event poll."""
-        return self.collection.update_one(
+    def set_active_status(
+        self, poll_id: str, membership: Membership, is_active: bool
+    ) -> EventPoll:
+        """Sets the active status for a specific membership in an event poll. Returns
+        the updated poll."""
+        event_poll_json = self._update_poll(
             {"_id": ObjectId(poll_id)},
             {"$set": {f"is_active.{membership.value}": is_active}},
         )
+        if event_poll_json is None:
+            raise PollNotFoundError(poll_id)
+        event_poll = EventPoll.from_dict(event_poll_json)
+        event_poll.insert_id(poll_id)
+        return event_poll
 
     def delete_poll(self, poll_id: str):
         """Deletes an event poll by its ID."""
@@ -85,3 +214,133 @@ class PollRepository:
         return self.collection.delete_many(
             {"_id": {"$in": list(map(ObjectId, poll_ids))}}
         )
+
+
+class AsyncPollRepository:
+    """
+    Asyncio repository for managing poll storage, backed by Motor.
+
+    If `groups_collection` is given, votes and active status changes also update the
+    results snapshot on the poll's group in the same transaction.
+    """
+
+    INDEXES = POLL_INDEXES
+
+    def __init__(
+        self,
+        collection: AsyncIOMotorCollection,
+        groups_collection: AsyncIOMotorCollection = None,
+    ):
+        self.collection = collection
+        self.groups_collection = groups_collection
+
+    async def _update_poll_and_results(self, query: dict, update: dict, session=None):
+        event_poll_json = await self.collection.find_one_and_update(
+            query, update, return_document=ReturnDocument.AFTER, session=session
+        )
+        if event_poll_json is not None and event_poll_json.get("poll_group_id"):
+            await self.groups_collection.update_one(
+                *_build_set_result_update(event_poll_json), session=session
+            )
+        return event_poll_json
+
+    async def _update_poll(self, query: dict, update: dict) -> dict | None:
+        """Updates a poll and returns the updated document, or None if nothing matched."""
+        if self.groups_collection is None:
+            return await self.collection.find_one_and_update(
+                query, update, return_document=ReturnDocument.AFTER
+            )
+        async with await self.collection.database.client.start_session() as session:
+            return await session.with_transaction(
+                lambda s: self._update_poll_and_results(query, update, s)
+            )
+
+    async def insert_event_poll(self, poll: EventPoll) -> str:
+        """Inserts a new event poll into the collection."""
+        result = await self.collection.insert_one(poll.to_dict())
+        return str(result.inserted_id)
+
+    async def insert_event_polls_dicts(self, polls: List[dict]) -> List[str]:
+        """Inserts multiple event polls into the collection."""
+        result = await self.collection.insert_many(polls)
+        return list(map(str, result.inserted_ids))
+
+    async def insert_event_polls(self, polls: List[EventPoll]) -> List[str]:
+        """Inserts multiple event polls into the collection."""
+        return await self.insert_event_polls_dicts(
+            list(map(lambda x: x.to_dict(), polls))
+        )
+
+    async def get_event_poll(self, poll_id: str) -> EventPoll:
+        """Retrieves an event poll by its ID."""
+        event_poll_json = await self.collection.find_one({"_id": ObjectId(poll_id)})
+        if event_poll_json is None:
+            raise PollNotFoundError(poll_id)
+        event_poll = EventPoll.from_dict(event_poll_json)
+        event_poll.insert_id(poll_id)
+        return event_poll
+
+    async def get_event_polls(self, poll_ids: List[str]) -> List[EventPoll]:
+        """Retrieves multiple event polls by their IDs."""
+        event_polls_jsons = await self.collection.find(
+            {"_id": {"$in": list(map(ObjectId, poll_ids))}}
+        ).to_list(None)
+        return order_event_polls(poll_ids, event_polls_jsons)
+
+    async def add_person_to_poll(self, poll_id: str, username: str, field: str):
+        """Adds a person to a specific field in an event poll."""
+        await self.collection.update_one(
+            {"_id": ObjectId(poll_id)}, {"$addToSet": {field: username}}
+        )
+
+    async def remove_person_from_poll(self, poll_id: str, username: str, field: str):
+        """Removes a person from a specific field in an event poll."""
+        await self.collection.update_one(
+            {"_id": ObjectId(poll_id)}, {"$pull": {field: username}}
+        )
+
+    async def set_person_in_poll(
+        self, poll_id: str, username: str, field: str, is_sign_up: bool
+    ) -> tuple[EventPoll, bool]:
+        """Signs a person up for or drops them out of an event poll in one round trip.
+        Returns the updated poll and whether the person's status changed."""
+        query, update = _build_set_person_update(poll_id, username, field, is_sign_up)
+        event_poll_json = await self._update_poll(query, update)
+        if event_poll_json is None:
+            # Either the status is unchanged or the poll does not exist
+            return await self.get_event_poll(poll_id), False
+        event_poll = EventPoll.from_dict(event_poll_json)
+        event_poll.insert_id(poll_id)
+        return event_poll, True
+
+    async def update_poll_group_id(self, poll_ids: List[str], group_id: str):
+        """Updates the poll group ID for multiple event polls."""
+        return await self.collection.update_many(
+            {"_id": {"$in": list(map(ObjectId, poll_ids))}},
+            {"$set": {"poll_group_id": ObjectId(group_id)}},
+        )
+
+    async def set_active_status(
+        self, poll_id: str, membership: Membership, is_active: bool
+    ) -> EventPoll:
+        """Sets the active status for a specific membership in an event poll. Returns
+        the updated poll."""
+        event_poll_json = await self._update_poll(
+            {"_id": ObjectId(poll_id)},
+            {"$set": {f"is_active.{membership.value}": is_active}},
+        )
+        if event_poll_json is None:
+            raise PollNotFoundError(poll_id)
+        event_poll = EventPoll.from_dict(event_poll_json)
+        event_poll.insert_id(poll_id)
+        return event_poll
+
+    async def delete_poll(self, poll_id: str):
+        """Deletes an event poll by its ID."""
+        return await self.collection.delete_one({"_id": ObjectId(poll_id)})
+
+    async def delete_event_polls(self, poll_ids: List[str]):
+        """Deletes multiple event polls by their IDs."""
+        return await self.collection.delete_many(
+            {"_id": {"$in": list(map(ObjectId, poll_ids))}}
+        )
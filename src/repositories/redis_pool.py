@@ -0,0 +1,49 @@
+"""Shared pool of asyncio Redis connections."""
+
+from redis.asyncio import BlockingConnectionPool
+
+DEFAULT_REDIS_MAX_CONNECTIONS = 64
+REDIS_POOL_TIMEOUT_SECONDS = 5
+
+
+class RedisConnectionPool(BlockingConnectionPool):
+    """
+    Pool of asyncio Redis connections shared by every component of the bot.
+
+    Holds at most `max_connections` connections. When all of them are in use, callers
+    wait up to `timeout` seconds for one to be released, and each wait is counted so that
+    the pool can be sized from its stats. Like Motor, its connections are bound to the
+    event loop they are first used on.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.waits = 0
+
+    async def get_connection(self, *args, **kwargs):
+        """Gets a connection from the pool, counting a wait if none is available."""
+        if not self.can_get_connection():
+            self.waits += 1
+        return await super().get_connection(*args, **kwargs)
+
+    def stats(self) -> dict:
+        """Returns the pool counters, for sizing it."""
+        return {
+            "max_connections": self.max_connections,
+            "in_use": len(self._in_use_connections),
+            "idle": len(self._available_connections),
+            "waits": self.waits,
+        }
+
+
+def create_redis_pool(
+    redis_url: str, max_connections: int = DEFAULT_REDIS_MAX_CONNECTIONS
+) -> RedisConnectionPool:
+    """Creates the pool of connections to the Redis server at the URL. Responses are
+    decoded to strings."""
+    return RedisConnectionPool.from_url(
+        redis_url,
+        max_connections=max_connections,
+        timeout=REDIS_POOL_TIMEOUT_SECONDS,
+        decode_responses=True,
+    )
@@ -4,6 +4,14 @@ Package for service layer modules.
 
 from .attendance_service import AttendanceService
 from .ban_service import BanService
+from .debounce_scheduler import (
+    LOCAL_DEBOUNCE_SCHEDULER,
+    QSTASH_DEBOUNCE_SCHEDULER,
+    DebounceScheduler,
+    LocalDebounceScheduler,
+    QStashDebounceScheduler,
+)
 from .poll_group_service import PollGroupService
+from .poll_render_cache import DEFAULT_RENDER_CACHE_SIZE, PollRenderCache
 from .poll_service import PollService
 from .telegram_message_updater import TelegramMessageUpdater
@@ -5,8 +5,8 @@ from typing import List
 
 from telegram import User
 
-from src.model import AttendanceList
-from src.repositories import AttendanceRepository
+from src.model import AttendanceList, Page
+from src.repositories import AsyncAttendanceRepository
 from src.util import AttendanceListNotFoundError
 
 from .ban_service import BanService
@@ -20,7 +20,7 @@ class AttendanceService:
 
     def __init__(
         self,
-        attendance_repository: AttendanceRepository,
+        attendance_repository: AsyncAttendanceRepository,
         poll_service: PollService,
         ban_service: BanService,
     ):
@@ -29,22 +29,40 @@ class AttendanceService:
         self.poll_service = poll_service
         self.ban_service = ban_service
 
-    def get_attendance_lists_by_owner_id(self, owner_id: str) -> List[AttendanceList]:
+    async def get_attendance_lists_by_owner_id(
+        self, owner_id: str
+    ) -> List[AttendanceList]:
         """Retrieve all attendance lists owned by a specific user."""
         self.logger.info(
             "User %s requested for the list of attendance lists.", owner_id
         )
-        return self.attendance_repository.get_attendance_lists_by_owner_id(owner_id)
+        return await self.attendance_repository.get_attendance_lists_by_owner_id(
+            owner_id
+        )
+
+    async def get_attendance_list_summaries(
+        self, owner_id: str, cursor: str | None = None, is_next: bool = True
+    ) -> Page:
+        """Retrieve a page of the IDs and titles of the attendance lists owned by a
+        user, newest first."""
+        self.logger.info(
+            "User %s requested for the titles of their attendance lists.", owner_id
+        )
+        return (
+            await self.attendance_repository.get_attendance_list_summaries_by_owner_id(
+                owner_id, cursor, is_next
+            )
+        )
 
-    def create_attendance_list_from_poll(
+    async def create_attendance_list_from_poll(
         self, poll_id: str, user: User
     ) -> AttendanceList:
         """Create a new attendance list based on a poll ID."""
         self.logger.info("Creating attendance list from poll ID: %s", poll_id)
-        poll = self.poll_service.get_event_poll(poll_id)
+        poll = await self.poll_service.get_event_poll(poll_id)
 
         attendance_list = AttendanceList.from_poll(poll, str(user.id))
-        attendance_list, removed = self.ban_service.remove_banned_people(
+        attendance_list, removed = await self.ban_service.remove_banned_people(
             attendance_list, str(user.id)
         )
         self.logger.info(
@@ -53,18 +71,18 @@ class AttendanceService:
             user.id,
             len(removed),
         )
-        attendance_list = self.attendance_repository.insert_attendance_list(
+        attendance_list = await self.attendance_repository.insert_attendance_list(
             attendance_list
         )
         return attendance_list
 
-    def create_attendance_list(
+    async def create_attendance_list(
         self, attendance_list: AttendanceList, owner_id: str
     ) -> AttendanceList:
         """Create a new attendance list."""
 
         attendance_list.owner_id = owner_id
-        attendance_list = self.attendance_repository.insert_attendance_list(
+        attendance_list = await self.attendance_repository.insert_attendance_list(
             attendance_list
         )
         self.logger.info(
@@ -74,31 +92,37 @@ class AttendanceService:
         )
         return attendance_list
 
-    def get_attendance_list(self, attendance_list_id: str) -> AttendanceList | None:
+    async def get_attendance_list(
+        self, attendance_list_id: str
+    ) -> AttendanceList | None:
         """Retrieve an attendance list by its ID."""
         self.logger.info("Retrieving attendance list ID: %s", attendance_list_id)
         try:
-            return self.attendance_repository.get_attendance_list(attendance_list_id)
+            return await self.attendance_repository.get_attendance_list(
+                attendance_list_id
+            )
         except AttendanceListNotFoundError as e:
             self.logger.error("Error retrieving attendance list: %s", e)
             return None
 
-    def delete_attendance_list(self, attendance_list_id: str) -> bool:
+    async def delete_attendance_list(self, attendance_list_id: str) -> bool:
         """Delete an attendance list by its ID."""
         self.logger.info("Deleting attendance list ID: %s", attendance_list_id)
-        result = self.attendance_repository.delete_attendance_list(attendance_list_id)
+        result = await self.attendance_repository.delete_attendance_list(
+            attendance_list_id
+        )
         return result.deleted_count > 0
 
-    def process_edited_list(
+    async def process_edited_list(
         self, old_list: AttendanceList, new_list: AttendanceList
     ) -> AttendanceList:
         """Process and save an edited attendance list."""
         self.logger.info("Processing edited attendance list ID: %s", old_list.id)
         new_list.update_administrative_details(old_list)
-        self.attendance_repository.put_attendance_list(new_list.id, new_list)
+        await self.attendance_repository.put_attendance_list(new_list.id, new_list)
         return new_list
 
-    def update_user_status(
+    async def update_user_status(
         self, attendance_list_id: str, user_id: str, status: int
     ) -> AttendanceList | None:
         """Update a user's attendance status in an attendance list."""
@@ -109,14 +133,14 @@ class AttendanceService:
             status,
         )
         try:
-            attendance_list = self.attendance_repository.get_attendance_list(
+            attendance_list = await self.attendance_repository.get_attendance_list(
                 attendance_list_id
             )
             selected_user = attendance_list.find_user_by_id(user_id)
             if selected_user.status == status:
                 return attendance_list
             attendance_list.update_user_status(user_id, status)
-            self.attendance_repository.patch_user_status_in_attendance_list(
+            await self.attendance_repository.patch_user_status_in_attendance_list(
                 attendance_list, user_id, status
             )
             return attendance_list
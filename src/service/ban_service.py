@@ -1,7 +1,7 @@
 """Service for handling bans related operations."""
 
 from model import AttendanceList
-from src.repositories import BanRepository
+from src.repositories import AsyncBanRepository
 
 DEFAULT_BAN_DURATION_SECONDS = 28 * 24 * 60 * 60  # 28 days
 
@@ -9,52 +9,60 @@ DEFAULT_BAN_DURATION_SECONDS = 28 * 24 * 60 * 60  # 28 days
 class BanService:
     """Service for handling bans related operations."""
 
-    def __init__(self, repository: BanRepository):
+    def __init__(self, repository: AsyncBanRepository):
         self.repository = repository
 
-    def log_bans(self, attendance_list: AttendanceList, issuer_user_id: str) -> None:
+    async def log_bans(
+        self, attendance_list: AttendanceList, issuer_user_id: str
+    ) -> None:
         """Logs bans for the given attendance list."""
         usernames_to_ban = attendance_list.get_penalisable_names()
         ban_message = "Absent from session with details: \n" + "\n".join(
             attendance_list.details
         )
         print(f"Banning users: {usernames_to_ban} with issuer ID: {issuer_user_id}")
-        self.repository.ban_users(
+        await self.repository.ban_users(
             usernames_to_ban, issuer_user_id, DEFAULT_BAN_DURATION_SECONDS, ban_message
         )
 
-    def get_banned_users(self, issuer_user_id: str) -> list:
+    async def get_banned_users(self, issuer_user_id: str) -> list:
         """Gets all banned users for the issuer."""
-        return self.repository.get_banned_users(issuer_user_id)
+        return await self.repository.get_banned_users(issuer_user_id)
 
-    def ban_user(
+    async def ban_user(
         self, user_id: str, issuer_user_id: str, duration_seconds: int, ban_message: str
     ) -> None:
         """Bans a user for a specified duration."""
-        self.repository.ban_users(
+        await self.repository.ban_users(
             [user_id], issuer_user_id, duration_seconds, ban_message
         )
 
-    def get_ban_duration(self, user_id: str, issuer_user_id: str) -> bool:
+    async def get_ban_duration(self, user_id: str, issuer_user_id: str) -> int:
         """Gets the ban duration for a user. Returns the remaining ban time in seconds
         or 0 if not banned."""
-        return self.repository.get_ban_duration(user_id, issuer_user_id)
+        return await self.repository.get_ban_duration(user_id, issuer_user_id)
 
-    def is_user_banned(self, user_id: str, issuer_user_id: str) -> bool:
+    async def is_user_banned(self, user_id: str, issuer_user_id: str) -> bool:
         """Checks if a user is currently banned by the issuer."""
-        return self.repository.is_user_banned(user_id, issuer_user_id)
+        return await self.repository.is_user_banned(user_id, issuer_user_id)
+
+    async def get_ban(
+        self, user_id: str, issuer_user_id: str
+    ) -> tuple[int, str] | None:
+        """Gets the remaining ban time in seconds and the ban message of a user, or None
+        if the user is not banned by the issuer."""
+        return await self.repository.get_ban(user_id, issuer_user_id)
 
-    def remove_banned_people(
+    async def remove_banned_people(
         self, attendance_list: AttendanceList, user_id: str
     ) -> tuple[AttendanceList, list]:
         """Removes banned people from the attendance list."""
         all_names = attendance_list.get_all_player_names()
-        banned_names = [
-            name for name in all_names if self.is_user_banned(name, user_id)
-        ]
+        is_banned = await self.repository.are_users_banned(all_names, user_id)
+        banned_names = [name for name, banned in zip(all_names, is_banned) if banned]
         attendance_list.remove_banned_people(banned_names)
         return attendance_list, banned_names
 
-    def unban_user(self, user_id: str, issuer_user_id: str) -> None:
+    async def unban_user(self, user_id: str, issuer_user_id: str) -> None:
         """Unbans a user."""
-        self.repository.unban_user(user_id, issuer_user_id)
+        await self.repository.unban_user(user_id, issuer_user_id)
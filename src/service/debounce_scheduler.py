@@ -0,0 +1,145 @@
+"""Schedulers for the trailing renders of debounced message updates."""
+
+import asyncio
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from collections import Counter, defaultdict
+from typing import Awaitable, Callable
+
+from qstash import QStash
+
+QSTASH_DEBOUNCE_SCHEDULER = "qstash"
+LOCAL_DEBOUNCE_SCHEDULER = "local"
+DEFAULT_TICK_MS = 100
+DEFAULT_MAX_CONCURRENT_RUNS = 32
+
+logger = logging.getLogger(__name__)
+
+
+class DebounceScheduler(ABC):
+    """Runs the trailing render of a debounce key after a delay."""
+
+    @abstractmethod
+    async def schedule(self, debounce_key: str, payload: dict, delay_ms: int) -> bool:
+        """Schedules the trailing render of the debounce key. Returns False if it could
+        not be scheduled."""
+
+    def stats(self) -> dict:
+        """Returns the scheduler counters."""
+        return {}
+
+
+class QStashDebounceScheduler(DebounceScheduler):
+    """Schedules trailing renders as delayed QStash messages to the debounce worker,
+    which verifies their signature. QStash delays are in whole seconds. The QStash
+    client is blocking, so messages are published from a worker thread."""
+
+    def __init__(self, qstash_client: QStash, url: str):
+        self.qstash_client = qstash_client
+        self.url = url
+
+    async def schedule(self, debounce_key: str, payload: dict, delay_ms: int) -> bool:
+        try:
+            await asyncio.to_thread(
+                self.qstash_client.message.publish_json,
+                url=self.url,
+                body={
+                    "debounce_key": debounce_key,
+                    **payload,
+                },
+                delay=max(1, math.ceil(delay_ms / 1000)),
+            )
+        except Exception as e:
+            logger.error("Failed to enqueue QStash job: %s", e)
+            return False
+        return True
+
+
+class LocalDebounceScheduler(DebounceScheduler):
+    """
+    Runs trailing renders in process on a timer wheel, without an HTTP hop.
+
+    Pending keys are bucketed by the tick they are due on, so that thousands of them
+    share one timer instead of holding a task each. Scheduling a pending key again moves
+    it to its new tick. Due keys are run with `handler`, with at most
+    `max_concurrent_runs` in flight. `run` must be running on the event loop of the
+    handler's clients, e.g. as a lifecycle background task. Pending keys are lost when
+    the process exits, and their debounce windows are reopened once they expire.
+    """
+
+    def __init__(
+        self,
+        handler: Callable[[str], Awaitable],
+        tick_ms: int = DEFAULT_TICK_MS,
+        max_concurrent_runs: int = DEFAULT_MAX_CONCURRENT_RUNS,
+    ):
+        self.handler = handler
+        self.tick_ms = tick_ms
+        self.max_concurrent_runs = max_concurrent_runs
+        self._slots: defaultdict[int, set] = defaultdict(set)
+        self._due_ticks: dict[str, int] = {}
+        self._running: set[asyncio.Task] = set()
+        self._wakeup: asyncio.Event | None = None
+        self._semaphore: asyncio.Semaphore | None = None
+        self._counters = Counter()
+
+    def _current_tick(self) -> int:
+        return int(time.monotonic() * 1000) // self.tick_ms
+
+    async def schedule(self, debounce_key: str, payload: dict, delay_ms: int) -> bool:
+        due_tick = self._current_tick() + max(1, math.ceil(delay_ms / self.tick_ms))
+        previous_tick = self._due_ticks.get(debounce_key)
+        if previous_tick is not None:
+            self._slots[previous_tick].discard(debounce_key)
+            self._counters["rescheduled"] += 1
+        self._due_ticks[debounce_key] = due_tick
+        self._slots[due_tick].add(debounce_key)
+        self._counters["scheduled"] += 1
+        if self._wakeup is not None:
+            self._wakeup.set()
+        return True
+
+    def _fire_due_keys(self) -> None:
+        now = self._current_tick()
+        for tick in sorted(tick for tick in self._slots if tick <= now):
+            for debounce_key in self._slots.pop(tick):
+                del self._due_ticks[debounce_key]
+                task = asyncio.create_task(self._run(debounce_key))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run(self, debounce_key: str) -> None:
+        async with self._semaphore:
+            try:
+                await self.handler(debounce_key)
+                self._counters["fired"] += 1
+            except Exception as e:
+                self._counters["failed"] += 1
+                logger.error("Debounced update of %s failed.", debounce_key, exc_info=e)
+
+    async def run(self) -> None:
+        """Runs the due keys every tick until cancelled. Sleeps while none is pending."""
+        self._wakeup = asyncio.Event()
+        self._semaphore = asyncio.Semaphore(self.max_concurrent_runs)
+        try:
+            while True:
+                if not self._due_ticks:
+                    self._wakeup.clear()
+                    await self._wakeup.wait()
+                await asyncio.sleep(self.tick_ms / 1000)
+                self._fire_due_keys()
+        finally:
+            for task in list(self._running):
+                task.cancel()
+
+    def stats(self) -> dict:
+        return {
+            "pending": len(self._due_ticks),
+            "running": len(self._running),
+            "scheduled": self._counters["scheduled"],
+            "rescheduled": self._counters["rescheduled"],
+            "fired": self._counters["fired"],
+            "failed": self._counters["failed"],
+        }
@@ -5,8 +5,8 @@ from typing import List, Tuple
 
 from telegram import User
 
-from src.model import EventPoll, PollGroup
-from src.repositories import PollGroupRepository
+from src.model import EventPoll, Page, PollGroup
+from src.repositories import AsyncPollGroupRepository
 from src.util import PollGroupNotFoundError
 
 from .poll_service import PollService
@@ -18,21 +18,29 @@ class PollGroupService:
     """
 
     def __init__(
-        self, poll_group_repository: PollGroupRepository, poll_service: PollService
+        self,
+        poll_group_repository: AsyncPollGroupRepository,
+        poll_service: PollService,
     ):
         self._logger = logging.getLogger(__name__)
         self._poll_group_repository = poll_group_repository
         self._poll_service = poll_service
 
-    def get_poll_groups(self, user: User | None) -> list:
-        """Gets all poll groups owned by the user."""
+    async def get_poll_groups(
+        self, user: User | None, cursor: str | None = None, is_next: bool = True
+    ) -> Page:
+        """Gets a page of the poll groups owned by the user, newest first."""
         if user is None:
             self._logger.warning("Anonymous user tried to access poll groups.")
-            return []
+            return Page([])
         self._logger.info("User %s requested to view their polls.", user.first_name)
-        return self._poll_group_repository.get_poll_groups_by_owner_id(user.id)
+        return await self._poll_group_repository.get_poll_groups_page_by_owner_id(
+            user.id, cursor, is_next
+        )
 
-    def get_poll_group(self, group_id: str, user: User | None) -> PollGroup | None:
+    async def get_poll_group(
+        self, group_id: str, user: User | None
+    ) -> PollGroup | None:
         """Gets a poll group by its ID."""
         if user is None:
             self._logger.warning(
@@ -45,7 +53,7 @@ class PollGroupService:
             group_id,
         )
         try:
-            poll_group = self._poll_group_repository.get_poll_group(group_id)
+            poll_group = await self._poll_group_repository.get_poll_group(group_id)
             if poll_group.owner_id != user.id:
                 self._logger.warning(
                     "User %s tried to access poll group with ID %s they do not own.",
@@ -62,46 +70,43 @@ class PollGroupService:
             )
             return None
 
-    def create_poll_group(
+    async def create_poll_group(
         self, owner_id: int, name: str, polls_ids: List[str]
     ) -> PollGroup:
-        """Creates a new poll group and returns it."""
+        """Creates a new poll group for the polls and returns it."""
         self._logger.info(
             "Creating new poll group '%s' for user ID %d.", name, owner_id
         )
         poll_group = PollGroup(owner_id, name, polls_ids)
-        new_id = self._poll_group_repository.insert_poll_group(poll_group)
+        new_id = await self._poll_group_repository.insert_poll_group(poll_group)
         poll_group.insert_id(new_id)
+        await self._poll_service.update_poll_group_id(polls_ids, new_id)
+        await self._poll_group_repository.rebuild_results(new_id)
         return poll_group
 
-    def get_full_poll_group_details(
+    async def get_full_poll_group_details(
         self, group_id: str
     ) -> Tuple[PollGroup, List[EventPoll]]:
         """Gets full details of a poll group by its ID."""
-        poll_group = self._poll_group_repository.get_poll_group(group_id)
-        polls = self._poll_service.get_event_polls(poll_group.get_poll_ids())
-
-        return poll_group, polls
+        return await self._poll_group_repository.get_poll_group_with_polls(group_id)
 
-    def generate_next_poll_group(
+    async def generate_next_poll_group(
         self, poll_group_id: str, new_poll_name: str
     ) -> Tuple[PollGroup | None, List[EventPoll]]:
         """Generates the next week's poll group and polls."""
         self._logger.info(
             "Generating next poll group for poll group ID %s.", poll_group_id
         )
-        poll_group, polls = self.get_full_poll_group_details(poll_group_id)
+        poll_group, polls = await self.get_full_poll_group_details(poll_group_id)
         if poll_group is None:
             return None, []
-        new_polls = self._poll_service.save_next_polls(polls)
-        new_poll_ids = [poll.id for poll in new_polls]
-        new_group = PollGroup(poll_group.owner_id, new_poll_name, new_poll_ids)
-        group_id = self._poll_group_repository.insert_poll_group(new_group)
-        self._poll_service.update_poll_group_id(new_poll_ids, group_id)
-        new_group.insert_id(group_id)
+        new_polls = await self._poll_service.save_next_polls(polls)
+        new_group = await self.create_poll_group(
+            poll_group.owner_id, new_poll_name, [poll.id for poll in new_polls]
+        )
         return new_group, new_polls
 
-    def delete_poll_group(self, poll_group_id: str, user: User | None) -> bool:
+    async def delete_poll_group(self, poll_group_id: str, user: User | None) -> bool:
         """Deletes a poll group and its associated polls."""
         if user is None:
             self._logger.warning(
@@ -114,7 +119,7 @@ class PollGroupService:
             poll_group_id,
         )
         try:
-            poll_group = self._poll_group_repository.get_poll_group(poll_group_id)
+            poll_group = await self._poll_group_repository.get_poll_group(poll_group_id)
             if poll_group.owner_id != user.id:
                 self._logger.warning(
                     "User %s tried to delete poll group with ID %s they do not own.",
@@ -123,9 +128,9 @@ class PollGroupService:
                 )
                 return False
             # Delete associated polls
-            self._poll_service.delete_polls(poll_group.get_poll_ids())
+            await self._poll_service.delete_polls(poll_group.get_poll_ids())
             # Delete the poll group
-            self._poll_group_repository.delete_poll_group(poll_group_id)
+            await self._poll_group_repository.delete_poll_group(poll_group_id)
             return True
         except PollGroupNotFoundError:
             self._logger.warning(
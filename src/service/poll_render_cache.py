@@ -0,0 +1,132 @@
+"""Cache of the rendered messages of published poll groups."""
+
+import json
+import logging
+import threading
+from collections import Counter, OrderedDict
+from typing import Callable, List, Tuple
+
+from redis.asyncio import Redis
+from telegram import InlineKeyboardMarkup
+
+from src.model import EventPoll, PollGroup
+from src.util import Membership
+
+DEFAULT_RENDER_CACHE_SIZE = 1_000
+DEFAULT_RENDER_CACHE_REDIS_TTL_SECONDS = 60 * 60  # 1 hour
+
+
+class PollRenderCache:
+    """
+    LRU cache of the text and voting buttons of published poll groups, keyed by
+    (poll group, membership, results version) and holding at most `max_size` entries.
+    Misses are rendered with `render`.
+
+    The results version of a poll group is bumped with every vote and active status
+    change, so a cached render is never stale and entries are never invalidated, only
+    evicted. If `redis_client` is given, renders are also shared with the other workers
+    through Redis for `redis_ttl_seconds`. Poll groups read without a results version
+    are rendered every time.
+    """
+
+    def __init__(
+        self,
+        render: Callable[
+            [PollGroup, List[EventPoll], Membership], Tuple[str, InlineKeyboardMarkup]
+        ],
+        max_size: int = DEFAULT_RENDER_CACHE_SIZE,
+        redis_client: Redis | None = None,
+        redis_ttl_seconds: int = DEFAULT_RENDER_CACHE_REDIS_TTL_SECONDS,
+    ):
+        self.render = render
+        self.max_size = max_size
+        self.redis_client = redis_client
+        self.redis_ttl_seconds = redis_ttl_seconds
+        self.logger = logging.getLogger(__name__)
+        self._entries: OrderedDict[tuple, Tuple[str, InlineKeyboardMarkup]] = (
+            OrderedDict()
+        )
+        self._lock = threading.Lock()
+        self._counters = Counter()
+
+    @staticmethod
+    def key_name(key: tuple) -> str:
+        """Gets the key name of a render for Redis storage."""
+        poll_group_id, membership, version = key
+        return f"render:{poll_group_id}:{membership}:{version}"
+
+    def _get_local(self, key: tuple) -> Tuple[str, InlineKeyboardMarkup] | None:
+        with self._lock:
+            message = self._entries.get(key)
+            if message is not None:
+                self._entries.move_to_end(key)
+            return message
+
+    def _put_local(self, key: tuple, message: Tuple[str, InlineKeyboardMarkup]):
+        with self._lock:
+            self._entries[key] = message
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    async def _get_shared(self, key: tuple) -> Tuple[str, InlineKeyboardMarkup] | None:
+        if self.redis_client is None:
+            return None
+        try:
+            serialized = await self.redis_client.get(self.key_name(key))
+        except Exception as e:
+            self.logger.warning("Failed to read cached render: %s", e)
+            return None
+        if serialized is None:
+            return None
+        text, markup = json.loads(serialized)
+        return text, InlineKeyboardMarkup.de_json(markup, None)
+
+    async def _put_shared(self, key: tuple, message: Tuple[str, InlineKeyboardMarkup]):
+        if self.redis_client is None:
+            return
+        text, reply_markup = message
+        try:
+            await self.redis_client.set(
+                self.key_name(key),
+                json.dumps([text, reply_markup.to_dict()]),
+                ex=self.redis_ttl_seconds,
+            )
+        except Exception as e:
+            self.logger.warning("Failed to cache render: %s", e)
+
+    async def get_message(
+        self, poll_group: PollGroup, polls: List[EventPoll], membership: Membership
+    ) -> Tuple[str, InlineKeyboardMarkup]:
+        """Gets the text and voting buttons of the poll group, rendering them if they
+        are not cached for its results version."""
+        if poll_group.results_version is None:
+            self._counters["uncacheable"] += 1
+            return self.render(poll_group, polls, membership)
+        key = (str(poll_group.id), membership.value, poll_group.results_version)
+        message = self._get_local(key)
+        if message is not None:
+            self._counters["hits"] += 1
+            return message
+        message = await self._get_shared(key)
+        if message is not None:
+            self._counters["shared_hits"] += 1
+        else:
+            self._counters["misses"] += 1
+            message = self.render(poll_group, polls, membership)
+            await self._put_shared(key, message)
+        self._put_local(key, message)
+        return message
+
+    def stats(self) -> dict:
+        """Returns the cache counters, for sizing it."""
+        with self._lock:
+            size = len(self._entries)
+        return {
+            "size": size,
+            "max_size": self.max_size,
+            "hits": self._counters["hits"],
+            "shared_hits": self._counters["shared_hits"],
+            "misses": self._counters["misses"],
+            "uncacheable": self._counters["uncacheable"],
+        }
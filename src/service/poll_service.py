@@ -4,7 +4,7 @@ import logging
 from typing import List
 
 from src.model import EventPoll
-from src.repositories import PollRepository
+from src.repositories import AsyncPollRepository
 from src.util import Membership, ServiceUnavailableError, UserBannedError
 
 from .ban_service import BanService
@@ -15,12 +15,12 @@ class PollService:
     Service class for handling poll-related operations.
     """
 
-    def __init__(self, poll_repository: PollRepository, ban_service: BanService):
+    def __init__(self, poll_repository: AsyncPollRepository, ban_service: BanService):
         self.logger = logging.getLogger(__name__)
         self.poll_repository = poll_repository
         self.ban_service = ban_service
 
-    def save_event_polls(self, polls_data: list) -> list:
+    async def save_event_polls(self, polls_data: list) -> list:
         """
         Adds multiple event polls to the repository.
         Polls data is in the format of list of lists with start_time, end_time, details.
@@ -28,36 +28,38 @@ class PollService:
         """
         self.logger.info("Adding %d event polls.", len(polls_data))
         polls = [EventPoll(*poll_data, [100, 100]) for poll_data in polls_data]
-        return self.poll_repository.insert_event_polls(polls)
+        return await self.poll_repository.insert_event_polls(polls)
 
-    def update_poll_group_id(self, polls_ids: list, poll_group_id: str):
+    async def update_poll_group_id(self, polls_ids: list, poll_group_id: str):
         """
         Updates the poll group ID for multiple polls.
         """
         self.logger.info(
             "Updating poll group ID to %s for %d polls.", poll_group_id, len(polls_ids)
         )
-        self.poll_repository.update_poll_group_id(polls_ids, poll_group_id)
+        await self.poll_repository.update_poll_group_id(polls_ids, poll_group_id)
 
-    def get_event_polls(self, polls_ids: list) -> list:
+    async def get_event_polls(self, polls_ids: list) -> list:
         """
         Gets multiple event polls by their IDs.
         """
-        return self.poll_repository.get_event_polls(polls_ids)
+        return await self.poll_repository.get_event_polls(polls_ids)
 
-    def get_event_poll(self, poll_id: str) -> EventPoll | None:
+    async def get_event_poll(self, poll_id: str) -> EventPoll | None:
         """
         Gets a single event poll by its ID.
         """
-        return self.poll_repository.get_event_poll(poll_id)
+        return await self.poll_repository.get_event_poll(poll_id)
 
-    def validate_username_for_poll(self, username: str, pollmaker_id: str) -> None:
+    async def validate_username_for_poll(
+        self, username: str, pollmaker_id: str
+    ) -> None:
         """
         Validates if a user is banned from voting in polls.
         Raises UserBannedError if the user is banned.
         """
         try:
-            is_user_banned = self.ban_service.is_user_banned(username, pollmaker_id)
+            ban = await self.ban_service.get_ban(username, pollmaker_id)
         except ServiceUnavailableError as e:
             self.logger.error(
                 "Error checking ban status for user %s by %s: %s",
@@ -66,16 +68,13 @@ class PollService:
                 str(e),
             )
             return
-        if not is_user_banned:
+        if ban is None:
             return
         self.logger.info("User %s is banned from voting by %s", username, pollmaker_id)
-        raise UserBannedError(
-            username,
-            self.ban_service.get_ban_duration(username, pollmaker_id),
-            self.ban_service.repository.get_ban_message(username, pollmaker_id),
-        )
+        banned_duration, reason = ban
+        raise UserBannedError(username, banned_duration, reason)
 
-    def set_person_in_poll(
+    async def set_person_in_poll(
         self,
         poll_id: str,
         username: str,
@@ -86,44 +85,42 @@ class PollService:
         """
         Sets a person's sign-up status in a poll. Returns the poll.
         """
-        self.validate_username_for_poll(username, pollmaker_id)
+        await self.validate_username_for_poll(username, pollmaker_id)
         self.logger.info(
             "Setting sign-up status for user %s in poll %s to %s.",
             username,
             poll_id,
             is_sign_up,
         )
-        poll = self.poll_repository.get_event_poll(poll_id)
-
-        is_changed = poll.is_person_status_changed(username, membership, is_sign_up)
+        field = membership.to_db_representation()
+        poll, is_changed = await self.poll_repository.set_person_in_poll(
+            poll_id, username, field, is_sign_up
+        )
         if not is_changed:
             self.logger.info(
                 "No change in sign-up status for user %s in poll %s.", username, poll_id
             )
-            return poll
-        field = membership.to_db_representation()
-        if is_sign_up:
-            self.poll_repository.add_person_to_poll(poll_id, username, field)
-        else:
-            self.poll_repository.remove_person_from_poll(poll_id, username, field)
-
-        return self.poll_repository.get_event_poll(poll_id)
+        return poll
 
-    def save_next_polls(self, polls: List[EventPoll]) -> List[EventPoll]:
+    async def save_next_polls(self, polls: List[EventPoll]) -> List[EventPoll]:
         """Saves the next week's polls based on the given polls."""
         new_polls: List[EventPoll] = []
         for poll in polls:
             new_polls.append(poll.generate_next_week_poll())
-        new_ids = self.poll_repository.insert_event_polls(new_polls)
+        new_ids = await self.poll_repository.insert_event_polls(new_polls)
         for i, poll in enumerate(new_polls):
             poll.insert_id(new_ids[i])
         return new_polls
 
-    def delete_polls(self, poll_ids: list):
+    async def delete_polls(self, poll_ids: list):
         """Deletes multiple polls by their IDs."""
-        return self.poll_repository.delete_event_polls(poll_ids)
-
-    def set_active_status(self, poll_id: str, membership: Membership, is_active: bool):
-        """Sets the active status for a specific membership in an event poll."""
-        self.poll_repository.set_active_status(poll_id, membership, is_active)
-        return self.get_event_poll(poll_id)
+        return await self.poll_repository.delete_event_polls(poll_ids)
+
+    async def set_active_status(
+        self, poll_id: str, membership: Membership, is_active: bool
+    ):
+        """Sets the active status for a specific membership in an event poll. Returns
+        the updated poll."""
+        return await self.poll_repository.set_active_status(
+            poll_id, membership, is_active
+        )
@@ -1,46 +1,264 @@
 """Service for updating Telegram messages."""
 
+import asyncio
+import hashlib
 import json
 import logging
-import os
+import math
+import time
+from typing import Awaitable, Callable
 
-from qstash import QStash
-from telegram import Bot
-from telegram.error import BadRequest
+from redis.asyncio import Redis
+from telegram import Bot, CallbackQuery, Message
+from telegram.error import BadRequest, TelegramError
 
-from src.util import Membership
+from src.util import Membership, RequestPriority
+
+from .debounce_scheduler import DebounceScheduler
 
 DEFAULT_WAIT_TIME_MS = 2500
+MAX_STALENESS_MS = 10000
+DEBOUNCE_STATS_KEY = "debounce:stats"
+PUBLISHED_MESSAGES_TTL_SECONDS = 90 * 24 * 60 * 60  # 90 days
+MAX_CONCURRENT_EDITS = 8
+UNCHANGED_MESSAGE_ERROR = "message is not modified"
+MISSING_MESSAGE_ERRORS = ("message to edit not found", "message_id_invalid")
+
+# Closes the debounce window of a message, unless it changed since the given version
+CLOSE_WINDOW_SCRIPT = """
+if redis.call('HGET', KEYS[1], 'version') == ARGV[1] then
+    return redis.call('DEL', KEYS[1])
+end
+return 0
+"""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+def fingerprint(text: str, reply_markup, parse_mode) -> str:
+    """Hashes a rendering of a message, to tell whether editing to it changes it."""
+    markup = reply_markup.to_dict() if reply_markup is not None else None
+    rendering = json.dumps([text, markup, parse_mode], sort_keys=True)
+    return hashlib.sha256(rendering.encode()).hexdigest()
+
 
-current_url = os.getenv("DEPLOYMENT_URL", "http://localhost:8000")
+def _versioned(rendering: str, message) -> str:
+    """Adds the edit date of a chat message to its fingerprint. Editing an inline
+    message does not return it."""
+    if not isinstance(message, Message):
+        return rendering
+    edit_date = message.edit_date
+    return f"{rendering}:{int(edit_date.timestamp()) if edit_date else 0}"
 
 
 class TelegramMessageUpdater:
-    """Service for updating Telegram messages with debouncing."""
+    """
+    Service for updating Telegram messages with leading and trailing debouncing.
 
-    def __init__(self, redis_client, bot: Bot, qstash_client: QStash):
+    A poll group is published as one inline message per chat it is sent to. The inline
+    message IDs of each (poll group, membership) are registered in a Redis set. The
+    leading render only edits the message the change came from, so that a vote is not
+    held up by edits to every copy. Trailing renders edit all of them with the same
+    text, rendered once.
+
+    Each change to a poll group is recorded in a Redis hash under the debounce key of
+    the (poll group, membership), which bumps a version counter and marks it dirty. The
+    first change in a window is rendered at once and schedules a trailing render with
+    the scheduler. Later changes in the window are coalesced into that trailing render.
+    While changes keep arriving, the trailing render is pushed back until the message
+    has been stale for `MAX_STALENESS_MS`. The window is only closed if no change
+    arrived since the last render, so the last change is always rendered.
+    """
+
+    def __init__(self, redis_client: Redis, bot: Bot, scheduler: DebounceScheduler):
         self.redis_client = redis_client
         self.bot = bot
-        self.qstash_client = qstash_client
+        self.scheduler = scheduler
         self.logger = logging.getLogger(__name__)
+        self._close_window = redis_client.register_script(CLOSE_WINDOW_SCRIPT)
 
     @staticmethod
     def key_name(key: str) -> str:
         """Gets the debouncer key name for Redis storage."""
         return f"debounce:{key}"
 
+    @staticmethod
+    def published_messages_key_name(poll_group_id: str, membership: Membership) -> str:
+        """Gets the key name of the inline message IDs a poll group is published as."""
+        return f"published:{poll_group_id}:{membership.value}"
+
+    @staticmethod
+    def rendered_key_name(target: str) -> str:
+        """Gets the key name of the fingerprint of the last rendering of a message."""
+        return f"rendered:{target}"
+
+    async def register_published_message(
+        self, poll_group_id: str, membership: Membership, inline_message_id: str
+    ) -> None:
+        """Registers an inline message that the poll group was published as."""
+        key = self.published_messages_key_name(poll_group_id, membership)
+        pipeline = self.redis_client.pipeline()
+        pipeline.sadd(key, inline_message_id)
+        pipeline.expire(key, PUBLISHED_MESSAGES_TTL_SECONDS)
+        await pipeline.execute()
+
+    async def get_published_messages(
+        self, poll_group_id: str, membership: Membership
+    ) -> set:
+        """Gets the inline message IDs the poll group is published as."""
+        return await self.redis_client.smembers(
+            self.published_messages_key_name(poll_group_id, membership)
+        )
+
+    async def _edit_published_message(
+        self, semaphore: asyncio.Semaphore, inline_message_id: str, **kwargs
+    ) -> str | None:
+        """Edits an inline message. Returns its error if it could not be edited."""
+        async with semaphore:
+            try:
+                await self.bot.edit_message_text(
+                    inline_message_id=inline_message_id,
+                    rate_limit_args={"priority": RequestPriority.BACKGROUND},
+                    **kwargs,
+                )
+            except BadRequest as e:
+                if UNCHANGED_MESSAGE_ERROR in e.message.lower():
+                    return None
+                return e.message
+        return None
+
+    async def edit_published_messages(
+        self,
+        poll_group_id: str,
+        membership: Membership,
+        inline_message_ids: set,
+        text: str,
+        reply_markup,
+        parse_mode,
+    ) -> bool:
+        """
+        Edits every inline message the poll group is published as, with at most
+        `MAX_CONCURRENT_EDITS` edits in flight. Messages whose last rendering has the
+        same fingerprint are skipped, and messages that no longer exist are dropped from
+        the registry. Returns False if any message could not be edited.
+        """
+        rendering = fingerprint(text, reply_markup, parse_mode)
+        inline_message_ids = list(inline_message_ids)
+        if not inline_message_ids:
+            return True
+        renderings = await self.redis_client.mget(
+            [
+                self.rendered_key_name(inline_message_id)
+                for inline_message_id in inline_message_ids
+            ]
+        )
+        outdated = [
+            inline_message_id
+            for inline_message_id, last_rendering in zip(inline_message_ids, renderings)
+            if last_rendering != rendering
+        ]
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_EDITS)
+        errors = await asyncio.gather(
+            *(
+                self._edit_published_message(
+                    semaphore,
+                    inline_message_id,
+                    text=text,
+                    reply_markup=reply_markup,
+                    parse_mode=parse_mode,
+                )
+                for inline_message_id in outdated
+            )
+        )
+        failed = {
+            inline_message_id: error
+            for inline_message_id, error in zip(outdated, errors)
+            if error is not None
+        }
+        for inline_message_id, error in failed.items():
+            self.logger.warning("Edit of %s failed: %s", inline_message_id, error)
+        missing = [
+            inline_message_id
+            for inline_message_id, error in failed.items()
+            if any(missing in error.lower() for missing in MISSING_MESSAGE_ERRORS)
+        ]
+        if missing:
+            await self.redis_client.srem(
+                self.published_messages_key_name(poll_group_id, membership), *missing
+            )
+        pipeline = self.redis_client.pipeline()
+        for inline_message_id in outdated:
+            if inline_message_id not in failed:
+                pipeline.set(
+                    self.rendered_key_name(inline_message_id),
+                    rendering,
+                    ex=PUBLISHED_MESSAGES_TTL_SECONDS,
+                )
+        pipeline.hincrby(DEBOUNCE_STATS_KEY, "message_edits", len(outdated))
+        pipeline.hincrby(
+            DEBOUNCE_STATS_KEY, "skipped_edits", len(inline_message_ids) - len(outdated)
+        )
+        await pipeline.execute()
+        return not failed
+
+    async def edit_callback_message(
+        self,
+        callback_query: CallbackQuery,
+        text: str,
+        reply_markup=None,
+        parse_mode=None,
+    ) -> None:
+        """
+        Edits the message of a callback query, unless its last rendering has the same
+        fingerprint. The fingerprint of a chat message is stored with its edit date, so
+        that it goes stale once the message is edited in any other way.
+        """
+        message = callback_query.message
+        if callback_query.inline_message_id is not None:
+            key = self.rendered_key_name(callback_query.inline_message_id)
+        elif isinstance(message, Message):
+            key = self.rendered_key_name(f"{message.chat_id}:{message.message_id}")
+        else:
+            # Inaccessible messages have no edit date to go with their fingerprint
+            await callback_query.edit_message_text(
+                text, reply_markup=reply_markup, parse_mode=parse_mode
+            )
+            return
+
+        rendering = fingerprint(text, reply_markup, parse_mode)
+        if await self.redis_client.get(key) == _versioned(rendering, message):
+            await self.redis_client.hincrby(DEBOUNCE_STATS_KEY, "skipped_edits", 1)
+            return
+        try:
+            message = await callback_query.edit_message_text(
+                text, reply_markup=reply_markup, parse_mode=parse_mode
+            )
+        except BadRequest as e:
+            if UNCHANGED_MESSAGE_ERROR not in e.message.lower():
+                raise
+        await self.redis_client.set(
+            key, _versioned(rendering, message), ex=PUBLISHED_MESSAGES_TTL_SECONDS
+        )
+
     async def update_polls_message(
         self,
-        inline_message_id: str,
+        callback_query: CallbackQuery,
         text: str,
         reply_markup,
         parse_mode,
         poll_group_id: str,
         membership: Membership,
     ):
-        """Update a Telegram message with debouncing."""
+        """Update every published copy of a poll group with debouncing. The inline
+        message of the callback query the change came from is registered as a copy."""
 
-        debounce_key = self.key_name(inline_message_id)
+        inline_message_id = callback_query.inline_message_id
+        debounce_key = self.key_name(f"{poll_group_id}:{membership.value}")
+        published_messages_key = self.published_messages_key_name(
+            poll_group_id, membership
+        )
 
         payload = {
             "inline_message_id": inline_message_id,
@@ -50,47 +268,118 @@ class TelegramMessageUpdater:
 
         json_payload = json.dumps(payload)
 
-        ttl_seconds = int(2 * DEFAULT_WAIT_TIME_MS / 1000)
+        ttl_seconds = math.ceil(2 * (MAX_STALENESS_MS + DEFAULT_WAIT_TIME_MS) / 1000)
 
-        # 2. Acquire lock atomically (IMPORTANT: use NX)
-        acquired = self.redis_client.set(
-            debounce_key,
-            json_payload,
-            ex=ttl_seconds,
-            nx=True,  # only set if not exists
+        # 1. Mark the poll group dirty, and open a window if none is open
+        now = _now_ms()
+        pipeline = self.redis_client.pipeline()
+        pipeline.sadd(published_messages_key, inline_message_id)
+        pipeline.expire(published_messages_key, PUBLISHED_MESSAGES_TTL_SECONDS)
+        pipeline.smembers(published_messages_key)
+        pipeline.hset(
+            debounce_key, mapping={"payload": json_payload, "changed_at": now}
+        )
+        pipeline.hincrby(debounce_key, "version", 1)
+        pipeline.hsetnx(debounce_key, "rendered_at", now)
+        pipeline.expire(debounce_key, ttl_seconds)
+        pipeline.hincrby(DEBOUNCE_STATS_KEY, "changes", 1)
+        _, _, inline_message_ids, _, version, is_window_opened, _, _ = (
+            await pipeline.execute()
         )
 
-        if not acquired:
-            self.logger.info(
-                "Race: debounce key just acquired by another worker for %s",
-                inline_message_id,
-            )
+        if not is_window_opened:
+            # Coalesced into the trailing render of the open window
             return
 
-        # 3. Send first update immediately
+        # 2. Update the message the change came from immediately. The other copies are
+        # left to the trailing render, as is this one if its edit fails
         try:
-            await self.bot.edit_message_text(
-                text=text,
-                inline_message_id=inline_message_id,
-                reply_markup=reply_markup,
-                parse_mode=parse_mode,
+            try:
+                await self.edit_callback_message(
+                    callback_query,
+                    text,
+                    reply_markup=reply_markup,
+                    parse_mode=parse_mode,
+                )
+            except TelegramError as e:
+                self.logger.warning(
+                    "Edit of %s failed: %s", inline_message_id, e.message
+                )
+            else:
+                pipeline = self.redis_client.pipeline()
+                if inline_message_ids <= {inline_message_id}:
+                    # No other copy needs the trailing render
+                    pipeline.hset(debounce_key, "rendered_version", version)
+                pipeline.hincrby(DEBOUNCE_STATS_KEY, "leading_renders", 1)
+                await pipeline.execute()
+        finally:
+            # 3. Schedule the trailing update, which the open window is waiting for
+            if not await self.scheduler.schedule(
+                debounce_key, payload, DEFAULT_WAIT_TIME_MS
+            ):
+                await self.redis_client.delete(debounce_key)
+
+    async def run_trailing_update(
+        self, debounce_key: str, render: Callable[[str], Awaitable[None]]
+    ) -> bool:
+        """
+        Runs the trailing render of a debounce window. Renders the latest payload with
+        `render` if the message changed since its last render, then closes the window.
+        Pushes the render back while changes keep arriving, up to `MAX_STALENESS_MS`.
+        Returns False if there was no open window.
+        """
+        state = await self.redis_client.hgetall(debounce_key)
+        if not state:
+            return False
+
+        version = int(state["version"])
+        payload = json.loads(state["payload"])
+        now = _now_ms()
+        if version != int(state.get("rendered_version", 0)):
+            quiet_ms = now - int(state["changed_at"])
+            stale_ms = now - int(state["rendered_at"])
+            if quiet_ms < DEFAULT_WAIT_TIME_MS and stale_ms < MAX_STALENESS_MS:
+                delay_ms = min(
+                    DEFAULT_WAIT_TIME_MS - quiet_ms, MAX_STALENESS_MS - stale_ms
+                )
+                if await self.scheduler.schedule(debounce_key, payload, delay_ms):
+                    await self.redis_client.hincrby(DEBOUNCE_STATS_KEY, "extensions", 1)
+                    return True
+
+            await render(state["payload"])
+            pipeline = self.redis_client.pipeline()
+            pipeline.hset(
+                debounce_key, mapping={"rendered_version": version, "rendered_at": now}
             )
-        except BadRequest as e:
-            self.logger.warning("Initial edit failed: %s", e)
-            # You may want to delete the key here if this fails
-            self.redis_client.delete(debounce_key)
-            return
+            pipeline.hincrby(DEBOUNCE_STATS_KEY, "trailing_renders", 1)
+            await pipeline.execute()
 
-        # 4. Enqueue trailing update to QStash
-        try:
-            self.qstash_client.message.publish_json(
-                url=f"{current_url}/qstash_debounced",
-                body={
-                    "debounce_key": debounce_key,
-                    **payload,
-                },
-                delay=int(DEFAULT_WAIT_TIME_MS / 1000),
+        if await self._close_window(keys=[debounce_key], args=[version]):
+            return True
+        # Changed since this render, so it gets a trailing render of its own
+        if not await self.scheduler.schedule(
+            debounce_key, payload, DEFAULT_WAIT_TIME_MS
+        ):
+            await self.redis_client.delete(debounce_key)
+        return True
+
+    async def stats(self) -> dict:
+        """Returns the debouncer counters of every worker. Changes that were not
+        rendered on their own were coalesced into a later render. Skipped edits would
+        not have changed their message."""
+        counters = await self.redis_client.hgetall(DEBOUNCE_STATS_KEY)
+        stats = {
+            name: int(counters.get(name, 0))
+            for name in (
+                "changes",
+                "leading_renders",
+                "trailing_renders",
+                "extensions",
+                "skipped_edits",
             )
-        except Exception as e:
-            self.logger.error("Failed to enqueue QStash job: %s", e)
-            self.redis_client.delete(debounce_key)
+        }
+        stats["coalesced"] = max(
+            0,
+            stats["changes"] - stats["leading_renders"] - stats["trailing_renders"],
+        )
+        return stats
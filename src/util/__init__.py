@@ -21,3 +21,10 @@ def import_env(variables: list):
     if all_present:
         return {var: os.environ[var] for var in variables}
     return dotenv_values(".env")
+
+
+def import_optional_env(variable: str, default):
+    """Imports an optional environment variable from the system or a .env file.
+    Returns the default if it is unset or empty."""
+    value = os.environ.get(variable) or dotenv_values(".env").get(variable)
+    return value if value else default
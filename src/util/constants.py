@@ -1,6 +1,6 @@
 """Constants used across the bot."""
 
-from enum import Enum
+from enum import Enum, IntEnum
 
 # Symbolic constants for the UI
 PRESENT_SYMBOL = "✅"
@@ -34,6 +34,13 @@ class Membership(Enum):
         return "regulars" if self == Membership.REGULAR else "non_regulars"
 
 
+class RequestPriority(IntEnum):
+    """Priorities of outbound Bot API calls. Lower priorities are sent first."""
+
+    INTERACTIVE = 0
+    BACKGROUND = 1
+
+
 # "Ban"anas constants
 PENALISE_REGULARS = False
 PENALISE_NON_REGULARS = True
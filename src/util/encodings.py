@@ -5,11 +5,26 @@ inline queries and callback queries because they don't have the
 same handlers, so we can reuse some encoding functions.
 """
 
+import re
+
 from .constants import Membership
 
 DO_NOTHING = "."  # For non-interactive buttons
 DO_NOTHING_REGEX_STRING = "^.$"
 
+# Callback data starts with a prefix ending at the first "_" or "," that identifies
+# the callback, so callbacks can be dispatched with a single lookup.
+CALLBACK_PREFIX_PATTERN = re.compile(r"[^_,]*[_,]")
+
+
+def get_callback_prefix(data: str) -> str:
+    """Gets the prefix of callback data, or an empty string if it has none."""
+    if data == DO_NOTHING:
+        return DO_NOTHING
+    match = CALLBACK_PREFIX_PATTERN.match(data)
+    return match.group(0) if match else ""
+
+
 ## Inline Queries
 
 # Publish polls
@@ -29,10 +44,21 @@ def decode_publish_poll_query(query: str) -> str:
     return lst[1]
 
 
+def encode_publish_option_result_id(poll_group_id: str, membership: Membership) -> str:
+    """Encode the inline query result ID of a published poll group."""
+    return f"{poll_group_id}{membership.value}"
+
+
+def decode_publish_option_result_id(result_id: str) -> tuple[str, Membership]:
+    """Decode the poll group ID and membership of a chosen inline query result."""
+    return result_id[:-1], Membership.from_data_string(result_id[-1])
+
+
 ## Callback Queries
 
 # Generate next week's poll
-GENERATE_NEXT_POLL_REGEX_STRING = "^g_"
+GENERATE_NEXT_POLL_PREFIX = "g_"
+GENERATE_NEXT_POLL_REGEX_STRING = "^" + GENERATE_NEXT_POLL_PREFIX
 
 
 def encode_generate_next_poll(poll_group_id: str) -> str:
@@ -46,7 +72,8 @@ def decode_generate_next_poll_callback(query: str) -> str:
 
 
 # Manage poll groups
-MANAGE_POLL_GROUPS_REGEX_STRING = "^mg_"
+MANAGE_POLL_GROUPS_PREFIX = "mg_"
+MANAGE_POLL_GROUPS_REGEX_STRING = "^" + MANAGE_POLL_GROUPS_PREFIX
 
 
 def encode_manage_poll_groups(poll_group_id: str) -> str:
@@ -60,7 +87,8 @@ def decode_manage_poll_groups_callback(query: str) -> str:
 
 
 # Manage active polls
-MANAGE_ACTIVE_POLLS_REGEX_STRING = "^m_"
+MANAGE_ACTIVE_POLLS_PREFIX = "m_"
+MANAGE_ACTIVE_POLLS_REGEX_STRING = "^" + MANAGE_ACTIVE_POLLS_PREFIX
 
 
 def encode_manage_active_polls(poll_group_id: str) -> str:
@@ -74,7 +102,8 @@ def decode_manage_active_polls_callback(query: str) -> str:
 
 
 # Set poll active status
-SET_POLL_ACTIVE_STATUS_REGEX_STRING = "^sp_"
+SET_POLL_ACTIVE_STATUS_PREFIX = "sp_"
+SET_POLL_ACTIVE_STATUS_REGEX_STRING = "^" + SET_POLL_ACTIVE_STATUS_PREFIX
 
 
 def encode_set_poll_active_status(
@@ -91,7 +120,8 @@ def decode_set_poll_active_status_callback(query: str) -> tuple:
 
 
 # Update poll results
-UPDATE_POLL_RESULTS_REGEX_STRING = "^u_"
+UPDATE_POLL_RESULTS_PREFIX = "u_"
+UPDATE_POLL_RESULTS_REGEX_STRING = "^" + UPDATE_POLL_RESULTS_PREFIX
 
 
 def encode_update_poll_results(poll_id: str) -> str:
@@ -105,7 +135,8 @@ def decode_update_poll_results_callback(query: str) -> str:
 
 
 # Delete poll
-DELETE_POLL_REGEX_STRING = "^d_"
+DELETE_POLL_PREFIX = "d_"
+DELETE_POLL_REGEX_STRING = "^" + DELETE_POLL_PREFIX
 
 
 def encode_delete_poll(poll_id: str) -> str:
@@ -119,7 +150,8 @@ def decode_delete_poll_callback(query: str) -> str:
 
 
 # Poll voting
-POLL_VOTING_REGEX_STRING = "^v_"
+POLL_VOTING_PREFIX = "v_"
+POLL_VOTING_REGEX_STRING = "^" + POLL_VOTING_PREFIX
 
 
 def encode_poll_voting(
@@ -148,7 +180,8 @@ def decode_poll_voting_callback(query: str) -> tuple[str, Membership, bool, str
 
 
 # View attendance lists
-VIEW_ATTENDANCE_LISTS_REGEX_STRING = "^va_"
+VIEW_ATTENDANCE_LISTS_PREFIX = "va_"
+VIEW_ATTENDANCE_LISTS_REGEX_STRING = "^" + VIEW_ATTENDANCE_LISTS_PREFIX
 
 
 def encode_view_attendance_list(a_l_id: str) -> str:
@@ -162,7 +195,8 @@ def decode_view_attendance_list(encoded: str) -> str:
 
 
 # Mark attendance
-MARK_ATTENDANCE_REGEX_STRING = "^a,"
+MARK_ATTENDANCE_PREFIX = "a,"
+MARK_ATTENDANCE_REGEX_STRING = "^" + MARK_ATTENDANCE_PREFIX
 
 
 def encode_mark_attendance(user_id: str, a_l_id: str, status: int) -> str:
@@ -178,7 +212,8 @@ def decode_mark_attendance(encoded: str) -> tuple:
 
 
 # View summary
-VIEW_SUMMARY_REGEX_STRING = "^s_"
+VIEW_SUMMARY_PREFIX = "s_"
+VIEW_SUMMARY_REGEX_STRING = "^" + VIEW_SUMMARY_PREFIX
 
 
 def encode_view_attendance_summary(a_l_id: str, with_refresh: bool = False) -> str:
@@ -193,7 +228,8 @@ def decode_view_attendance_summary(encoded: str) -> tuple[str, bool]:
 
 
 # Manage attendance list
-MANAGE_ATTENDANCE_LIST_REGEX_STRING = "^ma,"
+MANAGE_ATTENDANCE_LIST_PREFIX = "ma,"
+MANAGE_ATTENDANCE_LIST_REGEX_STRING = "^" + MANAGE_ATTENDANCE_LIST_PREFIX
 
 
 def decode_manage_attendance_list(encoded: str) -> str:
@@ -207,7 +243,10 @@ def encode_manage_attendance_list(s: str) -> str:
 
 
 # View attendance tracking format
-VIEW_ATTENDANCE_TRACKING_FORMAT_REGEX_STRING = "^atf_"
+VIEW_ATTENDANCE_TRACKING_FORMAT_PREFIX = "atf_"
+VIEW_ATTENDANCE_TRACKING_FORMAT_REGEX_STRING = (
+    "^" + VIEW_ATTENDANCE_TRACKING_FORMAT_PREFIX
+)
 
 
 def encode_view_attendance_tracking_format(a_l_id: str) -> str:
@@ -221,7 +260,8 @@ def decode_view_attendance_tracking_format(encoded: str) -> str:
 
 
 # Unban user
-UNBAN_USER_REGEX_STRING = "^unb_"
+UNBAN_USER_PREFIX = "unb_"
+UNBAN_USER_REGEX_STRING = "^" + UNBAN_USER_PREFIX
 
 
 def encode_unban_user(user_id: str) -> str:
@@ -232,3 +272,43 @@ def encode_unban_user(user_id: str) -> str:
 def decode_unban_user(encoded: str) -> str:
     """Decode user ID from unbanning a user."""
     return "_".join(encoded.split("_")[1:])  # username may have _
+
+
+# Page through poll groups
+POLL_GROUPS_PAGE_PREFIX = "gp_"
+# Menus that page through poll groups
+MANAGE_POLL_GROUPS_MENU = "m"
+IMPORT_POLL_GROUPS_MENU = "i"
+
+
+def encode_poll_groups_page(
+    cursor: str, is_next: bool, menu: str = MANAGE_POLL_GROUPS_MENU
+) -> str:
+    """Encode the menu, cursor and direction for paging through poll groups."""
+    return f"gp_{menu}_{1 if is_next else 0}_{cursor}"  # 1 for older, 0 for newer
+
+
+def decode_poll_groups_page(encoded: str) -> tuple[str, bool, str]:
+    """Decode the cursor, direction and menu from paging through poll groups. Buttons
+    sent before the menu was encoded page through the poll group management menu."""
+    fields = encoded.split("_")[1:]
+    if len(fields) == 2:
+        fields.insert(0, MANAGE_POLL_GROUPS_MENU)
+    menu, is_next, cursor = fields
+    return cursor, bool(int(is_next)), menu
+
+
+# Page through attendance lists. The menu is the prefix of the callback data of the
+# attendance list buttons, which tells the menus apart.
+ATTENDANCE_LISTS_PAGE_PREFIX = "ap_"
+
+
+def encode_attendance_lists_page(menu: str, cursor: str, is_next: bool) -> str:
+    """Encode the menu, cursor and direction for paging through attendance lists."""
+    return f"ap_{menu.rstrip('_')}_{1 if is_next else 0}_{cursor}"
+
+
+def decode_attendance_lists_page(encoded: str) -> tuple[str, str, bool]:
+    """Decode the menu, cursor and direction from paging through attendance lists."""
+    menu, is_next, cursor = encoded.split("_")[1:]
+    return menu + "_", cursor, bool(int(is_next))
@@ -1,4 +1,5 @@
 """Formatting functions and static strings for Telegram bot responses."""
 
 from .attendance_views import *
+from .page_views import *
 from .poll_views import *
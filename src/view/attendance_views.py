@@ -4,16 +4,22 @@ from typing import List
 
 from telegram import InlineKeyboardButton, InlineKeyboardMarkup, Update
 
-from src.model import AttendanceList, EventPoll, PollGroup
+from src.model import AttendanceList, EventPoll, Page
 from src.util import (
     ABSENT,
     ABSENT_SYMBOL,
     DO_NOTHING,
+    IMPORT_POLL_GROUPS_MENU,
     LAST_MINUTE_CANCELLATION,
     PRESENT,
     PRESENT_SYMBOL,
+    VIEW_ATTENDANCE_LISTS_PREFIX,
+    VIEW_ATTENDANCE_TRACKING_FORMAT_PREFIX,
+    VIEW_SUMMARY_PREFIX,
+    encode_attendance_lists_page,
     encode_manage_attendance_list,
     encode_mark_attendance,
+    encode_poll_groups_page,
     encode_view_attendance_list,
     encode_view_attendance_summary,
     encode_view_attendance_tracking_format,
@@ -21,6 +27,8 @@ from src.util import (
     status_map,
 )
 
+from .page_views import build_page_navigation_buttons
+
 
 def generate_absent_string(absentee: str, index: int) -> str:
     """Generates an absent string for the absentee."""
@@ -63,12 +71,13 @@ def build_attendance_menu_text() -> str:
 
 
 def _build_inline_keyboard_for_attendance_list_titles(
-    attendance_lists: List[AttendanceList], callback_encoder: callable
+    page: Page, callback_encoder: callable, callback_prefix: str
 ) -> List[List[InlineKeyboardButton]]:
-    """Builds an inline keyboard for displaying a list of attendance list titles
-    using the provided callback encoder function."""
+    """Builds an inline keyboard for displaying a page of attendance list titles
+    using the provided callback encoder function, whose callback data starts with
+    `callback_prefix`."""
     inlinekeyboard = []
-    for attendance_list in attendance_lists:
+    for attendance_list in page.items:
         inlinekeyboard.append(
             [
                 InlineKeyboardButton(
@@ -77,39 +86,57 @@ def _build_inline_keyboard_for_attendance_list_titles(
                 )
             ]
         )
-    return inlinekeyboard
+    return inlinekeyboard + build_page_navigation_buttons(
+        page,
+        lambda cursor, is_next: encode_attendance_lists_page(
+            callback_prefix, cursor, is_next
+        ),
+    )
 
 
 def build_inline_keyboard_for_attendance_lists(
-    attendance_lists: List[AttendanceList],
+    page: Page,
 ) -> List[List[InlineKeyboardButton]]:
-    """Builds an inline keyboard for displaying a list of attendance list titles
+    """Builds an inline keyboard for displaying a page of attendance list titles
     for viewing the attendance lists."""
     return _build_inline_keyboard_for_attendance_list_titles(
-        attendance_lists, encode_view_attendance_list
+        page, encode_view_attendance_list, VIEW_ATTENDANCE_LISTS_PREFIX
     )
 
 
 def build_inline_keyboard_for_attendance_summaries(
-    attendance_lists: List[AttendanceList],
+    page: Page,
 ) -> List[List[InlineKeyboardButton]]:
-    """Builds an inline keyboard for displaying a list of attendance list titles for
+    """Builds an inline keyboard for displaying a page of attendance list titles for
     viewing summaries."""
     return _build_inline_keyboard_for_attendance_list_titles(
-        attendance_lists, encode_view_attendance_summary
+        page, encode_view_attendance_summary, VIEW_SUMMARY_PREFIX
     )
 
 
 def build_inline_keyboard_for_attendance_tracking_format(
-    attendance_lists: List[AttendanceList],
+    page: Page,
 ) -> List[List[InlineKeyboardButton]]:
-    """Generates an inline keyboard for displaying a list of attendance list titles for
+    """Generates an inline keyboard for displaying a page of attendance list titles for
     viewing the excel attendance tracking format."""
     return _build_inline_keyboard_for_attendance_list_titles(
-        attendance_lists, encode_view_attendance_tracking_format
+        page,
+        encode_view_attendance_tracking_format,
+        VIEW_ATTENDANCE_TRACKING_FORMAT_PREFIX,
     )
 
 
+# Keyboard builders of the attendance list menus, by the callback prefix of their
+# buttons, for paging through them
+ATTENDANCE_LIST_MENU_KEYBOARDS = {
+    VIEW_ATTENDANCE_LISTS_PREFIX: build_inline_keyboard_for_attendance_lists,
+    VIEW_SUMMARY_PREFIX: build_inline_keyboard_for_attendance_summaries,
+    VIEW_ATTENDANCE_TRACKING_FORMAT_PREFIX: (
+        build_inline_keyboard_for_attendance_tracking_format
+    ),
+}
+
+
 def build_view_attendance_list_text() -> str:
     """Builds the text for viewing an attendance list."""
     return "Please select the attendance list you want to edit."
@@ -130,14 +157,22 @@ def build_select_poll_group_to_import_text() -> str:
     return "Please select the poll group you want to import from."
 
 
-def build_select_poll_group_to_import_options(poll_groups: List[PollGroup]) -> str:
-    """Builds the text for selecting a poll group to import from."""
+def build_select_poll_group_to_import_options(
+    page: Page,
+) -> List[List[InlineKeyboardButton]]:
+    """Builds an inline keyboard for selecting a poll group to import from, from a page
+    of them."""
     keyboard = []
-    for poll_group in poll_groups:
+    for poll_group in page.items:
         keyboard.append(
             [InlineKeyboardButton(poll_group.name, callback_data=poll_group.id)]
         )
-    return keyboard
+    return keyboard + build_page_navigation_buttons(
+        page,
+        lambda cursor, is_next: encode_poll_groups_page(
+            cursor, is_next, IMPORT_POLL_GROUPS_MENU
+        ),
+    )
 
 
 def build_select_poll_to_import_text() -> str:
@@ -0,0 +1,32 @@
+"""Views for paging through inline keyboards."""
+
+from typing import Callable, List
+
+from telegram import InlineKeyboardButton
+
+from src.model import Page
+
+NEWER_PAGE_TEXT = "« Newer"
+OLDER_PAGE_TEXT = "Older »"
+
+
+def build_page_navigation_buttons(
+    page: Page, page_encoder: Callable[[str, bool], str]
+) -> List[List[InlineKeyboardButton]]:
+    """Builds the row of buttons to go to the newer and older pages, if there are any.
+    `page_encoder` encodes a cursor and whether to page to older items."""
+    row = []
+    if page.previous_cursor is not None:
+        row.append(
+            InlineKeyboardButton(
+                NEWER_PAGE_TEXT,
+                callback_data=page_encoder(page.previous_cursor, False),
+            )
+        )
+    if page.next_cursor is not None:
+        row.append(
+            InlineKeyboardButton(
+                OLDER_PAGE_TEXT, callback_data=page_encoder(page.next_cursor, True)
+            )
+        )
+    return [row] if row else []
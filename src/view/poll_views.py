@@ -1,6 +1,6 @@
 """Views for poll-related bot messages and options."""
 
-from typing import List
+from typing import Dict, List, Tuple
 
 from telegram import (
     InlineKeyboardButton,
@@ -10,14 +10,16 @@ from telegram import (
 )
 from telegram.constants import ParseMode
 
-from src.model import EventPoll, PollGroup
+from src.model import EventPoll, Page, PollGroup
 from src.util import (
     ACTIVE_SYMBOL,
     DATE_FORMAT_TEMPLATE,
     DETAILS_TEMPLATE,
     DO_NOTHING,
     DROP_OUT_SYMBOL,
+    IMPORT_POLL_GROUPS_MENU,
     INACTIVE_SYMBOL,
+    MANAGE_POLL_GROUPS_MENU,
     POLL_GROUP_MANAGEMENT_TEXT,
     POLL_GROUP_TEMPLATE,
     SIGN_UP_SYMBOL,
@@ -26,14 +28,18 @@ from src.util import (
     encode_generate_next_poll,
     encode_manage_active_polls,
     encode_manage_poll_groups,
+    encode_poll_groups_page,
     encode_poll_voting,
+    encode_publish_option_result_id,
     encode_publish_poll,
     encode_set_poll_active_status,
     encode_update_poll_results,
     escape_markdown_characters,
-    format_dt_string,
 )
 
+from .attendance_views import build_select_poll_group_to_import_options
+from .page_views import build_page_navigation_buttons
+
 
 def build_no_polls_message() -> str:
     """Builds the bot message when there are no polls."""
@@ -45,10 +51,10 @@ def build_select_poll_group_message() -> str:
     return "Please select a poll to view."
 
 
-def build_select_poll_group_options(poll_groups: List[PollGroup]) -> list:
-    """Builds an inline keyboard for selecting poll groups."""
+def build_select_poll_group_options(page: Page) -> list:
+    """Builds an inline keyboard for selecting poll groups from a page of them."""
     inline_keyboard = []
-    for group in poll_groups:
+    for group in page.items:
         inline_keyboard.append(
             [
                 InlineKeyboardButton(
@@ -56,7 +62,16 @@ def build_select_poll_group_options(poll_groups: List[PollGroup]) -> list:
                 )
             ]
         )
-    return inline_keyboard
+    return inline_keyboard + build_page_navigation_buttons(
+        page, encode_poll_groups_page
+    )
+
+
+# Keyboards of the menus that page through poll groups
+POLL_GROUP_MENU_KEYBOARDS = {
+    MANAGE_POLL_GROUPS_MENU: build_select_poll_group_options,
+    IMPORT_POLL_GROUPS_MENU: build_select_poll_group_to_import_options,
+}
 
 
 def build_poll_group_not_found_message() -> str:
@@ -186,36 +201,43 @@ def build_voting_buttons(
     return keyboard
 
 
+def build_poll_group_message(
+    poll_group: PollGroup, polls: List[EventPoll], membership: Membership
+) -> Tuple[str, InlineKeyboardMarkup]:
+    """Builds the text and voting buttons of a published poll group."""
+    text = generate_poll_group_text(poll_group, polls, membership)
+    reply_markup = InlineKeyboardMarkup(
+        build_voting_buttons(polls, membership, poll_group.owner_id)
+    )
+    return text, reply_markup
+
+
 def build_publish_options(
-    poll_group: PollGroup, polls: List[EventPoll]
+    poll_group: PollGroup, messages: Dict[Membership, Tuple[str, InlineKeyboardMarkup]]
 ) -> List[InlineQueryResultArticle]:
-    """Generates inline keyboard buttons for publishing a poll group."""
-    lst = []
-    for membership in Membership:
-        lst.append(
-            build_publish_option(poll_group, polls, membership, poll_group.owner_id)
-        )
-    return lst
+    """Generates the inline query results for publishing a poll group, from its
+    message for each membership."""
+    return [
+        build_publish_option(poll_group, membership, *messages[membership])
+        for membership in Membership
+    ]
 
 
 def build_publish_option(
     poll_group: PollGroup,
-    polls: List[EventPoll],
     membership: Membership,
-    pollmaker_id: str,
+    text: str,
+    reply_markup: InlineKeyboardMarkup,
 ) -> InlineQueryResultArticle:
     """
     Generates an inline query result article for publishing a poll group.
     Contains the poll message text and voting buttons for each poll in the poll group.
     """
-    reply_markup = InlineKeyboardMarkup(
-        build_voting_buttons(polls, membership, pollmaker_id)
-    )
     return InlineQueryResultArticle(
-        id=poll_group.id + str(membership.value),
+        id=encode_publish_option_result_id(poll_group.id, membership),
         title=f"({membership.to_representation()}) {poll_group.name}",
         input_message_content=InputTextMessageContent(
-            generate_poll_group_text(poll_group, polls, membership),
+            text,
             parse_mode=ParseMode.MARKDOWN_V2,
         ),
         reply_markup=reply_markup,
@@ -297,8 +319,7 @@ def generate_poll_group_text(
 
 def generate_poll_details_template(poll: EventPoll, markdown_v2=True) -> list:
     """Generates the poll details template for a given poll."""
-    [start_date, start_time] = format_dt_string(poll.start_time)
-    [_, end_time] = format_dt_string(poll.end_time)
+    start_date, start_time, end_time = poll.get_formatted_times()
     if markdown_v2:
         out = []
         out.append(f"*__Date\\: {escape_markdown_characters(start_date)}__*")
@@ -0,0 +1,56 @@
+"""Unit tests for the bot request helpers."""
+
+# pylint: disable=missing-function-docstring, import-error, protected-access
+import os
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from src.api.bot_request import (
+    CONNECTION_OPENED_EVENT,
+    ConnectionStats,
+    create_bot_request,
+)
+
+
+class ConnectionStatsTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the ConnectionStats class."""
+
+    async def test_counts_reused_connections(self):
+        stats = ConnectionStats()
+        requests = [httpx.Request("POST", "https://api.telegram.org") for _ in range(3)]
+        for request in requests:
+            await stats.on_request(request)
+        await requests[0].extensions["trace"](CONNECTION_OPENED_EVENT, {})
+        await requests[1].extensions["trace"]("http11.send_request_headers.started", {})
+
+        self.assertEqual(
+            stats.stats(),
+            {"requests": 3, "connections_opened": 1, "connections_reused": 2},
+        )
+
+
+class CreateBotRequestTest(unittest.TestCase):
+    """Tests for the create_bot_request function."""
+
+    @patch.dict(
+        os.environ,
+        {"TELEGRAM_CONNECTION_POOL_SIZE": "16", "TELEGRAM_READ_TIMEOUT": "7.5"},
+    )
+    @patch("src.api.bot_request.find_spec", return_value=None)
+    def test_configured_from_environment(self, _):
+        stats = ConnectionStats()
+        request = create_bot_request(stats)
+
+        client = request._client
+        self.assertEqual(client.timeout.read, 7.5)
+        self.assertEqual(client.event_hooks["request"], [stats.on_request])
+        pool = client._transport._pool
+        self.assertEqual(pool._max_connections, 16)
+        self.assertEqual(pool._max_keepalive_connections, 16)
+        self.assertFalse(pool._http2)
+
+
+if __name__ == "__main__":
+    unittest.main()
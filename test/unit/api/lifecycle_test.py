@@ -0,0 +1,43 @@
+"""Unit tests for the ApplicationLifecycle class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.api.lifecycle import ApplicationLifecycle
+
+
+async def process_update(_, coroutine):
+    await coroutine
+
+
+class ApplicationLifecycleTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the ApplicationLifecycle class."""
+
+    async def asyncSetUp(self):
+        self.application = MagicMock()
+        self.application.initialize = AsyncMock()
+        self.application.start = AsyncMock()
+        self.application.stop = AsyncMock()
+        self.application.shutdown = AsyncMock()
+        self.application.process_update = AsyncMock()
+        self.application.update_processor.process_update = AsyncMock(
+            side_effect=process_update
+        )
+        self.lifecycle = ApplicationLifecycle(self.application)
+        await self.lifecycle.start()
+
+    async def test_queued_and_replied_updates_are_counted(self):
+        await self.lifecycle.enqueue_update({"update_id": 1})
+        await self.lifecycle.process_update_with_reply({"update_id": 2})
+        await self.lifecycle.stop()
+
+        self.assertEqual(self.lifecycle.stats()["updates_queued"], 1)
+        self.assertEqual(self.lifecycle.stats()["updates_processed"], 2)
+        self.assertEqual(
+            self.application.update_processor.process_update.await_count, 2
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
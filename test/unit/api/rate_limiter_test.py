@@ -0,0 +1,85 @@
+"""Unit tests for the bot's rate limiter."""
+
+# pylint: disable=missing-function-docstring, import-error, protected-access
+import asyncio
+import unittest
+from unittest.mock import AsyncMock
+
+from telegram.error import RetryAfter
+
+from src.api.rate_limiter import PriorityRateLimiter, TokenBucket
+from src.util import RequestPriority
+
+
+class TokenBucketTest(unittest.TestCase):
+    """Tests for the TokenBucket class."""
+
+    def test_refills_at_rate(self):
+        bucket = TokenBucket(rate=2, capacity=1)
+        now = bucket.updated_at
+        bucket.consume(now)
+
+        self.assertAlmostEqual(bucket.get_delay(now), 0.5)
+        self.assertEqual(bucket.get_delay(now + 0.5), 0)
+
+    def test_pause_holds_tokens(self):
+        bucket = TokenBucket(rate=10, capacity=10)
+        now = bucket.updated_at
+        bucket.pause(now, 3)
+
+        self.assertAlmostEqual(bucket.get_delay(now + 1), 2)
+        self.assertFalse(bucket.is_idle(now + 1))
+
+
+class PriorityRateLimiterTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the PriorityRateLimiter class."""
+
+    def setUp(self):
+        self.limiter = PriorityRateLimiter()
+
+    async def request(self, callback, data, priority=None):
+        return await self.limiter.process_request(
+            callback,
+            (),
+            {},
+            "editMessageText",
+            data,
+            None if priority is None else {"priority": priority},
+        )
+
+    async def test_interactive_calls_go_first(self):
+        order = []
+
+        def record(name):
+            async def callback():
+                order.append(name)
+
+            return callback
+
+        chat = {"chat_id": 1}
+        # Takes the only token of the chat, so the calls below have to wait
+        await self.request(record("first"), chat)
+        await asyncio.gather(
+            self.request(record("background"), chat, RequestPriority.BACKGROUND),
+            self.request(record("interactive"), chat),
+        )
+
+        self.assertEqual(order, ["first", "interactive", "background"])
+        self.assertEqual(self.limiter.stats()["granted"], 3)
+
+    async def test_busy_chat_does_not_hold_up_other_chats(self):
+        callback = AsyncMock()
+        await self.request(callback, {"chat_id": -1})
+
+        await asyncio.wait_for(self.request(callback, {"chat_id": 2}), 0.1)
+
+        self.assertEqual(self.limiter.stats()["waiting_interactive"], 0)
+
+    async def test_retry_after_pauses_bucket_and_retries(self):
+        callback = AsyncMock(side_effect=[RetryAfter(0), "sent"])
+
+        result = await self.request(callback, {"inline_message_id": "inline"})
+
+        self.assertEqual(result, "sent")
+        self.assertEqual(callback.await_count, 2)
+        self.assertEqual(self.limiter.stats()["rescheduled"], 1)
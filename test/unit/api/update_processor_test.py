@@ -0,0 +1,64 @@
+"""Unit tests for the KeyedUpdateProcessor class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import asyncio
+import unittest
+from unittest.mock import MagicMock
+
+from telegram import Update
+
+from src.api.update_processor import KeyedUpdateProcessor
+
+
+def make_update(chat_id: int, user_id: int) -> Update:
+    update = MagicMock(spec=Update)
+    update.effective_chat.id = chat_id
+    update.effective_user.id = user_id
+    return update
+
+
+class KeyedUpdateProcessorTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the KeyedUpdateProcessor class."""
+
+    def setUp(self):
+        self.processor = KeyedUpdateProcessor(max_concurrent_updates=2)
+
+    async def test_same_key_is_processed_in_order(self):
+        order = []
+
+        async def handle(name):
+            await asyncio.sleep(0)
+            order.append(name)
+
+        await asyncio.gather(
+            *(
+                self.processor.process_update(make_update(1, 1), handle(name))
+                for name in ("first", "second", "third")
+            )
+        )
+
+        self.assertEqual(order, ["first", "second", "third"])
+        self.assertEqual(self.processor.stats()["ordering_keys"], 0)
+
+    async def test_backlog_of_one_key_does_not_delay_other_keys(self):
+        release = asyncio.Event()
+        busy_key = make_update(1, 1)
+        backlog = [
+            asyncio.create_task(self.processor.process_update(busy_key, release.wait()))
+            for _ in range(3)
+        ]
+        await asyncio.sleep(0)
+
+        # Only the running update of the busy key holds a slot
+        await asyncio.wait_for(
+            self.processor.process_update(make_update(2, 2), asyncio.sleep(0)), 0.1
+        )
+
+        self.assertEqual(self.processor.stats()["in_flight"], 1)
+        release.set()
+        await asyncio.gather(*backlog)
+        self.assertEqual(self.processor.stats()["processed"], 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,59 @@
+"""Unit tests for the AttendanceHandler class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from telegram.ext import ConversationHandler
+
+from src.handlers import AttendanceHandler
+from src.model import Page, PollGroup
+from src.util import decode_poll_groups_page, routes
+
+
+def make_poll_group(group_id: str) -> PollGroup:
+    poll_group = PollGroup(1, f"Group {group_id}")
+    poll_group.insert_id(group_id)
+    return poll_group
+
+
+class AttendanceHandlerTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the AttendanceHandler class."""
+
+    def setUp(self):
+        self.poll_group_service = AsyncMock()
+        self.handler = AttendanceHandler(
+            AsyncMock(), self.poll_group_service, AsyncMock(), AsyncMock()
+        )
+        self.update = MagicMock()
+        self.update.message.reply_text = AsyncMock()
+
+    async def test_import_from_poll_lists_page_of_poll_groups(self):
+        self.poll_group_service.get_poll_groups.return_value = Page(
+            [make_poll_group("a"), make_poll_group("b")], next_cursor="b"
+        )
+
+        state = await self.handler.handle_import_from_poll(self.update, MagicMock())
+
+        self.assertEqual(state, routes["SELECT_POLL_GROUP"])
+        keyboard = self.update.message.reply_text.await_args.kwargs[
+            "reply_markup"
+        ].inline_keyboard
+        self.assertEqual([row[0].callback_data for row in keyboard[:-1]], ["a", "b"])
+        self.assertEqual(
+            decode_poll_groups_page(keyboard[-1][0].callback_data), ("b", True, "i")
+        )
+
+    async def test_import_from_poll_without_poll_groups(self):
+        self.poll_group_service.get_poll_groups.return_value = Page([])
+
+        state = await self.handler.handle_import_from_poll(self.update, MagicMock())
+
+        self.assertEqual(state, ConversationHandler.END)
+        self.assertNotIn(
+            "reply_markup", self.update.message.reply_text.await_args.kwargs
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
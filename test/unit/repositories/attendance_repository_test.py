@@ -0,0 +1,152 @@
+"""Unit tests for the AttendanceRepository and AsyncAttendanceRepository classes."""
+
+# pylint: disable=missing-function-docstring, import-error
+import inspect
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from bson import ObjectId
+from pymongo import DESCENDING
+
+from src.model import AttendanceList
+from src.repositories import AsyncAttendanceRepository, AttendanceRepository
+from src.repositories.pagination import PAGE_SIZE
+from src.util import AttendanceListNotFoundError
+
+LIST_ID = "0123456789abcdef01234567"
+
+
+def make_attendance_json(list_id: str, owner_id) -> dict:
+    return {
+        "_id": ObjectId(list_id),
+        "id": None,
+        "owner_id": owner_id,
+        "details": ["Session", "Courts"],
+        "non_regulars": [
+            {"id": "@a", "name": "@a", "status": 0, "membership": 1},
+        ],
+        "regulars": [
+            {"id": "@b", "name": "@b", "status": 0, "membership": 0},
+        ],
+    }
+
+
+class AttendanceRepositoryTests:
+    """Tests shared by the sync and async attendance repositories."""
+
+    repository_class = None
+
+    def setUp(self):
+        self.collection = MagicMock()
+        self.repo = self.repository_class(self.collection)
+
+    async def call(self, method: str, *args):
+        result = getattr(self.repo, method)(*args)
+        return await result if inspect.isawaitable(result) else result
+
+    async def test_get_attendance_list_success(self):
+        self.stub("find_one", make_attendance_json(LIST_ID, 1))
+
+        attendance_list = await self.call("get_attendance_list", LIST_ID)
+
+        self.assertEqual(attendance_list.id, LIST_ID)
+        self.assertEqual(attendance_list.get_title(), "Session")
+
+    async def test_get_attendance_list_not_found(self):
+        self.stub("find_one", None)
+
+        with self.assertRaises(AttendanceListNotFoundError):
+            await self.call("get_attendance_list", LIST_ID)
+
+    async def test_get_attendance_lists_by_owner_id(self):
+        self.stub_find([make_attendance_json(LIST_ID, 1)])
+
+        attendance_lists = await self.call("get_attendance_lists_by_owner_id", "1")
+
+        self.assertEqual([a.id for a in attendance_lists], [LIST_ID])
+        self.collection.find.assert_called_once_with({"owner_id": 1})
+
+    async def test_get_attendance_list_summaries_by_owner_id(self):
+        self.stub_find_page([{"_id": ObjectId(LIST_ID), "details": ["Session"]}])
+
+        page = await self.call("get_attendance_list_summaries_by_owner_id", "1")
+
+        self.assertEqual(
+            [(s.id, s.get_title()) for s in page.items], [(LIST_ID, "Session")]
+        )
+        self.assertIsNone(page.next_cursor)
+        self.collection.find.assert_called_once_with(
+            {"owner_id": 1}, {"_id": 1, "details": {"$slice": 1}}
+        )
+        self.collection.find.return_value.sort.assert_called_once_with(
+            [("_id", DESCENDING)]
+        )
+        self.collection.find.return_value.sort.return_value.limit.assert_called_once_with(
+            PAGE_SIZE + 1
+        )
+
+    async def test_insert_attendance_list_stores_int_owner_id(self):
+        inserted = MagicMock()
+        inserted.inserted_id = ObjectId(LIST_ID)
+        self.stub("insert_one", inserted)
+        attendance_list = AttendanceList()
+        attendance_list.insert_owner_id("1")
+
+        await self.call("insert_attendance_list", attendance_list)
+
+        self.assertEqual(self.collection.insert_one.call_args[0][0]["owner_id"], 1)
+        self.assertEqual(attendance_list.id, LIST_ID)
+
+    async def test_patch_user_status_in_attendance_list(self):
+        self.stub("find_one", make_attendance_json(LIST_ID, 1))
+        self.stub("update_one", MagicMock())
+        attendance_list = await self.call("get_attendance_list", LIST_ID)
+
+        await self.call(
+            "patch_user_status_in_attendance_list", attendance_list, "@b", 1
+        )
+
+        self.collection.update_one.assert_called_once_with(
+            {"_id": ObjectId(LIST_ID)}, {"$set": {"regulars.0.status": 1}}
+        )
+
+
+class AttendanceRepositoryTest(
+    AttendanceRepositoryTests, unittest.IsolatedAsyncioTestCase
+):
+    """Runs the attendance repository tests against the pymongo implementation."""
+
+    repository_class = AttendanceRepository
+
+    def stub(self, method: str, value):
+        getattr(self.collection, method).return_value = value
+
+    def stub_find(self, documents: list):
+        self.collection.find.return_value = documents
+
+    def stub_find_page(self, documents: list):
+        self.collection.find.return_value.sort.return_value.limit.return_value = (
+            documents
+        )
+
+
+class AsyncAttendanceRepositoryTest(
+    AttendanceRepositoryTests, unittest.IsolatedAsyncioTestCase
+):
+    """Runs the attendance repository tests against the Motor implementation."""
+
+    repository_class = AsyncAttendanceRepository
+
+    def stub(self, method: str, value):
+        setattr(self.collection, method, AsyncMock(return_value=value))
+
+    def stub_find(self, documents: list):
+        self.collection.find.return_value.to_list = AsyncMock(return_value=documents)
+
+    def stub_find_page(self, documents: list):
+        cursor = self.collection.find.return_value.sort.return_value.limit.return_value
+        cursor.to_list = AsyncMock(return_value=documents)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,61 @@
+"""Unit tests for the BanCache class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import patch
+
+from src.repositories import BanCache
+
+NOW = 1_000_000.0
+
+
+class BanCacheTest(unittest.TestCase):
+    """Tests for the BanCache class."""
+
+    def setUp(self):
+        self.cache = BanCache(ttl_seconds=10, max_size=2)
+        patcher = patch("src.repositories.ban_cache.time.time", return_value=NOW)
+        self.time = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_miss(self):
+        self.assertEqual(self.cache.get("@a", "42"), (False, None))
+        self.assertEqual(self.cache.stats()["misses"], 1)
+
+    def test_not_banned_expires_after_ttl(self):
+        self.cache.put("@a", "42", None)
+
+        self.assertEqual(self.cache.get("@a", "42"), (True, None))
+        self.time.return_value = NOW + 10
+        self.assertEqual(self.cache.get("@a", "42"), (False, None))
+
+    def test_ban_cached_until_expiry(self):
+        self.cache.put("@a", "42", (60, "Absent"))
+
+        self.time.return_value = NOW + 45
+        self.assertEqual(self.cache.get("@a", "42"), (True, (15, "Absent")))
+        self.time.return_value = NOW + 60
+        self.assertEqual(self.cache.get("@a", "42"), (False, None))
+
+    def test_evicts_least_recently_used(self):
+        self.cache.put("@a", "42", None)
+        self.cache.put("@b", "42", None)
+        self.cache.get("@a", "42")
+        self.cache.put("@c", "42", None)
+
+        self.assertEqual(self.cache.get("@b", "42"), (False, None))
+        self.assertEqual(self.cache.get("@a", "42"), (True, None))
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+    def test_invalidate(self):
+        self.cache.put("@a", "42", None)
+        self.cache.put("@a", "7", None)
+
+        self.cache.invalidate(["@a"], "42")
+
+        self.assertEqual(self.cache.get("@a", "42"), (False, None))
+        self.assertEqual(self.cache.get("@a", "7"), (True, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,173 @@
+"""Unit tests for the BanRepository class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from src.repositories import AsyncBanRepository, BanCache, BanRepository
+from src.repositories.ban_repository import BAN_INVALIDATION_CHANNEL
+
+NOW = 1_000_000.0
+
+
+@patch("src.repositories.ban_repository.time.time", return_value=NOW)
+class BanRepositoryTest(unittest.TestCase):
+    """Tests for the BanRepository class."""
+
+    def setUp(self):
+        self.redis_client = MagicMock()
+        self.pipeline = self.redis_client.pipeline.return_value
+        self.repo = BanRepository(self.redis_client)
+
+    def test_ban_users_without_users(self, _):
+        self.repo.ban_users([], "42", 60, "Absent")
+
+        self.redis_client.pipeline.assert_not_called()
+
+    def test_ban_users_indexes_bans(self, _):
+        self.repo.ban_users(["@a", "@b"], "42", 60, "Absent")
+
+        self.pipeline.setex.assert_any_call("ban:@a:by:42", 60, "Absent")
+        self.pipeline.setex.assert_any_call("ban:@b:by:42", 60, "Absent")
+        self.pipeline.zadd.assert_called_once_with(
+            "bans:by:42", {"@a": NOW + 60, "@b": NOW + 60}
+        )
+        self.pipeline.execute.assert_called_once()
+
+    def test_get_banned_users_prunes_expired_bans(self, _):
+        self.pipeline.execute.return_value = [1, ["@a", "@b"]]
+
+        self.assertEqual(self.repo.get_banned_users("42"), ["@a", "@b"])
+        self.pipeline.zremrangebyscore.assert_called_once_with(
+            "bans:by:42", "-inf", NOW
+        )
+        self.pipeline.zrangebyscore.assert_called_once_with(
+            "bans:by:42", f"({NOW}", "+inf"
+        )
+        self.redis_client.keys.assert_not_called()
+
+    def test_unban_user_removes_from_index(self, _):
+        self.repo.unban_user("@a", "42")
+
+        self.pipeline.delete.assert_called_once_with("ban:@a:by:42")
+        self.pipeline.zrem.assert_called_once_with("bans:by:42", "@a")
+        self.pipeline.execute.assert_called_once()
+
+    def test_get_ban(self, _):
+        self.pipeline.execute.return_value = [30, "Absent"]
+
+        self.assertEqual(self.repo.get_ban("@a", "42"), (30, "Absent"))
+        self.redis_client.pipeline.assert_called_once_with(transaction=False)
+        self.pipeline.ttl.assert_called_once_with("ban:@a:by:42")
+        self.pipeline.get.assert_called_once_with("ban:@a:by:42")
+
+    def test_get_ban_not_banned(self, _):
+        self.pipeline.execute.return_value = [-2, None]
+
+        self.assertIsNone(self.repo.get_ban("@a", "42"))
+
+    def test_are_users_banned(self, _):
+        self.pipeline.execute.return_value = [30, -2, 5]
+
+        self.assertEqual(
+            self.repo.are_users_banned(["@a", "@b", "@c"], "42"), [True, False, True]
+        )
+        self.pipeline.execute.assert_called_once()
+
+    def test_are_users_banned_without_users(self, _):
+        self.assertEqual(self.repo.are_users_banned([], "42"), [])
+        self.redis_client.pipeline.assert_not_called()
+
+    def test_backfill_ban_index(self, _):
+        self.redis_client.scan_iter.return_value = [
+            "ban:@a:by:42",
+            "ban:@b:by:7",
+        ]
+        self.redis_client.ttl.side_effect = [30, -2]
+
+        self.assertEqual(self.repo.backfill_ban_index(), 1)
+        self.redis_client.zadd.assert_called_once_with("bans:by:42", {"@a": NOW + 30})
+
+
+@patch("src.repositories.ban_repository.time.time", return_value=NOW)
+class AsyncBanRepositoryTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the AsyncBanRepository class with a ban cache."""
+
+    def setUp(self):
+        self.cache = BanCache(ttl_seconds=10)
+        self.redis_client = MagicMock()
+        self.pipeline = self.redis_client.pipeline.return_value
+        self.pipeline.execute = AsyncMock()
+        self.redis_client.publish = AsyncMock()
+        self.repo = AsyncBanRepository(self.redis_client, self.cache)
+
+    async def test_get_ban_is_cached(self, _):
+        self.pipeline.execute.return_value = [-2, None]
+
+        self.assertIsNone(await self.repo.get_ban("@a", "42"))
+        self.assertFalse(await self.repo.is_user_banned("@a", "42"))
+        self.pipeline.execute.assert_awaited_once()
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    async def test_ban_users_invalidates_cache(self, _):
+        self.cache.put("@a", "42", None)
+
+        await self.repo.ban_users(["@a"], "42", 60, "Absent")
+
+        self.assertEqual(self.cache.get("@a", "42"), (False, None))
+        self.pipeline.zadd.assert_called_once_with("bans:by:42", {"@a": NOW + 60})
+        self.redis_client.publish.assert_awaited_once_with(
+            BAN_INVALIDATION_CHANNEL, '{"issuer": "42", "users": ["@a"]}'
+        )
+        self.pipeline.execute.assert_awaited_once()
+
+    async def test_lookup_during_ban_write_is_invalidated(self, _):
+        async def write_bans():
+            # A concurrent lookup caches the user as not banned before the write lands
+            self.cache.put("@a", "42", None)
+
+        self.pipeline.execute.side_effect = write_bans
+
+        await self.repo.ban_users(["@a"], "42", 60, "Absent")
+
+        self.assertEqual(self.cache.get("@a", "42"), (False, None))
+
+    async def test_ban_by_int_issuer_invalidates_str_issuer_lookup(self, _):
+        self.pipeline.execute.return_value = [-2, None]
+        await self.repo.get_ban("@a", "42")
+
+        await self.repo.ban_users(["@a"], 42, 60, "Absent")
+
+        self.pipeline.execute.return_value = [60, "Absent"]
+        self.assertEqual(await self.repo.get_ban("@a", "42"), (60, "Absent"))
+        self.redis_client.publish.assert_awaited_once_with(
+            BAN_INVALIDATION_CHANNEL, '{"issuer": "42", "users": ["@a"]}'
+        )
+
+    async def test_unban_user_invalidates_cache(self, _):
+        self.cache.put("@a", "42", (60, "Absent"))
+
+        await self.repo.unban_user("@a", "42")
+
+        self.assertEqual(self.cache.get("@a", "42"), (False, None))
+        self.redis_client.publish.assert_awaited_once()
+
+    async def test_are_users_banned(self, _):
+        self.pipeline.execute.return_value = [30, -2]
+
+        self.assertEqual(
+            await self.repo.are_users_banned(["@a", "@b"], "42"), [True, False]
+        )
+
+    def test_handle_invalidation(self, _):
+        self.cache.put("@a", "42", None)
+
+        self.repo._handle_invalidation(  # pylint: disable=protected-access
+            {"data": '{"issuer": "42", "users": ["@a"]}'}
+        )
+
+        self.assertEqual(self.cache.get("@a", "42"), (False, None))
+
+
+if __name__ == "__main__":
+    unittest.main()
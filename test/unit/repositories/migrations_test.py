@@ -0,0 +1,111 @@
+"""Unit tests for the MigrationRunner class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import MagicMock
+
+from pymongo import ASCENDING, IndexModel
+
+from src.repositories import Migration, MigrationRunner
+
+
+def make_repository(name: str, indexes: list) -> MagicMock:
+    repository = MagicMock()
+    repository.INDEXES = indexes
+    repository.collection.name = name
+    repository.collection.create_indexes.side_effect = lambda models: [
+        model.document["name"] for model in models
+    ]
+    return repository
+
+
+class MigrationRunnerTest(unittest.TestCase):
+    """Tests for the MigrationRunner class."""
+
+    def setUp(self):
+        self.schema_collection = MagicMock()
+        self.repository = make_repository(
+            "groups", [IndexModel([("owner_id", ASCENDING)])]
+        )
+        self.first = MagicMock()
+        self.second = MagicMock()
+        self.runner = MigrationRunner(
+            self.schema_collection,
+            [self.repository],
+            [
+                Migration(2, "second", self.second),
+                Migration(1, "first", self.first),
+            ],
+        )
+
+    def test_ensure_indexes(self):
+        self.assertEqual(self.runner.ensure_indexes(), ["owner_id_1"])
+
+    def test_migrate_applies_pending_migrations_in_order(self):
+        self.schema_collection.find_one.return_value = None
+        calls = MagicMock()
+        calls.attach_mock(self.first, "first")
+        calls.attach_mock(self.second, "second")
+
+        version = self.runner.migrate()
+
+        self.assertEqual(version, 2)
+        self.assertEqual([call[0] for call in calls.mock_calls], ["first", "second"])
+        last_update = self.schema_collection.update_one.call_args
+        self.assertEqual(last_update.args[1]["$set"]["version"], 2)
+        self.assertTrue(last_update.kwargs["upsert"])
+
+    def test_migrate_skips_applied_migrations(self):
+        self.schema_collection.find_one.return_value = {"version": 1}
+
+        self.assertEqual(self.runner.migrate(), 2)
+        self.first.assert_not_called()
+        self.second.assert_called_once()
+
+    def test_migrate_when_up_to_date(self):
+        self.schema_collection.find_one.return_value = {"version": 2}
+
+        self.assertEqual(self.runner.migrate(), 2)
+        self.first.assert_not_called()
+        self.second.assert_not_called()
+        self.schema_collection.update_one.assert_not_called()
+
+    def test_report(self):
+        self.repository.collection.index_information.return_value = {
+            "_id_": {},
+            "name_1": {},
+        }
+        self.repository.collection.aggregate.return_value = [
+            {"name": "_id_", "accesses": {"ops": 10}},
+            {"name": "name_1", "accesses": {"ops": 0}},
+        ]
+
+        report = self.runner.report()
+
+        self.assertEqual(
+            report,
+            {
+                "groups": {
+                    "missing": ["owner_id_1"],
+                    "undeclared": ["name_1"],
+                    "unused": [],
+                }
+            },
+        )
+
+    def test_report_unused_index(self):
+        self.repository.collection.index_information.return_value = {
+            "_id_": {},
+            "owner_id_1": {},
+        }
+        self.repository.collection.aggregate.return_value = [
+            {"name": "owner_id_1", "accesses": {"ops": 0}},
+        ]
+
+        report = self.runner.report()
+
+        self.assertEqual(report["groups"]["unused"], ["owner_id_1"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,49 @@
+"""Unit tests for the owner ID helpers."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import MagicMock
+
+from pymongo import UpdateOne
+
+from src.repositories.owner_ids import normalize_owner_ids, to_stored_document
+
+
+class OwnerIdsTest(unittest.TestCase):
+    """Tests for the owner ID helpers."""
+
+    def test_to_stored_document(self):
+        document = {"owner_id": "42", "name": "Weekly"}
+
+        self.assertEqual(
+            to_stored_document(document), {"owner_id": 42, "name": "Weekly"}
+        )
+        self.assertEqual(document["owner_id"], "42")
+
+    def test_to_stored_document_without_owner(self):
+        self.assertEqual(to_stored_document({"owner_id": None}), {"owner_id": None})
+
+    def test_normalize_owner_ids_writes_in_batches(self):
+        collection = MagicMock()
+        collection.find.return_value = iter(
+            [{"_id": i, "owner_id": str(i)} for i in range(5)]
+        )
+        collection.bulk_write.side_effect = lambda requests, ordered: MagicMock(
+            modified_count=len(requests)
+        )
+
+        modified = normalize_owner_ids(collection, batch_size=2)
+
+        self.assertEqual(modified, 5)
+        self.assertEqual(
+            collection.find.call_args[0][0], {"owner_id": {"$type": "string"}}
+        )
+        batches = [call[0][0] for call in collection.bulk_write.call_args_list]
+        self.assertEqual([len(batch) for batch in batches], [2, 2, 1])
+        self.assertEqual(
+            batches[2][0], UpdateOne({"_id": 4}, {"$set": {"owner_id": 4}})
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+"""Unit tests for the keyset pagination helpers."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+
+from bson import ObjectId
+from pymongo import ASCENDING, DESCENDING
+
+from src.repositories.pagination import build_page, build_page_query
+
+# Document IDs, newest first
+IDS = [f"{i:024x}" for i in range(7, 0, -1)]
+
+
+def make_documents(ids: list) -> list:
+    return [{"_id": ObjectId(document_id)} for document_id in ids]
+
+
+def get_id(document: dict) -> str:
+    return str(document["_id"])
+
+
+class PaginationTest(unittest.TestCase):
+    """Tests for the keyset pagination helpers."""
+
+    def test_build_page_query_first_page(self):
+        self.assertEqual(
+            build_page_query(1, None, True), ({"owner_id": 1}, [("_id", DESCENDING)])
+        )
+
+    def test_build_page_query_older(self):
+        self.assertEqual(
+            build_page_query(1, IDS[2], True),
+            (
+                {"owner_id": 1, "_id": {"$lt": ObjectId(IDS[2])}},
+                [("_id", DESCENDING)],
+            ),
+        )
+
+    def test_build_page_query_newer(self):
+        self.assertEqual(
+            build_page_query(1, IDS[3], False),
+            (
+                {"owner_id": 1, "_id": {"$gt": ObjectId(IDS[3])}},
+                [("_id", ASCENDING)],
+            ),
+        )
+
+    def test_build_first_page(self):
+        page = build_page(make_documents(IDS[:4]), None, True, 3, get_id)
+
+        self.assertEqual(page.items, IDS[:3])
+        self.assertIsNone(page.previous_cursor)
+        self.assertEqual(page.next_cursor, IDS[2])
+
+    def test_build_last_page(self):
+        page = build_page(make_documents(IDS[6:]), IDS[5], True, 3, get_id)
+
+        self.assertEqual(page.items, IDS[6:])
+        self.assertEqual(page.previous_cursor, IDS[6])
+        self.assertIsNone(page.next_cursor)
+
+    def test_build_newer_page(self):
+        # Newer documents are fetched oldest first
+        documents = make_documents(IDS[:4][::-1])
+
+        page = build_page(documents, IDS[4], False, 3, get_id)
+
+        self.assertEqual(page.items, IDS[1:4])
+        self.assertEqual(page.previous_cursor, IDS[1])
+        self.assertEqual(page.next_cursor, IDS[3])
+
+    def test_build_newest_page_going_back(self):
+        page = build_page(make_documents(IDS[:2][::-1]), IDS[2], False, 3, get_id)
+
+        self.assertEqual(page.items, IDS[:2])
+        self.assertIsNone(page.previous_cursor)
+        self.assertEqual(page.next_cursor, IDS[1])
+
+    def test_build_empty_page(self):
+        page = build_page([], IDS[0], True, 3, get_id)
+
+        self.assertTrue(page.is_empty())
+        self.assertIsNone(page.previous_cursor)
+        self.assertIsNone(page.next_cursor)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,234 @@
+"""Unit tests for the PollGroupRepository and AsyncPollGroupRepository classes."""
+
+# pylint: disable=missing-function-docstring, import-error, protected-access
+import inspect
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from bson import ObjectId
+
+from src.repositories import AsyncPollGroupRepository, PollGroupRepository
+from src.repositories.poll_group_repository import (
+    _build_poll_group_with_polls_pipeline,
+)
+from src.util import PollGroupNotFoundError, PollNotFoundError
+
+GROUP_ID = "0123456789abcdef01234567"
+OTHER_GROUP_ID = "76543210fedcba9876543210"
+THIRD_GROUP_ID = "0123456789abcdef76543210"
+POLL_IDS = ["aaaaaaaaaaaaaaaaaaaaaaaa", "bbbbbbbbbbbbbbbbbbbbbbbb"]
+
+
+def make_group_json(group_id: str, owner_id: int = 1) -> dict:
+    return {
+        "_id": ObjectId(group_id),
+        "id": None,
+        "owner_id": owner_id,
+        "name": "Weekly",
+        "polls_ids": ["a", "b"],
+    }
+
+
+def make_poll_json(poll_id: str) -> dict:
+    return {
+        "_id": ObjectId(poll_id),
+        "id": None,
+        "start_time": "2025-01-01T10:00:00",
+        "end_time": "2025-01-01T12:00:00",
+        "regulars": [],
+        "non_regulars": [],
+        "is_active": [True, True],
+        "details": poll_id,
+        "type": 0,
+        "allocations": [100, 100],
+        "poll_group_id": GROUP_ID,
+    }
+
+
+class PollGroupRepositoryTests:
+    """Tests shared by the sync and async poll group repositories."""
+
+    repository_class = None
+
+    def setUp(self):
+        self.collection = MagicMock()
+        self.repo = self.repository_class(self.collection)
+
+    async def call(self, method: str, *args):
+        result = getattr(self.repo, method)(*args)
+        return await result if inspect.isawaitable(result) else result
+
+    async def test_get_poll_group_success(self):
+        self.stub("find_one", make_group_json(GROUP_ID))
+
+        group = await self.call("get_poll_group", GROUP_ID)
+
+        self.assertEqual(group.id, GROUP_ID)
+        self.assertEqual(group.get_poll_ids(), ["a", "b"])
+
+    async def test_get_poll_group_not_found(self):
+        self.stub("find_one", None)
+
+        with self.assertRaises(PollGroupNotFoundError):
+            await self.call("get_poll_group", GROUP_ID)
+
+    async def test_get_poll_group_with_polls_from_results(self):
+        group_json = make_group_json(GROUP_ID)
+        group_json["polls_ids"] = POLL_IDS
+        group_json["results"] = [
+            make_poll_json(POLL_IDS[1]),
+            make_poll_json(POLL_IDS[0]),
+        ]
+        group_json["results_version"] = 3
+        self.stub("find_one", group_json)
+
+        group, polls = await self.call("get_poll_group_with_polls", GROUP_ID)
+
+        self.assertEqual(group.id, GROUP_ID)
+        self.assertEqual(group.results_version, 3)
+        self.assertEqual([poll.id for poll in polls], POLL_IDS)
+        self.assertEqual([poll.details for poll in polls], POLL_IDS)
+        self.collection.aggregate.assert_not_called()
+
+    async def test_get_poll_group_with_polls_without_results(self):
+        group_json = make_group_json(GROUP_ID)
+        group_json["polls_ids"] = POLL_IDS
+        self.stub("find_one", dict(group_json))
+        group_json["polls"] = [make_poll_json(POLL_IDS[1]), make_poll_json(POLL_IDS[0])]
+        self.stub_aggregate([group_json])
+
+        group, polls = await self.call("get_poll_group_with_polls", GROUP_ID)
+
+        self.assertEqual(group.id, GROUP_ID)
+        self.assertIsNone(group.results_version)
+        self.assertEqual([poll.id for poll in polls], POLL_IDS)
+        self.assertEqual([poll.details for poll in polls], POLL_IDS)
+        pipeline = self.collection.aggregate.call_args[0][0]
+        self.assertEqual(pipeline[0], {"$match": {"_id": ObjectId(GROUP_ID)}})
+        self.assertEqual(
+            [list(stage) for stage in pipeline],
+            [["$match"], ["$addFields"], ["$lookup"], ["$unset"]],
+        )
+
+    def test_poll_group_with_polls_pipeline_joins_on_id(self):
+        pipeline = _build_poll_group_with_polls_pipeline(None, "polls")
+
+        self.assertEqual(
+            pipeline[0],
+            {
+                "$addFields": {
+                    "poll_object_ids": {
+                        "$map": {"input": "$polls_ids", "in": {"$toObjectId": "$$this"}}
+                    }
+                }
+            },
+        )
+        self.assertEqual(
+            pipeline[1],
+            {
+                "$lookup": {
+                    "from": "polls",
+                    "localField": "poll_object_ids",
+                    "foreignField": "_id",
+                    "as": "polls",
+                }
+            },
+        )
+        self.assertEqual(pipeline[2], {"$unset": "poll_object_ids"})
+
+    async def test_get_poll_group_with_polls_not_found(self):
+        self.stub("find_one", None)
+
+        with self.assertRaises(PollGroupNotFoundError):
+            await self.call("get_poll_group_with_polls", GROUP_ID)
+
+    async def test_get_poll_group_with_polls_missing_poll(self):
+        group_json = make_group_json(GROUP_ID)
+        group_json["polls_ids"] = POLL_IDS
+        self.stub("find_one", dict(group_json))
+        group_json["polls"] = [make_poll_json(POLL_IDS[0])]
+        self.stub_aggregate([group_json])
+
+        with self.assertRaises(PollNotFoundError):
+            await self.call("get_poll_group_with_polls", GROUP_ID)
+
+    async def test_rebuild_results(self):
+        self.collection.name = "groups"
+        self.stub_aggregate([])
+
+        await self.call("rebuild_results", GROUP_ID)
+
+        pipeline = self.collection.aggregate.call_args[0][0]
+        self.assertEqual(pipeline[0], {"$match": {"_id": ObjectId(GROUP_ID)}})
+        self.assertEqual(pipeline[-2], {"$project": {"results": "$polls"}})
+        self.assertEqual(pipeline[-1]["$merge"]["into"], "groups")
+
+    async def test_find_inconsistent_results(self):
+        polls = [make_poll_json(POLL_IDS[0]), make_poll_json(POLL_IDS[1])]
+        consistent = make_group_json(GROUP_ID)
+        consistent.update(polls=polls, results=polls[::-1])
+        stale = make_group_json(OTHER_GROUP_ID)
+        stale.update(polls=polls, results=[polls[0], make_poll_json(POLL_IDS[0])])
+        missing = make_group_json(THIRD_GROUP_ID)
+        missing.update(polls=polls)
+        self.stub_aggregate([consistent, stale, missing])
+
+        group_ids = await self.call("find_inconsistent_results")
+
+        self.assertEqual(group_ids, [OTHER_GROUP_ID, THIRD_GROUP_ID])
+
+    async def test_get_poll_groups_by_owner_id(self):
+        self.stub_find([make_group_json(GROUP_ID)])
+
+        groups = await self.call("get_poll_groups_by_owner_id", 1)
+
+        self.assertEqual([group.id for group in groups], [GROUP_ID])
+        self.collection.find.assert_called_once_with({"owner_id": 1})
+
+    async def test_delete_poll_group_not_found(self):
+        result = MagicMock()
+        result.deleted_count = 0
+        self.stub("delete_one", result)
+
+        with self.assertRaises(PollGroupNotFoundError):
+            await self.call("delete_poll_group", GROUP_ID)
+
+
+class PollGroupRepositoryTest(
+    PollGroupRepositoryTests, unittest.IsolatedAsyncioTestCase
+):
+    """Runs the poll group repository tests against the pymongo implementation."""
+
+    repository_class = PollGroupRepository
+
+    def stub(self, method: str, value):
+        getattr(self.collection, method).return_value = value
+
+    def stub_find(self, documents: list):
+        self.collection.find.return_value = documents
+
+    def stub_aggregate(self, documents: list):
+        self.collection.aggregate.return_value = iter(documents)
+
+
+class AsyncPollGroupRepositoryTest(
+    PollGroupRepositoryTests, unittest.IsolatedAsyncioTestCase
+):
+    """Runs the poll group repository tests against the Motor implementation."""
+
+    repository_class = AsyncPollGroupRepository
+
+    def stub(self, method: str, value):
+        setattr(self.collection, method, AsyncMock(return_value=value))
+
+    def stub_find(self, documents: list):
+        self.collection.find.return_value.to_list = AsyncMock(return_value=documents)
+
+    def stub_aggregate(self, documents: list):
+        self.collection.aggregate.return_value.to_list = AsyncMock(
+            return_value=documents
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,267 @@
+"""Unit tests for the PollRepository and AsyncPollRepository classes."""
+
+# pylint: disable=missing-function-docstring, import-error
+import inspect
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from bson import ObjectId
+from pymongo import ReturnDocument, UpdateOne
+
+from src.repositories import AsyncPollRepository, PollRepository
+from src.util import Membership, PollNotFoundError
+
+POLL_ID = "0123456789abcdef01234567"
+OTHER_POLL_ID = "76543210fedcba9876543210"
+
+
+def make_poll_json(poll_id: str, details: str = "details") -> dict:
+    return {
+        "_id": ObjectId(poll_id),
+        "id": None,
+        "start_time": "2025-01-01T10:00:00",
+        "end_time": "2025-01-01T12:00:00",
+        "regulars": ["@a"],
+        "non_regulars": [],
+        "is_active": [True, True],
+        "details": details,
+        "type": 0,
+        "allocations": [100, 100],
+        "poll_group_id": None,
+    }
+
+
+class PollRepositoryTests:
+    """Tests shared by the sync and async poll repositories."""
+
+    repository_class = None
+
+    def setUp(self):
+        self.collection = MagicMock()
+        self.repo = self.repository_class(self.collection)
+
+    async def call(self, method: str, *args):
+        result = getattr(self.repo, method)(*args)
+        return await result if inspect.isawaitable(result) else result
+
+    async def test_insert_event_polls(self):
+        inserted = MagicMock()
+        inserted.inserted_ids = [ObjectId(POLL_ID), ObjectId(OTHER_POLL_ID)]
+        self.stub("insert_many", inserted)
+
+        result = await self.call("insert_event_polls_dicts", [{}, {}])
+
+        self.assertEqual(result, [POLL_ID, OTHER_POLL_ID])
+
+    async def test_get_event_poll_success(self):
+        self.stub("find_one", make_poll_json(POLL_ID))
+
+        poll = await self.call("get_event_poll", POLL_ID)
+
+        self.assertEqual(poll.id, POLL_ID)
+        self.assertEqual(poll.regulars, ["@a"])
+        self.assertEqual(poll.get_title(), "Wed, 01/01/2025 10:00am - 12:00pm")
+
+    async def test_get_event_poll_with_formatted_times(self):
+        poll_json = make_poll_json(POLL_ID)
+        poll_json["formatted_times"] = ["Date", "Start", "End"]
+        self.stub("find_one", poll_json)
+
+        poll = await self.call("get_event_poll", POLL_ID)
+
+        self.assertEqual(poll.get_title(), "Date Start - End")
+
+    async def test_get_event_poll_not_found(self):
+        self.stub("find_one", None)
+
+        with self.assertRaises(PollNotFoundError):
+            await self.call("get_event_poll", POLL_ID)
+
+    async def test_get_event_polls_success(self):
+        self.stub_find([make_poll_json(POLL_ID), make_poll_json(OTHER_POLL_ID)])
+
+        polls = await self.call("get_event_polls", [POLL_ID, OTHER_POLL_ID])
+
+        self.assertEqual([poll.id for poll in polls], [POLL_ID, OTHER_POLL_ID])
+
+    async def test_get_event_polls_keeps_requested_order(self):
+        self.stub_find(
+            [make_poll_json(POLL_ID, "first"), make_poll_json(OTHER_POLL_ID, "second")]
+        )
+
+        polls = await self.call("get_event_polls", [OTHER_POLL_ID, POLL_ID])
+
+        self.assertEqual([poll.id for poll in polls], [OTHER_POLL_ID, POLL_ID])
+        self.assertEqual([poll.details for poll in polls], ["second", "first"])
+
+    async def test_get_event_polls_missing(self):
+        self.stub_find([make_poll_json(POLL_ID)])
+
+        with self.assertRaises(PollNotFoundError):
+            await self.call("get_event_polls", [POLL_ID, OTHER_POLL_ID])
+
+    async def test_add_person_to_poll(self):
+        self.stub("update_one", MagicMock())
+
+        await self.call("add_person_to_poll", POLL_ID, "@a", "regulars")
+
+        self.collection.update_one.assert_called_once_with(
+            {"_id": ObjectId(POLL_ID)}, {"$addToSet": {"regulars": "@a"}}
+        )
+
+    async def test_remove_person_from_poll(self):
+        self.stub("update_one", MagicMock())
+
+        await self.call("remove_person_from_poll", POLL_ID, "@a", "regulars")
+
+        self.collection.update_one.assert_called_once_with(
+            {"_id": ObjectId(POLL_ID)}, {"$pull": {"regulars": "@a"}}
+        )
+
+    async def test_set_person_in_poll_changed(self):
+        self.stub("find_one_and_update", make_poll_json(POLL_ID))
+        self.stub("find_one", None)
+
+        poll, is_changed = await self.call(
+            "set_person_in_poll", POLL_ID, "@a", "regulars", True
+        )
+
+        self.assertTrue(is_changed)
+        self.assertEqual(poll.id, POLL_ID)
+        self.collection.find_one_and_update.assert_called_once_with(
+            {"_id": ObjectId(POLL_ID), "regulars": {"$ne": "@a"}},
+            {"$addToSet": {"regulars": "@a"}},
+            return_document=ReturnDocument.AFTER,
+        )
+        self.collection.find_one.assert_not_called()
+
+    async def test_set_person_in_poll_unchanged(self):
+        self.stub("find_one_and_update", None)
+        self.stub("find_one", make_poll_json(POLL_ID))
+
+        poll, is_changed = await self.call(
+            "set_person_in_poll", POLL_ID, "@b", "regulars", False
+        )
+
+        self.assertFalse(is_changed)
+        self.assertEqual(poll.id, POLL_ID)
+        self.collection.find_one_and_update.assert_called_once_with(
+            {"_id": ObjectId(POLL_ID), "regulars": "@b"},
+            {"$pull": {"regulars": "@b"}},
+            return_document=ReturnDocument.AFTER,
+        )
+
+    async def test_set_person_in_poll_not_found(self):
+        self.stub("find_one_and_update", None)
+        self.stub("find_one", None)
+
+        with self.assertRaises(PollNotFoundError):
+            await self.call("set_person_in_poll", POLL_ID, "@a", "regulars", True)
+
+    async def test_set_active_status(self):
+        self.stub("find_one_and_update", make_poll_json(POLL_ID))
+
+        poll = await self.call(
+            "set_active_status", POLL_ID, Membership.NON_REGULAR, False
+        )
+
+        self.collection.find_one_and_update.assert_called_once_with(
+            {"_id": ObjectId(POLL_ID)},
+            {"$set": {"is_active.1": False}},
+            return_document=ReturnDocument.AFTER,
+        )
+        self.assertEqual(poll.id, POLL_ID)
+
+    async def test_set_active_status_not_found(self):
+        self.stub("find_one_and_update", None)
+
+        with self.assertRaises(PollNotFoundError):
+            await self.call("set_active_status", POLL_ID, Membership.REGULAR, True)
+
+    async def test_set_person_in_poll_updates_results(self):
+        groups_collection = MagicMock()
+        self.repo = self.repository_class(self.collection, groups_collection)
+        session = self.stub_transaction()
+        poll_json = make_poll_json(POLL_ID)
+        poll_json["poll_group_id"] = ObjectId(OTHER_POLL_ID)
+        self.stub("find_one_and_update", poll_json)
+        self.stub("update_one", MagicMock(), groups_collection)
+
+        _, is_changed = await self.call(
+            "set_person_in_poll", POLL_ID, "@b", "regulars", True
+        )
+
+        self.assertTrue(is_changed)
+        self.assertEqual(
+            self.collection.find_one_and_update.call_args.kwargs["session"], session
+        )
+        groups_collection.update_one.assert_called_once_with(
+            {"_id": ObjectId(OTHER_POLL_ID), "results._id": ObjectId(POLL_ID)},
+            {"$set": {"results.$": poll_json}, "$inc": {"results_version": 1}},
+            session=session,
+        )
+
+
+class PollRepositoryTest(PollRepositoryTests, unittest.IsolatedAsyncioTestCase):
+    """Runs the poll repository tests against the pymongo implementation."""
+
+    repository_class = PollRepository
+
+    def stub(self, method: str, value, collection=None):
+        getattr(collection or self.collection, method).return_value = value
+
+    def stub_transaction(self):
+        session = MagicMock()
+        client = self.collection.database.client
+        client.start_session.return_value.__enter__.return_value = session
+        session.with_transaction.side_effect = lambda callback: callback(session)
+        return session
+
+    def stub_find(self, documents: list):
+        self.collection.find.return_value = documents
+
+    def test_backfill_formatted_times(self):
+        self.stub_find([make_poll_json(POLL_ID), make_poll_json(OTHER_POLL_ID)])
+        self.collection.find.return_value[1]["start_time"] = "invalid"
+        self.collection.bulk_write.return_value.modified_count = 1
+
+        self.assertEqual(self.repo.backfill_formatted_times(), 1)
+        (request,) = self.collection.bulk_write.call_args.args[0]
+        self.assertEqual(
+            request,
+            UpdateOne(
+                {"_id": ObjectId(POLL_ID)},
+                {
+                    "$set": {
+                        "formatted_times": ["Wed, 01/01/2025", "10:00am", "12:00pm"]
+                    }
+                },
+            ),
+        )
+
+
+class AsyncPollRepositoryTest(PollRepositoryTests, unittest.IsolatedAsyncioTestCase):
+    """Runs the poll repository tests against the Motor implementation."""
+
+    repository_class = AsyncPollRepository
+
+    def stub(self, method: str, value, collection=None):
+        setattr(collection or self.collection, method, AsyncMock(return_value=value))
+
+    def stub_transaction(self):
+        session = MagicMock()
+        session.__aenter__.return_value = session
+
+        async def with_transaction(callback):
+            return await callback(session)
+
+        session.with_transaction = with_transaction
+        self.collection.database.client.start_session = AsyncMock(return_value=session)
+        return session
+
+    def stub_find(self, documents: list):
+        self.collection.find.return_value.to_list = AsyncMock(return_value=documents)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,39 @@
+"""Unit tests for the RedisConnectionPool class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import AsyncMock, patch
+
+from redis.asyncio import BlockingConnectionPool
+
+from src.repositories import create_redis_pool
+
+
+class RedisConnectionPoolTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the RedisConnectionPool class."""
+
+    def setUp(self):
+        self.pool = create_redis_pool("redis://localhost:6379", max_connections=2)
+
+    def test_stats(self):
+        self.assertEqual(
+            self.pool.stats(),
+            {"max_connections": 2, "in_use": 0, "idle": 0, "waits": 0},
+        )
+
+    async def test_counts_waits(self):
+        with (
+            patch.object(BlockingConnectionPool, "get_connection", AsyncMock()),
+            patch.object(self.pool, "can_get_connection", side_effect=[True, False]),
+        ):
+            await self.pool.get_connection()
+            await self.pool.get_connection()
+
+        self.assertEqual(self.pool.stats()["waits"], 1)
+
+    def test_decodes_responses(self):
+        self.assertTrue(self.pool.connection_kwargs["decode_responses"])
+
+
+if __name__ == "__main__":
+    unittest.main()
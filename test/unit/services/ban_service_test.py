@@ -0,0 +1,42 @@
+"""Unit tests for the BanService class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from service import BanService
+
+
+class BanServiceTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the BanService class."""
+
+    def setUp(self):
+        self.repo = AsyncMock()
+        self.service = BanService(self.repo)
+
+    async def test_remove_banned_people_checks_everyone_at_once(self):
+        attendance_list = MagicMock()
+        attendance_list.get_all_player_names.return_value = ["@a", "@b", "@c"]
+        self.repo.are_users_banned.return_value = [False, True, True]
+
+        result, removed = await self.service.remove_banned_people(attendance_list, "42")
+
+        self.assertIs(result, attendance_list)
+        self.assertEqual(removed, ["@b", "@c"])
+        self.repo.are_users_banned.assert_awaited_once_with(["@a", "@b", "@c"], "42")
+        self.repo.is_user_banned.assert_not_called()
+        attendance_list.remove_banned_people.assert_called_once_with(["@b", "@c"])
+
+    async def test_log_bans_bans_everyone_at_once(self):
+        attendance_list = MagicMock()
+        attendance_list.get_penalisable_names.return_value = ["@a", "@b"]
+        attendance_list.details = ["Session"]
+
+        await self.service.log_bans(attendance_list, "42")
+
+        self.repo.ban_users.assert_awaited_once()
+        self.assertEqual(self.repo.ban_users.call_args[0][:2], (["@a", "@b"], "42"))
+
+
+if __name__ == "__main__":
+    unittest.main()
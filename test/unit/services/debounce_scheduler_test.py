@@ -0,0 +1,96 @@
+"""Unit tests for the debounce schedulers."""
+
+# pylint: disable=missing-function-docstring, import-error
+import asyncio
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from src.service.debounce_scheduler import (
+    LocalDebounceScheduler,
+    QStashDebounceScheduler,
+)
+
+URL = "https://bot.example/qstash_debounced"
+
+
+class QStashDebounceSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the QStashDebounceScheduler class."""
+
+    def setUp(self):
+        self.qstash_client = MagicMock()
+        self.scheduler = QStashDebounceScheduler(self.qstash_client, URL)
+
+    async def test_schedule(self):
+        self.assertTrue(await self.scheduler.schedule("debounce:a", {"x": 1}, 2500))
+        self.qstash_client.message.publish_json.assert_called_once_with(
+            url=URL, body={"debounce_key": "debounce:a", "x": 1}, delay=3
+        )
+
+    async def test_schedule_failure(self):
+        self.qstash_client.message.publish_json.side_effect = RuntimeError
+
+        self.assertFalse(await self.scheduler.schedule("debounce:a", {}, 2500))
+
+
+class LocalDebounceSchedulerTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the LocalDebounceScheduler class."""
+
+    async def asyncSetUp(self):
+        self.handler = AsyncMock()
+        self.scheduler = LocalDebounceScheduler(
+            self.handler, tick_ms=10, max_concurrent_runs=4
+        )
+        self.runner = asyncio.create_task(self.scheduler.run())
+
+    async def asyncTearDown(self):
+        self.runner.cancel()
+        await asyncio.gather(self.runner, return_exceptions=True)
+
+    async def wait_for_runs(self, count: int):
+        for _ in range(200):
+            if (
+                self.scheduler.stats()["fired"] + self.scheduler.stats()["failed"]
+                >= count
+            ):
+                return
+            await asyncio.sleep(0.01)
+        self.fail("Scheduled keys were not run")
+
+    async def test_runs_key_after_delay(self):
+        await self.scheduler.schedule("debounce:a", {}, 30)
+
+        self.assertEqual(self.scheduler.stats()["pending"], 1)
+        await self.wait_for_runs(1)
+        self.handler.assert_awaited_once_with("debounce:a")
+        self.assertEqual(self.scheduler.stats()["pending"], 0)
+
+    async def test_rescheduled_key_runs_once(self):
+        await self.scheduler.schedule("debounce:a", {}, 20)
+        await self.scheduler.schedule("debounce:a", {}, 40)
+
+        await self.wait_for_runs(1)
+        await asyncio.sleep(0.05)
+        self.handler.assert_awaited_once_with("debounce:a")
+        self.assertEqual(self.scheduler.stats()["rescheduled"], 1)
+
+    async def test_burst_of_keys(self):
+        keys = [f"debounce:{i}" for i in range(2000)]
+        for key in keys:
+            await self.scheduler.schedule(key, {}, 20)
+
+        await self.wait_for_runs(len(keys))
+        self.assertEqual(
+            {call.args[0] for call in self.handler.await_args_list}, set(keys)
+        )
+
+    async def test_failed_run_is_counted(self):
+        self.handler.side_effect = RuntimeError
+
+        await self.scheduler.schedule("debounce:a", {}, 10)
+
+        await self.wait_for_runs(1)
+        self.assertEqual(self.scheduler.stats()["failed"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,69 @@
+"""Unit tests for the PollRenderCache class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import unittest
+from unittest.mock import AsyncMock, MagicMock
+
+from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+
+from src.model import PollGroup
+from src.service.poll_render_cache import PollRenderCache
+from src.util import Membership
+
+MARKUP = InlineKeyboardMarkup([[InlineKeyboardButton("Poll", callback_data="x")]])
+
+
+def make_poll_group(results_version: int | None) -> PollGroup:
+    poll_group = PollGroup(1, "Group")
+    poll_group.insert_id("group")
+    poll_group.results_version = results_version
+    return poll_group
+
+
+class PollRenderCacheTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the PollRenderCache class."""
+
+    def setUp(self):
+        self.render = MagicMock(return_value=("text", MARKUP))
+        self.cache = PollRenderCache(self.render, max_size=2)
+
+    async def test_renders_once_per_version(self):
+        for version in (1, 1, 2):
+            message = await self.cache.get_message(
+                make_poll_group(version), [], Membership.REGULAR
+            )
+
+        self.assertEqual(message, ("text", MARKUP))
+        self.assertEqual(self.render.call_count, 2)
+        self.assertEqual(self.cache.stats()["hits"], 1)
+
+    async def test_evicts_least_recently_used(self):
+        for version in (1, 2, 1, 3, 1, 2):
+            await self.cache.get_message(
+                make_poll_group(version), [], Membership.REGULAR
+            )
+
+        self.assertEqual(self.render.call_count, 4)
+        self.assertEqual(self.cache.stats()["size"], 2)
+
+    async def test_group_without_version_is_not_cached(self):
+        for _ in range(2):
+            await self.cache.get_message(make_poll_group(None), [], Membership.REGULAR)
+
+        self.assertEqual(self.render.call_count, 2)
+        self.assertEqual(self.cache.stats()["size"], 0)
+
+    async def test_shares_renders_through_redis(self):
+        redis_client = MagicMock()
+        redis_client.get = AsyncMock(return_value=None)
+        redis_client.set = AsyncMock()
+        writer = PollRenderCache(self.render, redis_client=redis_client)
+        await writer.get_message(make_poll_group(1), [], Membership.REGULAR)
+        redis_client.get.return_value = redis_client.set.await_args.args[1]
+
+        reader = PollRenderCache(self.render, redis_client=redis_client)
+        message = await reader.get_message(make_poll_group(1), [], Membership.REGULAR)
+
+        self.assertEqual(message, ("text", MARKUP))
+        self.assertEqual(self.render.call_count, 1)
+        self.assertEqual(reader.stats()["shared_hits"], 1)
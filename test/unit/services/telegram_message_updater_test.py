@@ -0,0 +1,259 @@
+"""Unit tests for the TelegramMessageUpdater class."""
+
+# pylint: disable=missing-function-docstring, import-error
+import json
+import unittest
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from telegram.error import BadRequest, TimedOut
+
+from src.service.telegram_message_updater import (
+    DEFAULT_WAIT_TIME_MS,
+    MAX_STALENESS_MS,
+    TelegramMessageUpdater,
+    fingerprint,
+)
+from src.util import Membership
+
+NOW_MS = 1_000_000_000
+KEY = "debounce:group:0"
+PUBLISHED_KEY = "published:group:0"
+COPIES = {"inline", "copy"}
+PAYLOAD = '{"inline_message_id": "inline"}'
+PAYLOAD_EXTRAS = {"poll_group_id": "group", "membership": 0}
+# Results of marking the poll group dirty, for the change that opens the window and
+# for a later one
+LEADER_RESULTS = [1, True, COPIES, True, 1, 1, True, 1]
+SOLE_COPY_LEADER_RESULTS = [1, True, {"inline"}, True, 1, 1, True, 1]
+FOLLOWER_RESULTS = [0, True, COPIES, True, 2, 0, True, 2]
+
+
+def make_state(version: int, rendered_version: int, changed_at: int, rendered_at: int):
+    return {
+        "payload": PAYLOAD,
+        "version": str(version),
+        "rendered_version": str(rendered_version),
+        "changed_at": str(changed_at),
+        "rendered_at": str(rendered_at),
+    }
+
+
+@patch("src.service.telegram_message_updater.time.time", return_value=NOW_MS / 1000)
+class TelegramMessageUpdaterTest(unittest.IsolatedAsyncioTestCase):
+    """Tests for the TelegramMessageUpdater class."""
+
+    def setUp(self):
+        self.redis_client = MagicMock()
+        self.redis_client.delete = AsyncMock()
+        self.redis_client.hgetall = AsyncMock()
+        self.redis_client.hincrby = AsyncMock()
+        self.redis_client.srem = AsyncMock()
+        self.redis_client.mget = AsyncMock(side_effect=lambda keys: [None] * len(keys))
+        self.redis_client.get = AsyncMock(return_value=None)
+        self.redis_client.set = AsyncMock()
+        self.pipeline = self.redis_client.pipeline.return_value
+        self.pipeline.execute = AsyncMock()
+        self.close_window = AsyncMock(return_value=1)
+        self.redis_client.register_script.return_value = self.close_window
+        self.bot = AsyncMock()
+        self.scheduler = MagicMock()
+        self.scheduler.schedule = AsyncMock(return_value=True)
+        self.schedule = self.scheduler.schedule
+        self.render = AsyncMock()
+        self.callback_query = MagicMock(inline_message_id="inline")
+        self.callback_query.edit_message_text = AsyncMock(return_value=True)
+        self.updater = TelegramMessageUpdater(
+            self.redis_client, self.bot, self.scheduler
+        )
+
+    async def update(self):
+        await self.updater.update_polls_message(
+            self.callback_query, "text", None, None, "group", Membership.REGULAR
+        )
+
+    async def test_first_change_renders_origin_and_schedules_trailing_render(self, _):
+        self.pipeline.execute.return_value = LEADER_RESULTS
+
+        await self.update()
+
+        self.pipeline.sadd.assert_called_once_with(PUBLISHED_KEY, "inline")
+        self.callback_query.edit_message_text.assert_awaited_once_with(
+            "text", reply_markup=None, parse_mode=None
+        )
+        # The other copies are left to the trailing render
+        self.bot.edit_message_text.assert_not_awaited()
+        self.pipeline.hset.assert_called_once()  # only the dirty marker
+        self.schedule.assert_called_once_with(
+            KEY, json.loads(PAYLOAD) | PAYLOAD_EXTRAS, DEFAULT_WAIT_TIME_MS
+        )
+
+    async def test_later_change_is_coalesced(self, _):
+        self.pipeline.execute.return_value = FOLLOWER_RESULTS
+
+        await self.update()
+
+        self.bot.edit_message_text.assert_not_awaited()
+        self.schedule.assert_not_called()
+
+    async def test_first_change_to_sole_copy_is_rendered(self, _):
+        self.pipeline.execute.return_value = SOLE_COPY_LEADER_RESULTS
+
+        await self.update()
+
+        self.pipeline.hset.assert_called_with(KEY, "rendered_version", 1)
+
+    async def test_failed_first_render_keeps_trailing_render(self, _):
+        self.pipeline.execute.return_value = SOLE_COPY_LEADER_RESULTS
+        self.callback_query.edit_message_text.side_effect = BadRequest(
+            "Message can't be edited"
+        )
+
+        await self.update()
+
+        self.pipeline.hset.assert_called_once()  # only the dirty marker
+        self.schedule.assert_called_once()
+        self.redis_client.delete.assert_not_awaited()
+        self.redis_client.srem.assert_not_awaited()
+
+    async def test_timed_out_first_render_keeps_trailing_render(self, _):
+        self.pipeline.execute.return_value = SOLE_COPY_LEADER_RESULTS
+        self.callback_query.edit_message_text.side_effect = TimedOut()
+
+        await self.update()
+
+        self.pipeline.hset.assert_called_once()  # only the dirty marker
+        self.schedule.assert_called_once()
+        self.redis_client.delete.assert_not_awaited()
+
+    async def test_unchanged_copy_counts_as_rendered(self, _):
+        self.pipeline.execute.return_value = SOLE_COPY_LEADER_RESULTS
+        self.callback_query.edit_message_text.side_effect = BadRequest(
+            "Message is not modified: specified new message content is the same"
+        )
+
+        await self.update()
+
+        self.pipeline.hset.assert_called_with(KEY, "rendered_version", 1)
+
+    async def test_missing_copy_is_unregistered(self, _):
+        self.redis_client.srem = AsyncMock()
+        self.bot.edit_message_text.side_effect = [
+            None,
+            BadRequest("Message to edit not found"),
+        ]
+
+        self.assertFalse(
+            await self.updater.edit_published_messages(
+                "group", Membership.REGULAR, ["inline", "copy"], "text", None, None
+            )
+        )
+        self.redis_client.srem.assert_awaited_once_with(PUBLISHED_KEY, "copy")
+
+    async def test_copies_with_same_rendering_are_skipped(self, _):
+        self.redis_client.mget.side_effect = None
+        self.redis_client.mget.return_value = [fingerprint("text", None, None), None]
+
+        self.assertTrue(
+            await self.updater.edit_published_messages(
+                "group", Membership.REGULAR, ["inline", "copy"], "text", None, None
+            )
+        )
+        self.bot.edit_message_text.assert_awaited_once()
+        self.assertEqual(
+            self.bot.edit_message_text.await_args.kwargs["inline_message_id"], "copy"
+        )
+        self.pipeline.set.assert_called_once()
+        self.pipeline.hincrby.assert_any_call("debounce:stats", "skipped_edits", 1)
+
+    async def test_callback_message_with_same_rendering_is_skipped(self, _):
+        callback_query = MagicMock(inline_message_id="inline")
+        callback_query.edit_message_text = AsyncMock(return_value=True)
+        self.redis_client.get.return_value = fingerprint("text", None, None)
+
+        await self.updater.edit_callback_message(callback_query, "text")
+        await self.updater.edit_callback_message(callback_query, "new text")
+
+        callback_query.edit_message_text.assert_awaited_once_with(
+            "new text", reply_markup=None, parse_mode=None
+        )
+        self.redis_client.set.assert_awaited_once()
+
+    async def test_failed_scheduling_closes_window(self, _):
+        self.pipeline.execute.return_value = LEADER_RESULTS
+        self.schedule.return_value = False
+
+        await self.update()
+
+        self.redis_client.delete.assert_awaited_once_with(KEY)
+
+    async def test_trailing_render_without_window(self, _):
+        self.redis_client.hgetall.return_value = {}
+
+        self.assertFalse(await self.updater.run_trailing_update(KEY, self.render))
+        self.render.assert_not_awaited()
+
+    async def test_trailing_render_after_quiet_period(self, _):
+        self.redis_client.hgetall.return_value = make_state(
+            3, 1, NOW_MS - DEFAULT_WAIT_TIME_MS, NOW_MS - DEFAULT_WAIT_TIME_MS
+        )
+
+        self.assertTrue(await self.updater.run_trailing_update(KEY, self.render))
+
+        self.render.assert_awaited_once_with(PAYLOAD)
+        self.close_window.assert_awaited_once_with(keys=[KEY], args=[3])
+        self.schedule.assert_not_called()
+
+    async def test_trailing_render_without_changes_closes_window(self, _):
+        self.redis_client.hgetall.return_value = make_state(1, 1, NOW_MS, NOW_MS)
+
+        await self.updater.run_trailing_update(KEY, self.render)
+
+        self.render.assert_not_awaited()
+        self.close_window.assert_awaited_once_with(keys=[KEY], args=[1])
+
+    async def test_trailing_render_extended_while_changing(self, _):
+        self.redis_client.hgetall.return_value = make_state(
+            3, 1, NOW_MS - 1000, NOW_MS - 3000
+        )
+
+        await self.updater.run_trailing_update(KEY, self.render)
+
+        self.render.assert_not_awaited()
+        self.close_window.assert_not_awaited()
+        self.schedule.assert_called_once_with(KEY, json.loads(PAYLOAD), 1500)
+
+    async def test_trailing_render_after_max_staleness(self, _):
+        self.redis_client.hgetall.return_value = make_state(
+            9, 1, NOW_MS - 100, NOW_MS - MAX_STALENESS_MS
+        )
+
+        await self.updater.run_trailing_update(KEY, self.render)
+
+        self.render.assert_awaited_once_with(PAYLOAD)
+
+    async def test_change_during_trailing_render_is_rendered(self, _):
+        self.redis_client.hgetall.return_value = make_state(
+            3, 1, NOW_MS - DEFAULT_WAIT_TIME_MS, NOW_MS - DEFAULT_WAIT_TIME_MS
+        )
+        self.close_window.return_value = 0
+
+        await self.updater.run_trailing_update(KEY, self.render)
+
+        self.render.assert_awaited_once()
+        self.schedule.assert_called_once()
+
+    async def test_stats(self, _):
+        self.redis_client.hgetall.return_value = {
+            "changes": "10",
+            "leading_renders": "2",
+            "trailing_renders": "3",
+        }
+
+        stats = await self.updater.stats()
+
+        self.assertEqual(stats["coalesced"], 5)
+        self.assertEqual(stats["extensions"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()